@@ -0,0 +1,312 @@
+import json
+import time
+import asyncio
+import threading
+from urllib.parse import quote
+import backoff
+import httplib2
+from googleapiclient.errors import HttpError
+from utils_calendar_general import (
+    BACKOFF_MAX_TRIES,
+    CALENDAR_PAGE_SIZE,
+    credentials_from_service,
+    default_time_window,
+    is_retryable_error,
+    iter_calendar_events
+)
+from calendar_executor import DEFAULT_WORKERS, calendar_service_factory
+from event_store import open_event_store
+from sheets_ingest import sheet_range, fetch_sheet_values, build_teacher_map
+from sync_journal import SyncJournal, SENT, CONFIRMED, FAILED
+from instrumentation import RECORDER, on_backoff
+from response_cache import cache_of
+from sync_scheduler import (
+    SPREADSHEET_ID,
+    SIGNUP_SHEET,
+    CONTACT_SHEET,
+    CALENDAR_ID,
+    TEMPLATE_FILE,
+    CREATED_EVENTS_CSV,
+    EVENT_STORE_DB,
+    SYNC_JOURNAL,
+    get_services,
+    validate_template,
+    build_events,
+    print_matching_errors,
+    confirm_events,
+    stored_ids,
+    created_event_records,
+    append_created_records
+)
+
+SHEETS_API = 'https://sheets.googleapis.com/v4/spreadsheets'
+CALENDAR_API = 'https://www.googleapis.com/calendar/v3/calendars'
+
+# Only IDs are needed to know which events already exist.
+EXISTING_ITEM_FIELDS = 'id,status'
+
+def events_url(calendar_id, event_id=None):
+    """
+    Calendar events URL with the IDs percent-encoded (calendar IDs may hold '#' or '/').
+    """
+    url = f"{CALENDAR_API}/{quote(calendar_id, safe='')}/events"
+    return url if event_id is None else f"{url}/{quote(event_id, safe='')}"
+
+class HttpxTransport:
+    """
+    Async Sheets/Calendar client over httpx, authorized with google-auth credentials.
+
+    Requires the optional `httpx` package. Errors are raised as googleapiclient
+    HttpErrors so the usual retry predicates (is_retryable_error) apply.
+    """
+
+    def __init__(self, credentials, max_connections=DEFAULT_WORKERS, transport=None):
+        import httpx
+
+        self.credentials = credentials
+        self.client = httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=max_connections),
+                                        transport=transport)
+        self._refresh_lock = asyncio.Lock()
+
+    async def _headers(self):
+        async with self._refresh_lock:
+            if not self.credentials.valid:
+                from google.auth.transport.requests import Request
+                await asyncio.to_thread(self.credentials.refresh, Request())
+        return {'Authorization': f"Bearer {self.credentials.token}"}
+
+    async def _request(self, endpoint, method, url, params=None, body=None):
+        headers = await self._headers()
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, params=params, json=body, headers=headers)
+        except Exception as e:
+            RECORDER.api_call(endpoint, time.perf_counter() - start, e)
+            raise
+        error = None
+        if response.status_code >= 400:
+            resp = httplib2.Response({'status': response.status_code})
+            resp.reason = response.reason_phrase
+            error = HttpError(resp, response.content, uri=str(response.url))
+        RECORDER.api_call(endpoint, time.perf_counter() - start, error)
+        if error is not None:
+            raise error
+        return response.json() if response.content else {}
+
+    async def batch_get(self, spreadsheet_id, sheet_names):
+        params = [('ranges', sheet_range(name)) for name in sheet_names]
+        params += [('majorDimension', 'ROWS'), ('fields', 'valueRanges(values)')]
+        result = await self._request('spreadsheets.values.batchGet', 'GET', f"{SHEETS_API}/{quote(spreadsheet_id, safe='')}/values:batchGet", params=params)
+        value_ranges = result.get('valueRanges', [])
+        return {name: value_range.get('values', []) for name, value_range in zip(sheet_names, value_ranges)}
+
+    async def list_events(self, calendar_id, time_min, time_max, item_fields=EXISTING_ITEM_FIELDS):
+        params = {'singleEvents': 'true', 'maxResults': CALENDAR_PAGE_SIZE, 'timeMin': time_min,
+                  'timeMax': time_max, 'fields': f'nextPageToken,items({item_fields})'}
+        events = []
+        while True:
+            page = await self._request('events.list', 'GET', events_url(calendar_id), params=params)
+            events.extend(page.get('items', []))
+            if not page.get('nextPageToken'):
+                return events
+            params['pageToken'] = page['nextPageToken']
+
+    async def insert(self, calendar_id, body):
+        return await self._request('events.insert', 'POST', events_url(calendar_id), body=body)
+
+    async def get(self, calendar_id, event_id):
+        return await self._request('events.get', 'GET', events_url(calendar_id, event_id))
+
+    async def update(self, calendar_id, event_id, body):
+        return await self._request('events.update', 'PUT', events_url(calendar_id, event_id), body=body)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+class ThreadTransport:
+    """
+    Async facade over googleapiclient services, running each call in a thread.
+
+    Used when httpx is not installed, and with the offline fake. Calendar
+    calls get one service per thread (httplib2 is not thread-safe) unless the
+    service declares itself thread-safe.
+    """
+
+    def __init__(self, sheets_service, calendar_service):
+        self.sheets_service = sheets_service
+        self.calendar_service = calendar_service
+        if getattr(calendar_service, 'thread_safe', False):
+            self._factory = lambda: calendar_service
+        else:
+            self._factory = calendar_service_factory(credentials_from_service(calendar_service),
+                                                     cache_of(calendar_service))
+        self._local = threading.local()
+
+    def _calendar(self):
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self._local.service = self._factory()
+        return service
+
+    async def batch_get(self, spreadsheet_id, sheet_names):
+        return await asyncio.to_thread(fetch_sheet_values, self.sheets_service, spreadsheet_id, sheet_names)
+
+    async def list_events(self, calendar_id, time_min, time_max, item_fields=EXISTING_ITEM_FIELDS):
+        return await asyncio.to_thread(lambda: list(iter_calendar_events(
+            self._calendar(), calendar_id, time_min, time_max, fields=item_fields)))
+
+    async def insert(self, calendar_id, body):
+        return await asyncio.to_thread(
+            lambda: self._calendar().events().insert(calendarId=calendar_id, body=body).execute())
+
+    async def get(self, calendar_id, event_id):
+        return await asyncio.to_thread(
+            lambda: self._calendar().events().get(calendarId=calendar_id, eventId=event_id).execute())
+
+    async def update(self, calendar_id, event_id, body):
+        return await asyncio.to_thread(
+            lambda: self._calendar().events().update(calendarId=calendar_id, eventId=event_id,
+                                                     body=body).execute())
+
+    async def aclose(self):
+        pass
+
+def default_transport(sheets_service, calendar_service):
+    """
+    HttpxTransport when httpx is installed and the services carry credentials,
+    otherwise ThreadTransport.
+    """
+    credentials = credentials_from_service(calendar_service)
+    if credentials is not None and not getattr(calendar_service, 'thread_safe', False):
+        try:
+            return HttpxTransport(credentials)
+        except ImportError:
+            print("httpx is not installed; running API calls in worker threads instead.")
+    return ThreadTransport(sheets_service, calendar_service)
+
+@backoff.on_exception(backoff.expo, HttpError, max_tries=BACKOFF_MAX_TRIES,
+                      giveup=lambda e: not is_retryable_error(e), on_backoff=on_backoff)
+async def insert_idempotent(transport, calendar_id, event_body):
+    """
+    Async counterpart of insert_event_idempotent, retrying throttled and 5xx errors.
+    """
+    try:
+        return await transport.insert(calendar_id, event_body)
+    except HttpError as e:
+        if e.resp.status != 409:
+            raise
+    existing = await transport.get(calendar_id, event_body['id'])
+    if existing.get('status') != 'cancelled':
+        return existing
+    return await transport.update(calendar_id, event_body['id'], dict(event_body, status='confirmed'))
+
+async def insert_events(transport, calendar_id, events_to_create, csv_path, concurrency=DEFAULT_WORKERS,
+                        store=None, journal=None):
+    """
+    Inserts events concurrently, at most `concurrency` requests in flight.
+
+    Every insert is scheduled at once and starts as soon as the semaphore
+    allows; each created event is logged to the CSV (and store) as it
+    completes. Failures are reported without stopping the run. With a
+    SyncJournal, events are journaled as in serial mode so --resume works.
+
+    Returns:
+        list: Records of the created events, in completion order.
+    """
+    if journal is not None:
+        events_to_create = journal.plan(events_to_create, stored_ids(store))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def insert(ev):
+        async with semaphore:
+            if journal is not None:
+                journal.record(ev['id'], SENT)
+            try:
+                created_event = await insert_idempotent(transport, calendar_id, ev)
+            except HttpError as e:
+                if journal is not None:
+                    journal.record(ev['id'], FAILED, error=str(e))
+                return ev, None, e
+            if journal is not None:
+                journal.record(ev['id'], CONFIRMED, event_id=created_event.get('id'))
+            return ev, created_event, None
+
+    created_records = []
+    for task in asyncio.as_completed([asyncio.create_task(insert(ev)) for ev in events_to_create]):
+        ev, created_event, error = await task
+        if error is not None:
+            print(f"An error occurred: {error}")
+            print(f"Offending Event Body:\n{json.dumps(ev, indent=2)}")
+            continue
+        print(f"Created event: {created_event.get('htmlLink')}")
+        records = created_event_records(created_event)
+        created_records.extend(records)
+        append_created_records(csv_path, records, store)
+    return created_records
+
+async def sync_async(transport, dry_run=True, test_teacher=None, limit=None, concurrency=DEFAULT_WORKERS,
+                     csv_path=CREATED_EVENTS_CSV, store=None, journal=None):
+    """
+    The sync run of sync_scheduler.main, with the network waits overlapped.
+
+    The signup/contact batchGet and the calendar listing are issued together;
+    events are rendered in a worker thread while the listing is still in
+    flight. Events whose ID is already on the calendar are skipped. Preview,
+    `limit` and confirmation behave exactly as in main().
+
+    Returns:
+        list: Records of the created events (empty for dry runs).
+    """
+    template = validate_template(TEMPLATE_FILE)
+    existing_task = asyncio.create_task(transport.list_events(CALENDAR_ID, *default_time_window()))
+    values = await transport.batch_get(SPREADSHEET_ID, [CONTACT_SHEET, SIGNUP_SHEET])
+    teacher_map = build_teacher_map(values.get(CONTACT_SHEET, []))
+    signup_rows = values.get(SIGNUP_SHEET, [])
+
+    if not teacher_map or not signup_rows:
+        existing_task.cancel()
+        print("No contact data found." if not teacher_map else "No signup data found.")
+        return []
+
+    events_to_create, preview_data, errors = await asyncio.to_thread(
+        build_events, teacher_map, signup_rows, template, test_teacher, limit)
+    existing_ids = {event['id'] for event in await existing_task if event.get('status') != 'cancelled'}
+    print_matching_errors(errors)
+
+    kept = [(ev, row) for ev, row in zip(events_to_create, preview_data) if ev['id'] not in existing_ids]
+    if len(kept) < len(events_to_create):
+        print(f"\nSkipping {len(events_to_create) - len(kept)} event(s) already on the calendar.")
+    events_to_create = confirm_events([ev for ev, _ in kept], [row for _, row in kept], limit, dry_run)
+    if not events_to_create:
+        return []
+
+    created_records = await insert_events(transport, CALENDAR_ID, events_to_create, csv_path, concurrency,
+                                          store=store, journal=journal)
+    if created_records:
+        print(f"\nSuccessfully created {len(created_records)} new events.")
+    return created_records
+
+async def main_async(dry_run=True, test_teacher=None, limit=None, concurrency=DEFAULT_WORKERS):
+    if dry_run:
+        print("\n[DRY RUN MODE] Use --run to actually create events.")
+    sheets_service, calendar_service = get_services()
+    transport = default_transport(sheets_service, calendar_service)
+    try:
+        with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+            await sync_async(transport, dry_run, test_teacher, limit, concurrency, store=store,
+                             journal=SyncJournal(SYNC_JOURNAL))
+    finally:
+        await transport.aclose()
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Sync Spreadsheet to Google Calendar (asyncio runner).')
+    parser.add_argument('--run', action='store_true', help='Actually create events in the calendar.')
+    parser.add_argument('--test', action='store_true', help='Only process events for Stephen Holsenbeck.')
+    parser.add_argument('--limit', type=int, help='Limit the number of events to create.')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_WORKERS,
+                        help=f'Maximum inserts in flight (default {DEFAULT_WORKERS}).')
+    args = parser.parse_args()
+
+    asyncio.run(main_async(dry_run=not args.run, test_teacher="Stephen Holsenbeck" if args.test else None,
+                           limit=args.limit, concurrency=args.concurrency))
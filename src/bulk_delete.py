@@ -0,0 +1,160 @@
+from utils_calendar_general import CALENDAR_BATCH_LIMIT, iter_calendar_events, iter_batched_deletes
+from response_cache import uncached
+from instrumentation import span
+from sync_journal import RUN_ID_PROPERTY, PROGRAM_PROPERTY, TEACHER_PROPERTY, TEST_PROPERTY, SyncJournal
+from sync_scheduler import CALENDAR_ID, CREATED_EVENTS_CSV, EVENT_STORE_DB, SYNC_JOURNAL, get_services
+
+# Listing mask for selection: enough to print what would be deleted, and the
+# series each occurrence of a recurring event belongs to.
+SELECTION_FIELDS = 'id,summary,start,recurringEventId'
+
+# Matching events listed in a dry run.
+PREVIEW_COUNT = 10
+
+def selection_properties(run_id=None, program=None, teacher=None, test=False):
+    """
+    The private extended properties (stamped by sync_journal.stamp_tags) to select on.
+    """
+    tags = {RUN_ID_PROPERTY: run_id, PROGRAM_PROPERTY: program, TEACHER_PROPERTY: teacher,
+            TEST_PROPERTY: '1' if test else None}
+    return {key: value for key, value in tags.items() if value}
+
+def find_events(service, calendar_id, properties=None, time_min=None, time_max=None, summary_prefix=None):
+    """
+    Lists the events matching every given selector, filtered server-side.
+
+    Tags go in privateExtendedProperty and the window in timeMin/timeMax; only
+    `summary_prefix` (sent as the free-text query `q`) is rechecked locally,
+    since `q` matches anywhere in an event. The listing bypasses the
+    response cache, so the selection is current.
+
+    Returns:
+        list: Matching event resources (id, summary, start, recurringEventId),
+        with recurring events expanded into their occurrences.
+    """
+    if not (properties or time_min or time_max or summary_prefix):
+        raise ValueError("Refusing to select the whole calendar: give a tag, a time window or a summary prefix.")
+    events = iter_calendar_events(uncached(service), calendar_id, time_min, time_max, fields=SELECTION_FIELDS,
+                                  private_properties=properties, query=summary_prefix, default_window=False)
+    if summary_prefix:
+        events = (event for event in events if (event.get('summary') or '').startswith(summary_prefix))
+    return list(events)
+
+def deletion_targets(events, whole_series=True):
+    """
+    The IDs to delete for a selection, each mapped to the selected event IDs it removes.
+
+    With `whole_series`, occurrences of a recurring event are replaced by the
+    series, deleted in one call; otherwise each occurrence is cancelled on its own.
+    """
+    targets = {}
+    for event in events:
+        target = (event.get('recurringEventId') if whole_series else None) or event['id']
+        targets.setdefault(target, []).append(event['id'])
+    return targets
+
+@span('delete')
+def delete_events(service, calendar_id, event_ids, batch_size=CALENDAR_BATCH_LIMIT, store=None, covers=None):
+    """
+    Deletes events with batch requests, tombstoning them in `store` (an EventStore) if given.
+
+    `covers` maps a deleted ID to the recorded IDs it removes (see
+    deletion_targets), so deleting a series tombstones its stored occurrences.
+
+    Returns:
+        tuple: (deleted event IDs, [(event_id, error)] failures)
+    """
+    deleted, failures = [], []
+    for batch_deleted, batch_failed in iter_batched_deletes(service, calendar_id, event_ids, batch_size):
+        deleted.extend(batch_deleted)
+        failures.extend(batch_failed)
+        if store is not None:
+            store.mark_deleted([recorded for event_id in batch_deleted
+                                for recorded in (covers or {}).get(event_id, [event_id])])
+        print(f"Batch complete: {len(batch_deleted)} deleted, {len(batch_failed)} failed "
+              f"({len(deleted)}/{len(event_ids)} total)")
+    for event_id, error in failures:
+        print(f"Error deleting {event_id}: {error}")
+    return deleted, failures
+
+def bulk_delete(service, calendar_id, properties=None, time_min=None, time_max=None, summary_prefix=None,
+                dry_run=True, assume_yes=False, batch_size=CALENDAR_BATCH_LIMIT, store=None, journal=None):
+    """
+    Selects events server-side and deletes them in batches.
+
+    A dry run only reports how many events match (and the first few).
+    Without a time window, a recurring event whose occurrences match is
+    deleted as a whole series; with one, only the matching occurrences are.
+    Deleted events are recorded in `journal` (a SyncJournal) if given, so
+    the next sync creates them again.
+
+    Returns:
+        list: IDs of the events deleted (or, in a dry run, matched).
+    """
+    events = find_events(service, calendar_id, properties, time_min, time_max, summary_prefix)
+    print(f"{len(events)} event(s) match.")
+    for event in events[:PREVIEW_COUNT]:
+        start = event.get('start', {})
+        print(f"  {start.get('dateTime') or start.get('date')}  {event.get('summary')}")
+    if len(events) > PREVIEW_COUNT:
+        print(f"  ... and {len(events) - PREVIEW_COUNT} more")
+
+    event_ids = [event['id'] for event in events]
+    if dry_run or not event_ids:
+        if dry_run and event_ids:
+            print("\n[DRY RUN] No events were deleted. Use --run to delete them.")
+        return event_ids
+    if not assume_yes:
+        confirm = input(f"Are you sure you want to delete {len(event_ids)} events from calendar? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Deletion cancelled.")
+            return []
+    targets = deletion_targets(events, whole_series=not (time_min or time_max))
+    deleted, _ = delete_events(service, calendar_id, list(targets), batch_size, store=store, covers=targets)
+    if journal is not None:
+        journal.record_deleted(deleted)
+    deleted = [event_id for target in deleted for event_id in targets[target]]
+    print(f"\nDeleted {len(deleted)} of {len(event_ids)} event(s).")
+    return deleted
+
+def has_selection(args):
+    """
+    True if parsed options name at least one selector.
+    """
+    return any([args.run_id, args.program, args.teacher, args.test, args.prefix, args.time_min, args.time_max])
+
+def run_from_args(args, calendar_service):
+    """
+    Runs a bulk deletion from parsed selector options, keeping the event store and CSV in step.
+    """
+    from event_store import open_event_store
+
+    properties = selection_properties(args.run_id, args.program, args.teacher, args.test)
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        deleted = bulk_delete(calendar_service, args.calendar_id or CALENDAR_ID, properties, args.time_min,
+                              args.time_max, args.prefix, dry_run=not args.run, assume_yes=args.yes,
+                              batch_size=args.batch_size or CALENDAR_BATCH_LIMIT, store=store,
+                              journal=SyncJournal(SYNC_JOURNAL))
+        if deleted and args.run:
+            store.export_csv(CREATED_EVENTS_CSV)
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Delete calendar events selected by tag, time window or summary.')
+    parser.add_argument('--run-id', help='Events created by this run (its ID is printed when a sync starts).')
+    parser.add_argument('--program', help='Events of this program (spreadsheet ID or events file name).')
+    parser.add_argument('--teacher', help='Events of this teacher ("First Last").')
+    parser.add_argument('--test', action='store_true', help='Test events (created with --limit).')
+    parser.add_argument('--prefix', help='Events whose summary starts with this text, e.g. "TEST:".')
+    parser.add_argument('--time-min', help='RFC 3339 start of the window.')
+    parser.add_argument('--time-max', help='RFC 3339 end of the window.')
+    parser.add_argument('--calendar-id', help='Calendar to clean up (default: the sync calendar).')
+    parser.add_argument('--run', action='store_true', help='Delete the matches (default only counts them).')
+    parser.add_argument('--yes', action='store_true', help='Skip the confirmation prompt.')
+    parser.add_argument('--batch-size', type=int, help=f'Deletes per batch request (default {CALENDAR_BATCH_LIMIT}).')
+    args = parser.parse_args()
+    if not has_selection(args):
+        parser.error('give at least one of --run-id, --program, --teacher, --test, --prefix, --time-min, --time-max')
+
+    _, calendar_service = get_services()
+    run_from_args(args, calendar_service)
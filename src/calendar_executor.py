@@ -0,0 +1,187 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import backoff
+
+from utils_calendar_general import (
+    BACKOFF_MAX_TRIES,
+    build_service,
+    credentials_from_service,
+    insert_event_idempotent,
+    is_rate_limit_error,
+    is_retryable_error
+)
+from instrumentation import record_retry
+from response_cache import cached, cache_of
+
+# Calendar API default quota is 600 queries per minute per user; stay just under it.
+DEFAULT_RATE = 9.0
+DEFAULT_WORKERS = 8
+MIN_RATE = 0.5
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter with multiplicative decrease on throttling.
+
+    Each API call takes one token. Tokens refill at `rate` per second up to
+    `capacity`. throttle() halves the rate after a 403/429 and recover() steps
+    it back up towards the configured rate after each successful call.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=None, min_rate=MIN_RATE):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Blocks until a token is available, then takes it.
+        """
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def throttle(self):
+        """
+        Halves the refill rate and drains the bucket after a rate-limit response.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+
+    def recover(self):
+        """
+        Additively raises the refill rate back towards its configured maximum.
+        """
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+def calendar_service_factory(credentials, cache=None):
+    """
+    Returns a factory building Calendar services with their own HTTP connection.
+
+    httplib2.Http objects are not thread-safe, so every worker thread gets a
+    separate service wrapping its own authorized transport. With a `cache`
+    (the parent service's ResponseCache), the workers' writes invalidate it.
+    """
+    import httplib2
+    import google_auth_httplib2
+
+    def factory():
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+        return cached(build_service('calendar', 'v3', http=http), cache, 'calendar')
+    return factory
+
+class CalendarExecutor:
+    """
+    Runs Calendar mutations on a bounded thread pool behind a shared rate limiter.
+
+    Args:
+        service_factory (callable): Builds a Calendar service; called once per worker thread.
+        workers (int): Maximum number of concurrent requests.
+        limiter (TokenBucket): Shared rate limiter. A default one is created if omitted.
+        max_tries (int): Attempts per call for throttled or server-side failures.
+    """
+
+    def __init__(self, service_factory, workers=DEFAULT_WORKERS, limiter=None, max_tries=BACKOFF_MAX_TRIES):
+        self.service_factory = service_factory
+        self.workers = max(1, workers)
+        self.limiter = limiter or TokenBucket()
+        self.max_tries = max_tries
+        self._local = threading.local()
+
+    def _service(self):
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self._local.service = self.service_factory()
+        return service
+
+    def _call(self, fn, item):
+        wait = backoff.expo()
+        wait.send(None)
+        for attempt in range(1, self.max_tries + 1):
+            self.limiter.acquire()
+            try:
+                result = fn(self._service(), item)
+            except Exception as e:
+                if not is_retryable_error(e) or attempt == self.max_tries:
+                    raise
+                if is_rate_limit_error(e):
+                    self.limiter.throttle()
+                delay = backoff.full_jitter(next(wait))
+                record_retry('executor', delay)
+                time.sleep(delay)
+                continue
+            self.limiter.recover()
+            return result
+
+    def run(self, fn, items):
+        """
+        Applies `fn(service, item)` to every item concurrently.
+
+        Yields:
+            tuple: (item, result, error) in completion order; exactly one of
+            result/error is meaningful.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._call, fn, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
+
+def executor_for_service(service, workers=DEFAULT_WORKERS, limiter=None):
+    """
+    Builds a CalendarExecutor using the credentials of an existing Calendar service.
+
+    Services that declare `thread_safe = True` (the offline fake) are shared
+    by all workers instead.
+    """
+    if getattr(service, 'thread_safe', False):
+        return CalendarExecutor(lambda: service, workers=workers, limiter=limiter)
+    credentials = credentials_from_service(service)
+    if credentials is None:
+        raise ValueError("Cannot run concurrently: the calendar service has no credentials attached.")
+    return CalendarExecutor(calendar_service_factory(credentials, cache_of(service)), workers=workers,
+                            limiter=limiter)
+
+def insert_event(service, item):
+    """
+    Executor task: inserts one (calendar_id, event_body) pair.
+    """
+    calendar_id, event_body = item
+    return service.events().insert(calendarId=calendar_id, body=event_body).execute()
+
+def insert_keyed_event(service, item):
+    """
+    Executor task: inserts one (calendar_id, event_body) pair whose body may carry
+    its sync key as `id`; an existing or deleted event with that ID is returned
+    or restored (see insert_event_idempotent) instead of failing with 409.
+    """
+    calendar_id, event_body = item
+    return insert_event_idempotent(service, calendar_id, event_body)
+
+def delete_event(service, item):
+    """
+    Executor task: deletes one (calendar_id, event_id) pair.
+    """
+    calendar_id, event_id = item
+    return service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
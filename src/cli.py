@@ -0,0 +1,178 @@
+# Command-line entry point: `scheduler <command>` (or `python3 src/cli.py <command>`).
+# Only argparse is imported up front; each command imports what it needs when it
+# runs, so --help returns immediately and a cron run only loads its own dependencies.
+import sys
+import argparse
+
+# Sentinel for options given without a value (e.g. a bare --workers); resolved to
+# the library default once the command's modules are imported.
+DEFAULT = object()
+
+def cmd_sync(args):
+    from calendar_executor import DEFAULT_WORKERS
+    from utils_calendar_general import CALENDAR_BATCH_LIMIT
+    from sync_scheduler import main
+
+    main(dry_run=not args.run, test_teacher="Stephen Holsenbeck" if args.test else None, limit=args.limit,
+         batch_size=CALENDAR_BATCH_LIMIT if args.batch_size is DEFAULT else args.batch_size,
+         workers=DEFAULT_WORKERS if args.workers is DEFAULT else args.workers, resume=args.resume,
+         recurring=args.recurring, busy_check=not args.no_busy_check)
+
+def cmd_sync_calendar(args):
+    from sync_scheduler import CALENDAR_ID, CREATED_EVENTS_CSV, EVENT_STORE_DB, get_services
+    from event_store import open_event_store
+    from overlap_detection import update_created_events_csv
+
+    _, calendar_service = get_services()
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        update_created_events_csv(calendar_service, CALENDAR_ID, CREATED_EVENTS_CSV,
+                                  incremental=args.incremental, store=store)
+
+def cmd_delete(args):
+    from calendar_executor import DEFAULT_WORKERS
+    from sync_scheduler import CALENDAR_ID, CREATED_EVENTS_CSV, EVENT_STORE_DB, SYNC_JOURNAL, get_services
+    from event_store import open_event_store
+    from sync_journal import SyncJournal
+    from utils_calendar_general import delete_events_from_store
+    from bulk_delete import has_selection, run_from_args
+
+    _, calendar_service = get_services()
+    if has_selection(args):
+        run_from_args(args, calendar_service)
+        return
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        delete_events_from_store(store, calendar_service, CALENDAR_ID,
+                                 workers=DEFAULT_WORKERS if args.workers is DEFAULT else args.workers,
+                                 journal=SyncJournal(SYNC_JOURNAL))
+        store.export_csv(CREATED_EVENTS_CSV)
+
+def cmd_export(args):
+    from sync_scheduler import (CALENDAR_ID, SPREADSHEET_ID, SIGNUP_SHEET, CONTACT_SHEET, TEMPLATE_FILE,
+                                get_services, plan_sheet_events)
+    from utils_calendar_general import iter_calendar_events
+    from exporters import EXPORT_FIELDS, export_events
+
+    sheets_service, calendar_service = get_services()
+    if args.from_sheet:
+        # Rendered from the signup sheet alone: the Calendar API is never called.
+        planned = plan_sheet_events(sheets_service, SPREADSHEET_ID, SIGNUP_SHEET, CONTACT_SHEET, TEMPLATE_FILE,
+                                    recurring=args.recurring)
+        events = planned[0] if planned else []
+    else:
+        events = iter_calendar_events(calendar_service, args.calendar_id or CALENDAR_ID, args.time_min,
+                                      args.time_max, fields=EXPORT_FIELDS)
+    export_events(events, args.output, args.format, calendar_name=args.calendar_name)
+
+def cmd_watch(args):
+    from sync_scheduler import CREATED_EVENTS_CSV, EVENT_STORE_DB, get_services
+    from event_store import open_event_store
+    from watch import SheetWatcher
+
+    sheets_service, calendar_service = get_services()
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        watcher = SheetWatcher(sheets_service, calendar_service, store=store, dry_run=not args.run,
+                               **({'snapshot_path': args.snapshot} if args.snapshot else {}))
+        try:
+            watcher.run(args.interval, args.max_interval, max_polls=1 if args.once else None)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='scheduler', description='Sync the signup sheet with Google Calendar.')
+    parser.add_argument('--report', default='logs/run_report.json',
+                        help='Where to write the run report (timings, API calls, retries).')
+    parser.add_argument('--report-format', choices=['json', 'prometheus'], default='json',
+                        help='Run report format (default json).')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Read the sheet and calendar from the API, bypassing logs/response_cache.db.')
+    parser.add_argument('--clear-cache', action='store_true', help='Empty the response cache before running.')
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    sync = commands.add_parser('sync', help='Create calendar events from the signup sheet.')
+    sync.add_argument('--run', action='store_true', help='Actually create events in the calendar.')
+    sync.add_argument('--test', action='store_true', help='Only process events for Stephen Holsenbeck.')
+    sync.add_argument('--limit', type=int, help='Limit the number of events to create.')
+    mode = sync.add_mutually_exclusive_group()
+    mode.add_argument('--batch-size', type=int, nargs='?', const=DEFAULT,
+                      help='Create events with batch requests (default 50 per batch).')
+    mode.add_argument('--workers', type=int, nargs='?', const=DEFAULT,
+                      help='Create events concurrently (default 8 workers).')
+    sync.add_argument('--resume', action='store_true',
+                      help='Continue an interrupted run using only unconfirmed events in the journal.')
+    sync.add_argument('--recurring', action='store_true',
+                      help='Collapse repeating signups (same teacher and slot) into recurring events.')
+    sync.add_argument('--no-busy-check', action='store_true',
+                      help="Skip the free/busy check of the calendar and the teachers' calendars.")
+    sync.set_defaults(func=cmd_sync)
+
+    sync_calendar = commands.add_parser('sync-calendar', help='Refresh the local event log from the calendar.')
+    sync_calendar.add_argument('--incremental', action='store_true',
+                               help='Only fetch changes since the last sync (uses the stored sync token).')
+    sync_calendar.set_defaults(func=cmd_sync_calendar)
+
+    delete = commands.add_parser('delete', help='Delete every event recorded in the local event log, '
+                                                 'or the events matching the selectors below.')
+    delete.add_argument('--workers', type=int, nargs='?', const=DEFAULT,
+                        help='Delete concurrently (default 8 workers).')
+    selectors = delete.add_argument_group('server-side selection (counts matches unless --run is given)')
+    selectors.add_argument('--run-id', help='Events created by this run (its ID is printed when a sync starts).')
+    selectors.add_argument('--program', help='Events of this program (spreadsheet ID or events file name).')
+    selectors.add_argument('--teacher', help='Events of this teacher ("First Last").')
+    selectors.add_argument('--test', action='store_true', help='Test events (created with --limit).')
+    selectors.add_argument('--prefix', help='Events whose summary starts with this text, e.g. "TEST:".')
+    selectors.add_argument('--time-min', help='RFC 3339 start of the window.')
+    selectors.add_argument('--time-max', help='RFC 3339 end of the window.')
+    selectors.add_argument('--calendar-id', help='Calendar to clean up (default: the sync calendar).')
+    selectors.add_argument('--run', action='store_true', help='Delete the matches.')
+    selectors.add_argument('--yes', action='store_true', help='Skip the confirmation prompt.')
+    selectors.add_argument('--batch-size', type=int, help='Deletes per batch request (default 50).')
+    delete.set_defaults(func=cmd_delete)
+
+    watch = commands.add_parser('watch', help='Poll the signup sheet and push changes as they happen.')
+    watch.add_argument('--run', action='store_true', help='Apply changes (default only prints them).')
+    watch.add_argument('--interval', type=float, default=60, help='Seconds between polls (default 60).')
+    watch.add_argument('--max-interval', type=float, default=900,
+                       help='Longest wait after repeated failures (default 900).')
+    watch.add_argument('--once', action='store_true', help='Poll once and exit (e.g. from cron).')
+    watch.add_argument('--snapshot', help='Snapshot file (default logs/watch_snapshot.json).')
+    watch.set_defaults(func=cmd_watch)
+
+    export = commands.add_parser('export', help='Write calendar events to a CSV, Parquet or .ics file '
+                                                '(e.g. for attendance records or a subscribable feed).')
+    export.add_argument('--output', default='logs/events_attendance.csv',
+                        help='File to write; its extension (.csv, .parquet, .ics) picks the format.')
+    export.add_argument('--format', choices=['csv', 'parquet', 'ics'],
+                        help='Output format when the extension does not say.')
+    export.add_argument('--from-sheet', action='store_true',
+                        help='Export the events rendered from the signup sheet, without reading the calendar.')
+    export.add_argument('--recurring', action='store_true',
+                        help='With --from-sheet, collapse repeating signups into recurring events.')
+    export.add_argument('--calendar-name', help='Calendar name shown to .ics subscribers.')
+    export.add_argument('--calendar-id', help='Calendar to read (default: the sync calendar).')
+    export.add_argument('--time-min', help='RFC 3339 start of the window (default: 30 days ago).')
+    export.add_argument('--time-max', help='RFC 3339 end of the window (default: end of this year).')
+    export.set_defaults(func=cmd_export)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    import os
+    from instrumentation import RECORDER
+    from response_cache import ResponseCache, NO_CACHE_ENV
+
+    if args.no_cache:
+        os.environ[NO_CACHE_ENV] = '1'
+    if args.clear_cache:
+        cache = ResponseCache()
+        print(f"Cleared {cache.invalidate()} cached response(s).")
+        cache.close()
+
+    RECORDER.reset()
+    try:
+        args.func(args)
+    finally:
+        RECORDER.write_report(args.report, args.report_format)
+        print(f"Run report written to {args.report}")
+
+if __name__ == '__main__':
+    sys.exit(main())
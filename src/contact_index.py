@@ -0,0 +1,109 @@
+import re
+import heapq
+import difflib
+import unicodedata
+from collections import Counter, defaultdict
+
+# Optional "Teacher Contact" column of other names a teacher signs up as, separated by commas or semicolons.
+ALIAS_COLUMN = 'Aliases'
+
+# Suggestions scoring below this similarity (0-1) are not offered.
+SUGGEST_CUTOFF = 0.7
+
+# Candidates shortlisted by shared trigrams before the edit-distance ranking.
+SHORTLIST_SIZE = 20
+
+def normalize_name(name):
+    """
+    Lookup key for a name: Unicode-normalized, accents dropped, casefolded,
+    whitespace collapsed. "  ANN   lée" and "Ann Lee" share a key.
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(unicodedata.normalize('NFKC', stripped).casefold().split())
+
+def trigrams(key):
+    """
+    The character trigrams of a normalized key, padded so word edges count.
+    """
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class ContactIndex:
+    """
+    Contact lookup built once per run.
+
+    Full names and aliases (the optional ALIAS_COLUMN) are stored under
+    their normalized key, so casing, accents and stray whitespace still
+    resolve in one dict lookup. Names that do not resolve get ranked
+    suggestions from a trigram index (built on first use), shortlisted by
+    shared trigrams and ranked by edit similarity, so the cost stays
+    small with thousands of contacts.
+
+    Args:
+        teacher_map (dict): "First Last" -> Contact, from build_teacher_map.
+    """
+
+    def __init__(self, teacher_map):
+        self.contacts = {}
+        self.ambiguous = {}
+        for contact in teacher_map.values():
+            self.contacts.setdefault(normalize_name(contact.name), contact)
+        owners = defaultdict(dict)
+        for contact in teacher_map.values():
+            for alias in re.split(r'[,;]', contact.get(ALIAS_COLUMN)):
+                if normalize_name(alias):
+                    owners[normalize_name(alias)][contact.name] = contact
+        for key, contacts in owners.items():
+            if key in self.contacts:
+                continue  # a full name always wins over an alias
+            if len(contacts) == 1:
+                self.contacts[key] = next(iter(contacts.values()))
+            else:
+                self.ambiguous[key] = sorted(contacts)  # shared by several teachers: suggested, never resolved
+        self._postings = None
+        self._sizes = None
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def get(self, name):
+        """
+        The Contact a grid name resolves to, or None.
+        """
+        return self.contacts.get(normalize_name(name))
+
+    def _build_postings(self):
+        postings = defaultdict(list)
+        sizes = {}
+        for key in self.contacts:
+            grams = trigrams(key)
+            sizes[key] = len(grams)
+            for gram in grams:
+                postings[gram].append(key)
+        self._postings, self._sizes = postings, sizes
+
+    def suggest(self, name, limit=3, cutoff=SUGGEST_CUTOFF):
+        """
+        Ranks the contacts a misspelled name most likely refers to.
+
+        Returns:
+            list: (contact name, similarity) pairs, best first, at most `limit`.
+        """
+        if self._postings is None:
+            self._build_postings()
+        query = normalize_name(name)
+        grams = trigrams(query)
+        shared = Counter(key for gram in grams for key in self._postings.get(gram, ()))
+        shortlist = heapq.nlargest(SHORTLIST_SIZE, shared,
+                                   key=lambda key: shared[key] / (len(grams) + self._sizes[key]))
+        ranked = [(contact_name, 1.0) for contact_name in self.ambiguous.get(query, [])]
+        seen = set(self.ambiguous.get(query, []))
+        for key in shortlist:
+            score = difflib.SequenceMatcher(None, query, key).ratio()
+            contact = self.contacts[key]
+            if score >= cutoff and contact.name not in seen:
+                ranked.append((contact.name, round(score, 2)))
+                seen.add(contact.name)
+        ranked.sort(key=lambda pair: -pair[1])  # stable: equal scores keep shortlist order
+        return ranked[:limit]
@@ -0,0 +1,290 @@
+import os
+import re
+import datetime
+import itertools
+from googleapiclient.errors import HttpError
+from utils_calendar_general import (
+    CALENDAR_BATCH_LIMIT,
+    iter_jsonc_array,
+    iter_calendar_events,
+    iter_batched_inserts,
+    insert_event_idempotent
+)
+from event_store import to_utc_iso, open_event_store
+from time_headers import EVENT_TIMEZONE
+from sync_journal import event_key, stamp_event_key, stamp_tags, stamp_content_hash
+from sync_scheduler import (
+    CALENDAR_ID,
+    get_services,
+    created_event_records,
+    append_created_records
+)
+
+# Writable fields of a Calendar event resource (events.insert request body).
+EVENT_RESOURCE_FIELDS = {
+    'id', 'summary', 'description', 'location', 'start', 'end', 'attendees', 'reminders', 'recurrence',
+    'colorId', 'transparency', 'visibility', 'status', 'extendedProperties', 'conferenceData', 'source',
+    'attachments', 'eventType', 'sequence', 'anyoneCanAddSelf', 'guestsCanModify', 'guestsCanInviteOthers',
+    'guestsCanSeeOtherGuests', 'endTimeUnspecified', 'originalStartTime', 'iCalUID', 'gadget', 'locked',
+    'privateCopy', 'organizer', 'focusTimeProperties', 'outOfOfficeProperties', 'workingLocationProperties',
+}
+
+# The importer's own event log and store. Imported events are kept apart
+# from the signup sync's (CREATED_EVENTS_CSV / EVENT_STORE_DB), so deleting
+# or reconciling the sync's sessions never touches them.
+IMPORTED_EVENTS_CSV = 'logs/imported_events.csv'
+IMPORT_STORE_DB = 'logs/imported_events.db'
+
+# Client-supplied event IDs: base32hex characters, 5-1024 long.
+EVENT_ID_RE = re.compile(r'[a-v0-9]{5,1024}')
+
+REMINDER_METHODS = {'email', 'popup'}
+MAX_REMINDER_MINUTES = 40320
+
+def _event_time(value, field):
+    """
+    Validates an event start/end and returns it as an aware datetime (or None).
+    """
+    if not isinstance(value, dict):
+        return None, [f"'{field}' must be an object"]
+    if ('dateTime' in value) == ('date' in value):
+        return None, [f"'{field}' needs exactly one of 'dateTime' or 'date'"]
+    if 'date' in value:
+        try:
+            return datetime.datetime.fromisoformat(value['date']).replace(tzinfo=datetime.timezone.utc), []
+        except (TypeError, ValueError):
+            return None, [f"'{field}.date' is not a YYYY-MM-DD date: {value['date']!r}"]
+    try:
+        dt = datetime.datetime.fromisoformat(str(value['dateTime']).replace('Z', '+00:00'))
+    except ValueError:
+        return None, [f"'{field}.dateTime' is not an RFC 3339 timestamp: {value['dateTime']!r}"]
+    if dt.tzinfo is None and not value.get('timeZone'):
+        return None, [f"'{field}.dateTime' has no UTC offset and '{field}.timeZone' is missing"]
+    utc = to_utc_iso(value['dateTime'], value.get('timeZone') or 'UTC')
+    return datetime.datetime.fromisoformat(utc), []
+
+def validate_event_body(body):
+    """
+    Checks an event body against the Calendar events.insert schema.
+
+    Covers the rules the API would otherwise reject one request at a time:
+    known fields, start/end shape and order, timezone for local times,
+    attendee emails, reminder overrides and client-supplied IDs.
+
+    Returns:
+        list: Error messages; empty if the body is valid.
+    """
+    if not isinstance(body, dict):
+        return ["event must be a JSON object"]
+    errors = [f"unknown field '{key}'" for key in body if key not in EVENT_RESOURCE_FIELDS]
+    if not isinstance(body.get('summary', ''), str):
+        errors.append("'summary' must be a string")
+    if 'id' in body and not EVENT_ID_RE.fullmatch(str(body['id'])):
+        errors.append(f"'id' must be 5-1024 base32hex characters (a-v, 0-9): {body['id']!r}")
+
+    start, start_errors = _event_time(body.get('start'), 'start')
+    end, end_errors = _event_time(body.get('end'), 'end')
+    errors += start_errors + end_errors
+    if start and end and end < start:
+        errors.append("'end' is before 'start'")
+
+    for i, attendee in enumerate(body.get('attendees', [])):
+        if not isinstance(attendee, dict) or '@' not in str(attendee.get('email', '')):
+            errors.append(f"attendees[{i}] needs an 'email' address")
+
+    for i, override in enumerate(body.get('reminders', {}).get('overrides', [])):
+        if override.get('method') not in REMINDER_METHODS:
+            errors.append(f"reminders.overrides[{i}].method must be 'email' or 'popup'")
+        minutes = override.get('minutes')
+        if not isinstance(minutes, int) or not 0 <= minutes <= MAX_REMINDER_MINUTES:
+            errors.append(f"reminders.overrides[{i}].minutes must be 0-{MAX_REMINDER_MINUTES}")
+    return errors
+
+def _start(body):
+    return body['start'].get('dateTime') or body['start'].get('date')
+
+def slot_key(summary, start, tz=None):
+    """
+    Dedupe key for events created without a sync key: (summary, UTC start).
+    """
+    return summary, to_utc_iso(start, tz or EVENT_TIMEZONE)
+
+def default_namespace(path):
+    """
+    Event ID namespace for an events file: its name without extension.
+    """
+    return os.path.splitext(os.path.basename(path))[0]
+
+def prepare_import_body(body, namespace, test_mode=False):
+    """
+    Stamps an imported body with a deterministic ID, tags and content hash.
+
+    The key hashes summary and start, namespaced per import, so re-importing
+    the same file maps every entry to the same calendar event. Test mode
+    prefixes the summary, drops attendees and uses a separate namespace.
+    The namespace (by default the file name) is the program tag.
+    """
+    stamp_tags(body, program=namespace, test=test_mode)
+    if test_mode:
+        body['summary'] = f"TEST: {body.get('summary', '')}"
+        body['attendees'] = []
+        namespace = f"{namespace}:test"
+    if 'id' not in body:
+        start = _start(body)
+        stamp_event_key(body, event_key(body.get('summary', ''), start[:10], start[11:16], namespace=namespace))
+    return stamp_content_hash(body)
+
+def scan_events_file(path, namespace, test_mode=False):
+    """
+    First pass over an events file: validates every body and collects the
+    keys needed for deduplication, without keeping the bodies in memory.
+
+    Returns:
+        dict: 'count', 'errors' [(index, message)], 'ids' (set), 'duplicates'
+        (indices repeating an earlier entry) and the 'time_min'/'time_max' span.
+    """
+    scan = {'count': 0, 'errors': [], 'ids': set(), 'duplicates': set(), 'time_min': None, 'time_max': None}
+    for index, body in enumerate(iter_jsonc_array(path)):
+        scan['count'] += 1
+        errors = validate_event_body(body)
+        if errors:
+            scan['errors'].extend((index, message) for message in errors)
+            continue
+        body = prepare_import_body(body, namespace, test_mode)
+        if body['id'] in scan['ids']:
+            scan['duplicates'].add(index)
+        scan['ids'].add(body['id'])
+        start = to_utc_iso(_start(body), body['start'].get('timeZone') or 'UTC')
+        end = to_utc_iso(body['end'].get('dateTime') or body['end'].get('date'),
+                         body['end'].get('timeZone') or 'UTC')
+        scan['time_min'] = min(filter(None, [scan['time_min'], start]))
+        scan['time_max'] = max(filter(None, [scan['time_max'], end]))
+    return scan
+
+def calendar_index(calendar_service, calendar_id, time_min, time_max):
+    """
+    Indexes the calendar's events over a window by ID and by (summary, UTC start).
+    """
+    ids, slots = set(), set()
+    for event in iter_calendar_events(calendar_service, calendar_id, time_min, time_max):
+        if event.get('status') == 'cancelled':
+            continue
+        ids.add(event['id'])
+        slots.add(slot_key(event.get('summary'), _start(event)))
+    return ids, slots
+
+def iter_new_events(path, namespace, index, skip, test_mode=False):
+    """
+    Second pass: streams the bodies that are valid, unique and not yet on the calendar.
+    """
+    ids, slots = index
+    for position, body in enumerate(iter_jsonc_array(path)):
+        if position in skip:
+            continue
+        body = prepare_import_body(body, namespace, test_mode)
+        if body['id'] in ids or slot_key(body.get('summary'), _start(body), body['start'].get('timeZone')) in slots:
+            continue
+        yield body
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def import_events(path, calendar_service, calendar_id=CALENDAR_ID, dry_run=True, limit=None,
+                  batch_size=CALENDAR_BATCH_LIMIT, namespace=None, skip_invalid=False, assume_yes=False,
+                  csv_path=IMPORTED_EVENTS_CSV, store=None):
+    """
+    Imports a JSON/JSONC list of event bodies into a calendar.
+
+    The file is streamed three times and never held in memory: the first
+    pass validates every body (nothing is sent if any is invalid, unless
+    `skip_invalid`) and finds the covered time window; the calendar is then
+    listed once over that window to build an ID/(summary, start) index; the
+    second pass counts the missing events for the confirmation prompt, and
+    the third streams them through batched inserts.
+
+    Returns:
+        list: Records of the created events.
+    """
+    namespace = namespace or default_namespace(path)
+    test_mode = limit is not None
+    scan = scan_events_file(path, namespace, test_mode)
+    print(f"Scanned {scan['count']} event(s) in {path}.")
+
+    invalid = {index for index, _ in scan['errors']}
+    if scan['errors']:
+        print("\n--- Validation Errors ---")
+        for index, message in scan['errors']:
+            print(f"Event #{index + 1}: {message}")
+        if not skip_invalid:
+            print(f"\n{len(invalid)} invalid event(s); nothing was imported. Fix the file or use --skip-invalid.")
+            return []
+    if scan['duplicates']:
+        print(f"Skipping {len(scan['duplicates'])} duplicate entr(y/ies) within the file.")
+    if scan['count'] == len(invalid):
+        print("No valid events to import.")
+        return []
+
+    index = calendar_index(calendar_service, calendar_id, scan['time_min'], scan['time_max'])
+    skip = invalid | scan['duplicates']
+    pending = sum(1 for _ in iter_new_events(path, namespace, index, skip, test_mode))
+    existing = scan['count'] - len(skip) - pending
+    if limit:
+        pending = min(pending, limit)
+    print(f"{pending} new event(s) to import; {existing} already on the calendar.")
+
+    if not pending:
+        return []
+    if dry_run:
+        print("\n[DRY RUN] No events were created.")
+        return []
+    if not assume_yes:
+        confirm = input(f"\nProceed with importing {pending} events? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Operation cancelled by user.")
+            return []
+
+    new_events = itertools.islice(iter_new_events(path, namespace, index, skip, test_mode), pending)
+    created_records, failures, done = [], 0, 0
+    for chunk in _chunks(new_events, batch_size):
+        for created, failed in iter_batched_inserts(calendar_service, calendar_id, chunk, batch_size):
+            done += len(created) + len(failed)
+            for idx, error in failed:
+                if getattr(getattr(error, 'resp', None), 'status', None) == 409:
+                    # The ID exists outside the indexed window or was deleted: restore it.
+                    try:
+                        created.append((idx, insert_event_idempotent(calendar_service, calendar_id, chunk[idx])))
+                        continue
+                    except HttpError as e:
+                        error = e
+                failures += 1
+                print(f"Failed to create {chunk[idx].get('summary')} at {_start(chunk[idx])}: {error}")
+            batch_records = [record for _, event in created for record in created_event_records(event)]
+            append_created_records(csv_path, batch_records, store)
+            created_records.extend(batch_records)
+            print(f"Progress: {done}/{pending} ({done * 100 // pending}%), "
+                  f"{len(created_records)} created, {failures} failed.")
+    return created_records
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Import a JSON/JSONC list of event bodies into Google Calendar.')
+    parser.add_argument('events_file', help='e.g. calendars/ysc/ysc_cal.jsonc')
+    parser.add_argument('--calendar-id', default=CALENDAR_ID, help='Target calendar (default: the sync calendar).')
+    parser.add_argument('--run', action='store_true', help='Actually create events (default is a dry run).')
+    parser.add_argument('--yes', action='store_true', help='Skip the confirmation prompt.')
+    parser.add_argument('--limit', type=int, help='Test mode: import at most N events, prefixed with TEST:.')
+    parser.add_argument('--batch-size', type=int, default=CALENDAR_BATCH_LIMIT,
+                        help=f'Events per batch request (default {CALENDAR_BATCH_LIMIT}).')
+    parser.add_argument('--namespace', help='Namespace for event IDs (default: the file name).')
+    parser.add_argument('--skip-invalid', action='store_true', help='Import the valid events even if some are not.')
+    args = parser.parse_args()
+
+    _, calendar_service = get_services()
+    with open_event_store(IMPORT_STORE_DB, IMPORTED_EVENTS_CSV) as store:
+        records = import_events(args.events_file, calendar_service, args.calendar_id, dry_run=not args.run,
+                                limit=args.limit, batch_size=args.batch_size, namespace=args.namespace,
+                                skip_invalid=args.skip_invalid, assume_yes=args.yes, store=store)
+    if records:
+        print(f"\nSuccessfully imported {len(records)} events.")
@@ -0,0 +1,226 @@
+import os
+import sqlite3
+import datetime
+from zoneinfo import ZoneInfo
+from records import CreatedEvent, read_created_events, write_created_events
+from time_headers import EVENT_TIMEZONE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    summary TEXT,
+    begin TEXT,
+    begin_utc TEXT,
+    teacher TEXT,
+    updated TEXT,
+    deleted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_summary_begin ON events (summary, begin_utc);
+CREATE INDEX IF NOT EXISTS idx_events_teacher ON events (teacher);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def to_utc_iso(begin, tz=EVENT_TIMEZONE):
+    """
+    Normalizes an ISO date/datetime string to a UTC ISO string for indexing.
+
+    Naive values are interpreted in `tz`. Returns None for empty or unparsable input.
+    """
+    if not begin or not isinstance(begin, str):
+        return None
+    try:
+        dt = datetime.datetime.fromisoformat(begin.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo(tz))
+    return dt.astimezone(datetime.timezone.utc).isoformat()
+
+def teacher_from_summary(summary):
+    """
+    Extracts the teacher name: the text following the ':' in a summary.
+    """
+    if not summary or ':' not in summary:
+        return ''
+    return summary.split(':', 1)[1].strip()
+
+class EventStore:
+    """
+    SQLite-backed record of events created on the calendar.
+
+    Replaces repeated appends to and rewrites of created_events.csv. Rows are
+    keyed on the calendar event ID and indexed on (summary, start) and teacher.
+    Deleted events are kept as tombstones (deleted_at set) so that a later
+    sync or deletion pass can tell "removed" apart from "never seen".
+
+    Records are CreatedEvent instances; dicts in the created_events.csv format
+    (Summary, ID, Begin) are accepted too.
+    """
+
+    def __init__(self, path, tz=EVENT_TIMEZONE):
+        self.path = path
+        self.tz = tz
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _now(self):
+        return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    def upsert_events(self, records):
+        """
+        Inserts or updates records in a single transaction, clearing any tombstones.
+        """
+        with self.conn:
+            return self._upsert(records)
+
+    def _upsert(self, records):
+        now = self._now()
+        records = [CreatedEvent.from_row(r) if isinstance(r, dict) else r for r in records]
+        rows = [
+            (r.id, r.summary, r.begin, to_utc_iso(r.begin, self.tz), teacher_from_summary(r.summary), now)
+            for r in records if r.id
+        ]
+        self.conn.executemany(
+            """
+            INSERT INTO events (id, summary, begin, begin_utc, teacher, updated, deleted_at)
+            VALUES (?, ?, ?, ?, ?, ?, NULL)
+            ON CONFLICT(id) DO UPDATE SET
+                summary = excluded.summary,
+                begin = excluded.begin,
+                begin_utc = excluded.begin_utc,
+                teacher = excluded.teacher,
+                updated = excluded.updated,
+                deleted_at = NULL
+            """,
+            rows)
+        return len(rows)
+
+    def mark_deleted(self, event_ids):
+        """
+        Tombstones the given event IDs.
+        """
+        now = self._now()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE events SET deleted_at = ? WHERE id = ? AND deleted_at IS NULL",
+                [(now, event_id) for event_id in event_ids])
+
+    def replace_all(self, records):
+        """
+        Makes the active set match `records` exactly (a full calendar sync):
+        upserts them and tombstones every other active event, in one transaction.
+        """
+        records = [CreatedEvent.from_row(r) if isinstance(r, dict) else r for r in records]
+        ids = {r.id for r in records if r.id}
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS synced_ids (id TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM synced_ids")
+            self.conn.executemany("INSERT OR IGNORE INTO synced_ids (id) VALUES (?)", [(i,) for i in ids])
+            self.conn.execute(
+                "UPDATE events SET deleted_at = ? WHERE deleted_at IS NULL AND id NOT IN (SELECT id FROM synced_ids)",
+                (self._now(),))
+            self._upsert(records)
+
+    def active_ids(self):
+        """
+        Returns IDs of events that have not been deleted.
+        """
+        return [row['id'] for row in self.conn.execute("SELECT id FROM events WHERE deleted_at IS NULL")]
+
+    def find(self, summary, begin):
+        """
+        Returns the ID of an active event with this summary and start instant, or None.
+        """
+        row = self.conn.execute(
+            "SELECT id FROM events WHERE summary = ? AND begin_utc = ? AND deleted_at IS NULL LIMIT 1",
+            (summary, to_utc_iso(begin, self.tz))).fetchone()
+        return row['id'] if row else None
+
+    def events_for_teacher(self, teacher):
+        """
+        Returns active CreatedEvent records for one teacher, ordered by start.
+        """
+        rows = self.conn.execute(
+            "SELECT summary, id, begin FROM events WHERE teacher = ? AND deleted_at IS NULL ORDER BY begin_utc",
+            (teacher,))
+        return [CreatedEvent(*row) for row in rows]
+
+    def created_events(self, include_deleted=False):
+        """
+        Returns events as CreatedEvent records, ordered by start.
+        """
+        query = "SELECT summary, id, begin FROM events"
+        if not include_deleted:
+            query += " WHERE deleted_at IS NULL"
+        return [CreatedEvent(*row) for row in self.conn.execute(query + " ORDER BY begin_utc")]
+
+    def to_dataframe(self, include_deleted=False):
+        """
+        Returns events as a DataFrame with the created_events.csv columns (needs pandas).
+        """
+        import pandas as pd
+        query = "SELECT summary AS Summary, id AS ID, begin AS Begin FROM events"
+        if not include_deleted:
+            query += " WHERE deleted_at IS NULL"
+        return pd.read_sql_query(query + " ORDER BY begin_utc", self.conn)
+
+    def get_state(self, key):
+        """
+        Returns a stored sync-state value (e.g. a calendar sync token), or None.
+        """
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_state(self, key, value):
+        """
+        Stores a sync-state value; None removes it.
+        """
+        with self.conn:
+            if value is None:
+                self.conn.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+            else:
+                self.conn.execute(
+                    "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (key, value))
+
+    def import_csv(self, csv_path):
+        """
+        Upserts the rows of a created_events.csv file ('ID' or 'id' column).
+        """
+        return self.upsert_events(read_created_events(csv_path))
+
+    def export_csv(self, csv_path):
+        """
+        Writes active events to a created_events.csv file.
+        """
+        records = self.created_events()
+        write_created_events(csv_path, records)
+        return len(records)
+
+def open_event_store(db_path, csv_path=None):
+    """
+    Opens the event store, seeding a new database from an existing CSV log.
+    """
+    is_new = not os.path.exists(db_path)
+    store = EventStore(db_path)
+    if is_new and csv_path:
+        imported = store.import_csv(csv_path)
+        if imported:
+            print(f"Imported {imported} events from {csv_path} into {db_path}.")
+    return store
@@ -0,0 +1,147 @@
+import os
+import re
+import functools
+
+# A well-formed placeholder: {Name}, where Name may contain spaces or '/'.
+PLACEHOLDER = re.compile(r'\{([^{}\n]+)\}')
+
+class TemplateError(ValueError):
+    """
+    Raised when an event template cannot be parsed or has malformed placeholders.
+    """
+
+def _split_placeholders(text, path):
+    """
+    Splits a template string into alternating literal and placeholder parts.
+
+    Returns:
+        tuple: (literal, name, literal, name, ..., literal), or None if the
+        string contains no placeholders.
+    """
+    parts = PLACEHOLDER.split(text)
+    literals = parts[0::2]
+    for literal in literals:
+        if '{' in literal or '}' in literal:
+            location = '/'.join(str(p) for p in path) or '<root>'
+            raise TemplateError(f"Malformed placeholder in {location}: {text!r}")
+    if len(parts) == 1:
+        return None
+    return tuple(parts)
+
+def _string_renderer(parts):
+    names = parts[1::2]
+    literals = parts[0::2]
+
+    def render(variables):
+        out = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            value = variables.get(name)
+            # Unknown placeholders are left as-is, like a plain str.replace would.
+            out.append(f"{{{name}}}" if value is None and name not in variables else str(value))
+            out.append(literal)
+        return ''.join(out)
+    return render
+
+class EventTemplate:
+    """
+    A calendar event template compiled once into placeholder slots.
+
+    The JSONC template is parsed a single time. Every string containing
+    `{Placeholder}` tokens becomes a slot (its path in the event body plus the
+    literal/placeholder parts), and rendering fills those slots directly
+    instead of rewriting and re-parsing the template text for each event.
+
+    Attributes:
+        structure: The parsed template (dicts, lists and scalars).
+        slots (list): (path, parts) pairs, where path is a tuple of keys/indices
+            and parts alternates literals and placeholder names.
+    """
+
+    def __init__(self, structure):
+        self.structure = structure
+        self.slots = []
+        self._render = self._compile(structure, ())
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Compiles a template from JSONC text.
+        """
+        from jsonc_parser.parser import JsoncParser
+        try:
+            structure = JsoncParser.parse_str(text)
+        except Exception as e:
+            raise TemplateError(f"Template is not valid JSONC: {e}") from e
+        return cls(structure)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Compiles a template from a JSONC file.
+        """
+        with open(path, 'r') as f:
+            return cls.from_text(f.read())
+
+    @property
+    def placeholders(self):
+        """
+        Names of all placeholders used by the template.
+        """
+        return {name for _, parts in self.slots for name in parts[1::2]}
+
+    def _compile(self, node, path):
+        if isinstance(node, dict):
+            items = []
+            for key, value in node.items():
+                key_parts = _split_placeholders(key, path + (key,))
+                if key_parts:
+                    self.slots.append((path + (key,), key_parts))
+                key_fn = _string_renderer(key_parts) if key_parts else None
+                items.append((key, key_fn, self._compile(value, path + (key,))))
+
+            def render_dict(variables):
+                return {(key_fn(variables) if key_fn else key): value_fn(variables)
+                        for key, key_fn, value_fn in items}
+            return render_dict
+
+        if isinstance(node, list):
+            item_fns = [self._compile(value, path + (i,)) for i, value in enumerate(node)]
+            return lambda variables: [fn(variables) for fn in item_fns]
+
+        if isinstance(node, str):
+            parts = _split_placeholders(node, path)
+            if parts:
+                self.slots.append((path, parts))
+                return _string_renderer(parts)
+
+        return lambda variables: node
+
+    def render(self, variables):
+        """
+        Builds an event body by filling every slot from `variables`.
+
+        Args:
+            variables (dict): Placeholder name -> value. Values are converted
+                with str(); placeholders without a value are left untouched.
+
+        Returns:
+            dict: A new event body; nothing is shared between renders.
+        """
+        return self._render(variables)
+
+@functools.lru_cache(maxsize=8)
+def compile_template_text(text):
+    """
+    Compiles template text, reusing the result for identical text.
+    """
+    return EventTemplate.from_text(text)
+
+def load_template(path):
+    """
+    Loads and compiles a template file, cached until the file changes.
+    """
+    return _load_template(path, os.path.getmtime(path))
+
+@functools.lru_cache(maxsize=8)
+def _load_template(path, mtime):
+    return EventTemplate.from_file(path)
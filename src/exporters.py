@@ -0,0 +1,344 @@
+import os
+import csv
+import datetime
+import itertools
+from zoneinfo import ZoneInfo
+from time_headers import EVENT_TIMEZONE
+from recurrence import occurrence_dates
+
+# Columns of the attendance export (CSV and Parquet).
+ATTENDANCE_COLUMNS = ['Summary', 'Begin (Datetime)', 'Teacher', 'Date', 'Day', 'Start']
+
+# Listing mask for exports: what an .ics feed needs besides the attendance columns.
+EXPORT_FIELDS = 'id,iCalUID,summary,description,location,start,end,recurrence,status'
+
+# Rows buffered per write (and per Parquet row group).
+EXPORT_CHUNK_SIZE = 1000
+
+FORMATS = ('csv', 'parquet', 'ics')
+
+ICS_PRODID = '-//30-day-scheduler//Calendar Export//EN'
+
+# RFC 5545 3.1: content lines are folded at 75 octets.
+ICS_LINE_OCTETS = 75
+
+# Years of time zone transitions written for a series without an end.
+ICS_OPEN_SERIES_YEARS = 5
+
+def export_format(path):
+    """
+    The export format implied by a file extension (.csv, .parquet, .ics).
+    """
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot tell the export format of {path}: use one of {', '.join(FORMATS)}.")
+    return fmt
+
+def chunked(iterable, size=EXPORT_CHUNK_SIZE):
+    """
+    Yields lists of up to `size` items, consuming `iterable` lazily.
+    """
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def attendance_row(event):
+    """
+    The attendance record of an event resource, or None if it has no start.
+
+    The teacher is the text after the ':' in the summary.
+    """
+    summary = event.get('summary', '')
+    start_info = event.get('start', {})
+    dt_str = start_info.get('dateTime') or start_info.get('date')
+    if not dt_str:
+        return None
+    dt = datetime.datetime.fromisoformat(dt_str)
+    return {
+        'Summary': summary,
+        'Begin (Datetime)': dt_str,
+        'Teacher': summary.split(':', 1)[1].strip() if ':' in summary else '',
+        'Date': dt.strftime('%Y-%m-%d'),
+        'Day': dt.strftime('%A'),
+        'Start': dt.strftime('%H:%M')
+    }
+
+def attendance_rows(events):
+    """
+    Streams attendance records, skipping events without a start.
+    """
+    return (row for row in map(attendance_row, events) if row is not None)
+
+def _open_output(path, mode='w', **kwargs):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return open(path, mode, **kwargs)
+
+def write_csv(events, path, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Writes the attendance CSV, `chunk_size` rows at a time.
+
+    Returns:
+        int: Rows written.
+    """
+    count = 0
+    with _open_output(path, newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=ATTENDANCE_COLUMNS, lineterminator='\n')
+        writer.writeheader()
+        for chunk in chunked(attendance_rows(events), chunk_size):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+def _local_datetime(value, tz=EVENT_TIMEZONE):
+    dt = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.replace(tzinfo=ZoneInfo(tz))
+
+def write_parquet(events, path, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Writes the attendance records as Parquet, one row group per chunk.
+
+    Columns are typed: 'Begin (Datetime)' is a timestamp in the event time
+    zone and 'Date' a date, so the notebook reloads them without parsing
+    strings. Requires the optional `pyarrow` package.
+
+    Returns:
+        int: Rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from None
+
+    schema = pa.schema([
+        ('Summary', pa.string()),
+        ('Begin (Datetime)', pa.timestamp('us', tz=EVENT_TIMEZONE)),
+        ('Teacher', pa.string()),
+        ('Date', pa.date32()),
+        ('Day', pa.string()),
+        ('Start', pa.string()),
+    ])
+    count = 0
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunked(attendance_rows(events), chunk_size):
+            columns = {column: [row[column] for row in chunk] for column in ATTENDANCE_COLUMNS}
+            columns['Begin (Datetime)'] = [_local_datetime(value) for value in columns['Begin (Datetime)']]
+            columns['Date'] = [datetime.date.fromisoformat(value) for value in columns['Date']]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+def ics_escape(text):
+    """
+    Escapes a TEXT value (RFC 5545 3.3.11).
+    """
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def ics_fold(line):
+    """
+    Folds a content line into CRLF-terminated lines of at most 75 octets,
+    without splitting UTF-8 characters.
+    """
+    pieces, current, size = [], '', 0
+    for char in line:
+        octets = len(char.encode('utf-8'))
+        if size + octets > ICS_LINE_OCTETS:
+            pieces.append(current)
+            current, size = ' ', 1
+        current += char
+        size += octets
+    pieces.append(current)
+    return '\r\n'.join(pieces) + '\r\n'
+
+def _utc_stamp(dt):
+    return f"{dt.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+
+def series_timezone(event):
+    """
+    The time zone a recurring timed event repeats in, or None.
+
+    A series must keep its local wall time across DST changes, so its
+    DTSTART and EXDATEs are written in this zone rather than in UTC.
+    """
+    start = event.get('start') or {}
+    if not event.get('recurrence') or not start.get('dateTime'):
+        return None
+    return start.get('timeZone') or EVENT_TIMEZONE
+
+def ics_time(name, value, tz=None):
+    """
+    DTSTART/DTEND line for an event's start or end: a DATE for all-day
+    events, local time with a TZID when `tz` is given (recurring events),
+    otherwise the instant in UTC (local times use their timeZone).
+    """
+    if value.get('date') and not value.get('dateTime'):
+        return f"{name};VALUE=DATE:{value['date'].replace('-', '')}"
+    dt = _local_datetime(value['dateTime'], value.get('timeZone') or EVENT_TIMEZONE)
+    if tz:
+        return f"{name};TZID={tz}:{dt.astimezone(ZoneInfo(tz)):%Y%m%dT%H%M%S}"
+    return f"{name}:{_utc_stamp(dt)}"
+
+def _exdate_instant(value, params, tz):
+    if value.endswith('Z'):
+        return datetime.datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=datetime.timezone.utc)
+    zone = params.get('TZID', tz)
+    return datetime.datetime.strptime(value, '%Y%m%dT%H%M%S').replace(tzinfo=ZoneInfo(zone))
+
+def ics_recurrence(lines, tz=None):
+    """
+    Recurrence lines for a DTSTART in `tz`: EXDATEs given in UTC or another
+    TZID are rewritten in `tz`, since EXDATE must match DTSTART's value
+    type and an occurrence is only excluded by its exact local start.
+    Date-only EXDATEs and all-day series are left as they are.
+    """
+    converted = []
+    for line in lines:
+        name, _, values = line.partition(':')
+        parts = name.split(';')
+        params = dict(part.split('=', 1) for part in parts[1:] if '=' in part)
+        if tz and parts[0] == 'EXDATE' and params.get('VALUE') != 'DATE':
+            zone = ZoneInfo(tz)
+            values = ','.join(f"{_exdate_instant(value, params, tz).astimezone(zone):%Y%m%dT%H%M%S}"
+                              for value in values.split(','))
+            line = f"EXDATE;TZID={tz}:{values}"
+        converted.append(line)
+    return converted
+
+def series_years(event, tz):
+    """
+    The (first, last) years a recurring event's occurrences fall in.
+    """
+    first = _local_datetime(event['start']['dateTime'], tz).astimezone(ZoneInfo(tz)).date()
+    dates = occurrence_dates(first, event.get('recurrence') or [])
+    return first.year, dates[-1].year if dates else first.year + ICS_OPEN_SERIES_YEARS
+
+def _offset(delta):
+    minutes = int(delta.total_seconds()) // 60
+    sign = '-' if minutes < 0 else '+'
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+def _transitions(zone, year):
+    """
+    The UTC instants in `year` at which `zone` changes offset, to the minute.
+    """
+    day = datetime.timedelta(days=1)
+    probe = datetime.datetime(year, 1, 1, tzinfo=datetime.timezone.utc)
+    found = []
+    while probe.year == year:
+        low, high = probe, probe + day
+        if low.astimezone(zone).utcoffset() != high.astimezone(zone).utcoffset():
+            while high - low > datetime.timedelta(minutes=1):
+                middle = low + (high - low) / 2
+                if middle.astimezone(zone).utcoffset() == low.astimezone(zone).utcoffset():
+                    low = middle
+                else:
+                    high = middle
+            found.append(high.replace(second=0, microsecond=0))
+        probe += day
+    return found
+
+def ics_timezone(tz, first_year, last_year):
+    """
+    A VTIMEZONE for `tz` covering `first_year` to `last_year`: one
+    observance from January 1 of the first year, then one per offset
+    change, taken from the zoneinfo database.
+    """
+    zone = ZoneInfo(tz)
+
+    def observance(instant, before):
+        after = instant.astimezone(zone)
+        kind = 'DAYLIGHT' if after.dst() else 'STANDARD'
+        local = (instant + before).replace(tzinfo=None)  # DTSTART is in the offset in effect before
+        return [f"BEGIN:{kind}", f"DTSTART:{local:%Y%m%dT%H%M%S}", f"TZOFFSETFROM:{_offset(before)}",
+                f"TZOFFSETTO:{_offset(after.utcoffset())}", f"TZNAME:{after.tzname()}", f"END:{kind}"]
+
+    start = datetime.datetime(first_year, 1, 1, tzinfo=zone).astimezone(datetime.timezone.utc)
+    lines = ['BEGIN:VTIMEZONE', f"TZID:{tz}"] + observance(start, start.astimezone(zone).utcoffset())
+    for year in range(first_year, last_year + 1):
+        for instant in _transitions(zone, year):
+            lines.extend(observance(instant, (instant - datetime.timedelta(minutes=1)).astimezone(zone).utcoffset()))
+    lines.append('END:VTIMEZONE')
+    return lines
+
+def ics_event(event, dtstamp):
+    """
+    The VEVENT content lines of an event resource (or a rendered event body).
+
+    Attendees are left out: the feed is meant for sharing.
+    """
+    uid = event.get('iCalUID') or f"{event.get('id')}@google.com"
+    tz = series_timezone(event)
+    lines = ['BEGIN:VEVENT', f"UID:{uid}", f"DTSTAMP:{dtstamp}", ics_time('DTSTART', event['start'], tz)]
+    if event.get('end'):
+        lines.append(ics_time('DTEND', event['end'], tz))
+    lines.extend(ics_recurrence(event.get('recurrence') or [], tz))
+    for name, field in (('SUMMARY', 'summary'), ('DESCRIPTION', 'description'), ('LOCATION', 'location')):
+        if event.get(field):
+            lines.append(f"{name}:{ics_escape(event[field])}")
+    lines.append('END:VEVENT')
+    return lines
+
+def write_ics(events, path, calendar_name=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Writes an RFC 5545 calendar, `chunk_size` events at a time.
+
+    Cancelled events and events without a start are skipped. Recurring
+    events are written in their time zone; the VTIMEZONE of each zone used
+    follows the events (RFC 5545 leaves component order free), so the file
+    is still written in one pass.
+
+    Returns:
+        int: Events written.
+    """
+    dtstamp = _utc_stamp(datetime.datetime.now(datetime.timezone.utc))
+    header = ['BEGIN:VCALENDAR', 'VERSION:2.0', f"PRODID:{ICS_PRODID}", 'CALSCALE:GREGORIAN']
+    if calendar_name:
+        header.append(f"X-WR-CALNAME:{ics_escape(calendar_name)}")
+
+    count = 0
+    years = {}  # time zone -> (first, last) year its series cover
+    events = (event for event in events
+              if event.get('status') != 'cancelled' and (event.get('start') or {}).keys() & {'date', 'dateTime'})
+    with _open_output(path, newline='', encoding='utf-8') as f:
+        f.write(''.join(map(ics_fold, header)))
+        for chunk in chunked(events, chunk_size):
+            f.write(''.join(ics_fold(line) for event in chunk for line in ics_event(event, dtstamp)))
+            count += len(chunk)
+            for event in chunk:
+                tz = series_timezone(event)
+                if tz:
+                    first, last = series_years(event, tz)
+                    known = years.get(tz, (first, last))
+                    years[tz] = (min(known[0], first), max(known[1], last))
+        for tz, (first, last) in sorted(years.items()):
+            f.write(''.join(map(ics_fold, ics_timezone(tz, first, last))))
+        f.write(ics_fold('END:VCALENDAR'))
+    return count
+
+def export_events(events, path, fmt=None, calendar_name=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Streams events (any iterable, e.g. iter_calendar_events) to a CSV,
+    Parquet or .ics file; memory use stays flat however many there are.
+
+    Args:
+        events: Event resources or rendered event bodies.
+        path (str): File to write.
+        fmt (str): 'csv', 'parquet' or 'ics'; default from the file extension.
+        calendar_name (str): Calendar name shown by subscribers (.ics only).
+
+    Returns:
+        int: Records written.
+    """
+    fmt = fmt or export_format(path)
+    if fmt == 'csv':
+        count = write_csv(events, path, chunk_size)
+    elif fmt == 'parquet':
+        count = write_parquet(events, path, chunk_size)
+    elif fmt == 'ics':
+        count = write_ics(events, path, calendar_name, chunk_size)
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}: use one of {', '.join(FORMATS)}.")
+    print(f"Exported {count} events to {path}")
+    return count
@@ -0,0 +1,511 @@
+import re
+import json
+import time
+import uuid
+import random
+import datetime
+import threading
+from zoneinfo import ZoneInfo
+from collections import Counter
+import httplib2
+from googleapiclient.errors import HttpError
+from recurrence import occurrence_dates, master_event_id
+
+# freebusy.query accepts at most this many calendars per request.
+FREEBUSY_MAX_CALENDARS = 50
+
+def http_error(status, reason, message=''):
+    """
+    Builds an HttpError shaped like a real Google API error response.
+    """
+    resp = httplib2.Response({'status': status})
+    resp.reason = message or reason
+    content = json.dumps({'error': {'code': status, 'message': message or reason,
+                                    'errors': [{'reason': reason, 'message': message or reason}]}})
+    return HttpError(resp, content.encode('utf-8'))
+
+def _col_index(letters):
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+def _parse_a1(a1_range):
+    """
+    Splits "'Sheet'!A1:F100" into (sheet, (row0, col0, row1, col1) or None).
+    """
+    match = re.fullmatch(r"(?:'((?:[^']|'')+)'|([^!]+))(?:!([A-Z]+)(\d+):([A-Z]+)(\d+))?", a1_range)
+    if not match:
+        raise http_error(400, 'badRequest', f"Unable to parse range: {a1_range}")
+    sheet = (match.group(1) or match.group(2)).replace("''", "'")
+    if not match.group(3):
+        return sheet, None
+    return sheet, (int(match.group(4)) - 1, _col_index(match.group(3)) - 1,
+                   int(match.group(6)), _col_index(match.group(5)))
+
+def _parse_time(value, tz='UTC'):
+    if not value:
+        return None
+    if len(value) == 10:
+        value += 'T00:00:00'
+    dt = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo(tz or 'UTC'))
+    return dt
+
+def _event_time(event, field):
+    """
+    An event's start or end as an aware datetime (local times use its timeZone).
+    """
+    value = event.get(field) or {}
+    return _parse_time(value.get('dateTime') or value.get('date'), value.get('timeZone'))
+
+def _utc_rfc3339(dt):
+    return f"{dt.astimezone(datetime.timezone.utc):%Y-%m-%dT%H:%M:%SZ}"
+
+class FakeRequest:
+    """
+    Stand-in for googleapiclient's HttpRequest: execute() runs the call.
+
+    Like the real API, a response whose etag matches an If-None-Match
+    header fails with 304 Not Modified.
+    """
+
+    def __init__(self, fake, endpoint, handler, params=None):
+        self.fake = fake
+        self.endpoint = endpoint
+        self.handler = handler
+        self.params = params or {}
+        self.headers = {}
+
+    def execute(self, num_retries=0, **kwargs):
+        self.fake._before_call(self.endpoint)
+        result = self.handler()
+        etag = result.get('etag') if isinstance(result, dict) else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            raise http_error(304, 'notModified', 'Not Modified')
+        return result
+
+class FakeBatch:
+    """
+    Stand-in for BatchHttpRequest: one round trip, one callback per sub-request.
+    """
+
+    def __init__(self, fake, callback=None):
+        self.fake = fake
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        if len(self.requests) >= self.fake.max_batch_size:
+            raise ValueError(f"Exceeded the maximum of {self.fake.max_batch_size} calls in a single batch.")
+        self.requests.append((request_id or str(len(self.requests) + 1), request, callback))
+
+    def execute(self, num_retries=0, **kwargs):
+        self.fake._before_call('batch')
+        for request_id, request, callback in self.requests:
+            response, exception = None, None
+            try:
+                self.fake._maybe_fail(request.endpoint)
+                self.fake.calls[request.endpoint] += 1
+                response = request.handler()
+            except HttpError as e:
+                exception = e
+            (callback or self.callback)(request_id, response, exception)
+
+class FakeSheetsService:
+    """
+    Sheets v4 surface: spreadsheets().get, values().get and values().batchGet.
+    """
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _read(self, spreadsheet_id, a1_range):
+        sheets = self.fake.spreadsheets.get(spreadsheet_id)
+        if sheets is None:
+            raise http_error(404, 'notFound', f"Requested entity was not found: {spreadsheet_id}")
+        sheet, bounds = _parse_a1(a1_range)
+        if sheet not in sheets:
+            raise http_error(400, 'badRequest', f"Unable to parse range: {a1_range}")
+        rows = sheets[sheet]
+        if bounds:
+            row0, col0, row1, col1 = bounds
+            rows = [row[col0:col1] for row in rows[row0:row1]]
+        # Like the real API, trailing empty cells and rows are trimmed.
+        rows = [list(row) for row in rows]
+        for row in rows:
+            while row and row[-1] in ('', None):
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        value_range = {'range': a1_range, 'majorDimension': 'ROWS'}
+        if rows:
+            value_range['values'] = rows
+        return value_range
+
+    def get(self, spreadsheetId, range=None, fields=None, **kwargs):
+        if range is None:
+            sheets = self.fake.spreadsheets.get(spreadsheetId, {})
+            return FakeRequest(self.fake, 'sheets.spreadsheets.get', lambda: {'sheets': [
+                {'properties': {'title': title, 'gridProperties': {
+                    'rowCount': len(rows), 'columnCount': max((len(r) for r in rows), default=0)}}}
+                for title, rows in sheets.items()]})
+        return FakeRequest(self.fake, 'sheets.values.get', lambda: self._read(spreadsheetId, range))
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        return FakeRequest(self.fake, 'sheets.values.batchGet', lambda: {
+            'spreadsheetId': spreadsheetId,
+            'valueRanges': [self._read(spreadsheetId, r) for r in ranges]})
+
+class FakeCalendarService:
+    """
+    Calendar v3 surface: events() insert/get/list/list_next/patch/update/delete,
+    freebusy().query and new_batch_http_request.
+
+    Instances are thread-safe, so the concurrent executor may share one.
+    """
+
+    thread_safe = True
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def events(self):
+        return self
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self.fake, callback)
+
+    def freebusy(self):
+        return FakeFreeBusy(self)
+
+    def _calendar(self, calendar_id):
+        return self.fake.calendars.setdefault(calendar_id, {})
+
+    def _store(self, calendar_id, event):
+        with self.fake.lock:
+            self.fake.version += 1
+            event['updated'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            event['_version'] = self.fake.version
+            self._calendar(calendar_id)[event['id']] = event
+        return self._public(event)
+
+    @staticmethod
+    def _public(event):
+        return {k: v for k, v in event.items() if not k.startswith('_')}
+
+    @staticmethod
+    def _instances(event):
+        """
+        Expands a recurring event like singleEvents=true: one event per
+        occurrence with its instance ID and recurringEventId, minus the
+        occurrences deleted individually.
+        """
+        start, end = _event_time(event, 'start'), _event_time(event, 'end')
+        tz = event['start'].get('timeZone') or 'UTC'
+        start = start.astimezone(ZoneInfo(tz))
+        dates = occurrence_dates(start.date(), event['recurrence'])
+        if dates is None or event.get('status') == 'cancelled':
+            return []
+        instances = []
+        for date in dates:
+            begin = datetime.datetime.combine(date, start.timetz().replace(tzinfo=None), tzinfo=ZoneInfo(tz))
+            instance_id = f"{event['id']}_{begin.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+            if instance_id in event.get('_cancelled', ()):
+                continue
+            instance = {k: v for k, v in event.items() if k != 'recurrence'}
+            instance.update(id=instance_id, recurringEventId=event['id'],
+                            originalStartTime={'dateTime': begin.isoformat(), 'timeZone': tz},
+                            start={'dateTime': begin.isoformat(), 'timeZone': tz},
+                            end={'dateTime': (begin + (end - start)).isoformat(), 'timeZone': tz})
+            instances.append(instance)
+        return instances
+
+    def insert(self, calendarId, body, **kwargs):
+        def handler():
+            event = json.loads(json.dumps(body))
+            event_id = event.get('id') or uuid.uuid4().hex
+            if event_id in self._calendar(calendarId):
+                raise http_error(409, 'duplicate', 'The requested identifier already exists.')
+            event.update(id=event_id, status='confirmed',
+                         htmlLink=f"https://calendar.example/event?eid={event_id}")
+            return self._store(calendarId, event)
+        return FakeRequest(self.fake, 'calendar.events.insert', handler)
+
+    def get(self, calendarId, eventId, **kwargs):
+        def handler():
+            event = self._calendar(calendarId).get(eventId)
+            if event is None:
+                raise http_error(404, 'notFound', 'Not Found')
+            return self._public(event)
+        return FakeRequest(self.fake, 'calendar.events.get', handler)
+
+    def _modify(self, endpoint, calendarId, eventId, body, replace):
+        def handler():
+            existing = self._calendar(calendarId).get(eventId)
+            if existing is None:
+                raise http_error(404, 'notFound', 'Not Found')
+            if existing.get('status') == 'cancelled' and body.get('status') != 'confirmed':
+                raise http_error(410, 'deleted', 'Resource has been deleted')
+            updated = {'id': eventId, 'htmlLink': existing.get('htmlLink'), 'status': 'confirmed'} if replace \
+                else dict(existing)
+            updated.update(json.loads(json.dumps(body)))
+            updated['id'] = eventId
+            return self._store(calendarId, updated)
+        return FakeRequest(self.fake, endpoint, handler)
+
+    def patch(self, calendarId, eventId, body, **kwargs):
+        return self._modify('calendar.events.patch', calendarId, eventId, body, replace=False)
+
+    def update(self, calendarId, eventId, body, **kwargs):
+        return self._modify('calendar.events.update', calendarId, eventId, body, replace=True)
+
+    def delete(self, calendarId, eventId, **kwargs):
+        def handler():
+            existing = self._calendar(calendarId).get(eventId)
+            master = self._calendar(calendarId).get(master_event_id(eventId))
+            if existing is None and master is not None and master.get('recurrence'):
+                # Deleting an instance cancels that one occurrence of the series.
+                if eventId not in {e['id'] for e in self._instances(master)}:
+                    raise http_error(410, 'deleted', 'Resource has been deleted')
+                self._store(calendarId, dict(master, _cancelled=master.get('_cancelled', []) + [eventId]))
+                return ''
+            if existing is None:
+                raise http_error(404, 'notFound', 'Not Found')
+            if existing.get('status') == 'cancelled':
+                raise http_error(410, 'deleted', 'Resource has been deleted')
+            self._store(calendarId, dict(existing, status='cancelled'))
+            return ''
+        return FakeRequest(self.fake, 'calendar.events.delete', handler)
+
+    def _list_page(self, params):
+        events = list(self._calendar(params['calendarId']).values())
+        sync_token = params.get('syncToken')
+        if sync_token:
+            if int(sync_token) < self.fake.min_sync_version:
+                raise http_error(410, 'fullSyncRequired', 'Sync token is no longer valid.')
+            events = [e for e in events if e['_version'] > int(sync_token)]
+        else:
+            events = [e for e in events if e.get('status') != 'cancelled' or params.get('showDeleted')]
+            if params.get('singleEvents') in (True, 'true'):
+                events = [instance for e in events
+                          for instance in (self._instances(e) if e.get('recurrence') else [e])]
+            time_min, time_max = _parse_time(params.get('timeMin')), _parse_time(params.get('timeMax'))
+            if time_min or time_max:
+                def in_window(e):
+                    start = _event_time(e, 'start')
+                    end = _event_time(e, 'end') or start
+                    return (time_max is None or start < time_max) and (time_min is None or end > time_min)
+                events = [e for e in events if in_window(e)]
+            filters = params.get('privateExtendedProperty') or []
+            for condition in [filters] if isinstance(filters, str) else filters:
+                key, _, value = condition.partition('=')
+                events = [e for e in events
+                          if e.get('extendedProperties', {}).get('private', {}).get(key) == value]
+            query = params.get('q')
+            if query:
+                events = [e for e in events if query.lower() in (e.get('summary') or '').lower()]
+            if params.get('orderBy') == 'startTime':
+                events.sort(key=lambda e: _event_time(e, 'start'))
+
+        page_size = min(int(params.get('maxResults') or 250), self.fake.max_page_size)
+        offset = int(params.get('pageToken') or 0)
+        result = {'kind': 'calendar#events', 'etag': f'"{self.fake.version}"',
+                  'items': [self._public(e) for e in events[offset:offset + page_size]]}
+        if offset + page_size < len(events):
+            result['nextPageToken'] = str(offset + page_size)
+        elif 'orderBy' not in params:
+            result['nextSyncToken'] = str(self.fake.version)
+        return result
+
+    def list(self, calendarId, **kwargs):
+        params = dict(kwargs, calendarId=calendarId)
+        return FakeRequest(self.fake, 'calendar.events.list', lambda: self._list_page(params), params)
+
+    def list_next(self, previous_request, previous_response):
+        page_token = previous_response.get('nextPageToken')
+        if not page_token:
+            return None
+        params = dict(previous_request.params, pageToken=page_token)
+        return FakeRequest(self.fake, 'calendar.events.list', lambda: self._list_page(params), params)
+
+class FakeFreeBusy:
+    """
+    freebusy() resource: query() reports the merged busy blocks of each
+    calendar the fake holds. Transparent and cancelled events are free;
+    unknown calendars get a notFound error, as for a calendar not shared.
+    """
+
+    def __init__(self, calendar_service):
+        self.calendar_service = calendar_service
+        self.fake = calendar_service.fake
+
+    def query(self, body, **kwargs):
+        def handler():
+            if len(body.get('items', [])) > FREEBUSY_MAX_CALENDARS:
+                raise http_error(400, 'tooManyCalendarsRequested', 'Too many calendars requested.')
+            time_min, time_max = _parse_time(body['timeMin']), _parse_time(body['timeMax'])
+            calendars = {}
+            for item in body.get('items', []):
+                calendar_id = item['id']
+                if calendar_id not in self.fake.calendars:
+                    calendars[calendar_id] = {'errors': [{'domain': 'global', 'reason': 'notFound'}], 'busy': []}
+                    continue
+                blocks = []
+                for event in self.fake.calendars[calendar_id].values():
+                    if event.get('status') == 'cancelled' or event.get('transparency') == 'transparent':
+                        continue
+                    for occurrence in self.calendar_service._instances(event) if event.get('recurrence') else [event]:
+                        start, end = _event_time(occurrence, 'start'), _event_time(occurrence, 'end')
+                        if start < time_max and end > time_min:
+                            blocks.append((max(start, time_min), min(end, time_max)))
+                merged = []
+                for start, end in sorted(blocks):
+                    if merged and start <= merged[-1][1]:
+                        merged[-1][1] = max(merged[-1][1], end)
+                    else:
+                        merged.append([start, end])
+                calendars[calendar_id] = {'busy': [
+                    {'start': _utc_rfc3339(start), 'end': _utc_rfc3339(end)} for start, end in merged]}
+            return {'kind': 'calendar#freeBusy', 'timeMin': body['timeMin'], 'timeMax': body['timeMax'],
+                    'calendars': calendars}
+        return FakeRequest(self.fake, 'calendar.freebusy.query', handler)
+
+class FakeGoogle:
+    """
+    In-process stand-in for the Sheets and Calendar APIs.
+
+    Holds spreadsheet grids and calendars in memory and serves them through
+    objects shaped like googleapiclient services, so the pipeline and the
+    benchmarks run without network access or credentials.
+
+    Args:
+        spreadsheets (dict): spreadsheet ID -> {sheet name: rows}.
+        calendars (dict): calendar ID -> list of event bodies.
+        latency (float): Seconds slept per HTTP round trip (a batch counts once).
+        error_rate (float): Probability that a call fails with `error_status`.
+        error_status (int): 429, or 403 for a rateLimitExceeded response.
+        max_page_size (int): Cap on events().list page size (the API allows 2500).
+        max_batch_size (int): Maximum sub-requests per batch (the API allows 1000).
+        seed (int): Seed for error injection.
+
+    Attributes:
+        sheets, calendar: The fake services, as returned by get_google_services.
+        calls (Counter): Calls per endpoint, e.g. 'calendar.events.insert'.
+    """
+
+    def __init__(self, spreadsheets=None, calendars=None, latency=0.0, error_rate=0.0, error_status=429,
+                 max_page_size=2500, max_batch_size=1000, seed=0):
+        self.spreadsheets = spreadsheets or {}
+        self.calendars = {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_page_size = max_page_size
+        self.max_batch_size = max_batch_size
+        self.calls = Counter()
+        self.lock = threading.RLock()
+        self.version = 0
+        self.min_sync_version = 0
+        self._random = random.Random(seed)
+        self._forced_errors = []
+        self.sheets = FakeSheetsService(self)
+        self.calendar = FakeCalendarService(self)
+        for calendar_id, events in (calendars or {}).items():
+            self.calendars.setdefault(calendar_id, {})
+            for event in events:
+                self.calendar.insert(calendar_id, event).handler()
+
+    @classmethod
+    def from_fixture(cls, path):
+        """
+        Builds a fake from a JSON file with 'spreadsheets', 'calendars' and
+        any constructor options as top-level keys.
+        """
+        with open(path, 'r') as f:
+            return cls(**json.load(f))
+
+    def fail_next(self, count=1, status=None):
+        """
+        Forces the next `count` calls to fail with `status` (default error_status).
+        """
+        self._forced_errors.extend([status or self.error_status] * count)
+
+    def invalidate_sync_tokens(self):
+        """
+        Makes every issued sync token expire (subsequent syncs get 410).
+        """
+        self.min_sync_version = self.version + 1
+
+    def events(self, calendar_id, include_cancelled=False):
+        """
+        Current events on a calendar (for assertions).
+        """
+        return [self.calendar._public(e) for e in self.calendar._calendar(calendar_id).values()
+                if include_cancelled or e.get('status') != 'cancelled']
+
+    def _maybe_fail(self, endpoint):
+        with self.lock:
+            status = self._forced_errors.pop(0) if self._forced_errors else None
+            if status is None and self.error_rate and self._random.random() < self.error_rate:
+                status = self.error_status
+        if status == 403:
+            raise http_error(403, 'rateLimitExceeded', 'Rate Limit Exceeded')
+        if status == 429:
+            raise http_error(429, 'rateLimitExceeded', 'Too Many Requests')
+        if status:
+            raise http_error(status, 'backendError', 'Backend Error')
+
+    def _before_call(self, endpoint):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.calls[endpoint] += 1
+        if endpoint != 'batch':
+            self._maybe_fail(endpoint)
+
+def synthetic_program(n_events, spreadsheet_id='fake-spreadsheet', signup_sheet='Signup',
+                      contact_sheet='Teacher Contact', slots_per_day=10, teachers=50,
+                      start_date=datetime.date(2026, 1, 1)):
+    """
+    Generates a signup grid and contact sheet holding `n_events` signups.
+
+    The layout mirrors the real sheet: two instruction rows, the time-slot
+    header on row 3, dates ("Weekday, YYYY-MM-DD") in column B.
+
+    Returns:
+        dict: spreadsheets mapping suitable for FakeGoogle(spreadsheets=...).
+    """
+    contacts = [['First Name', 'Last Name', 'Pronouns', 'Email Address', 'Bio']]
+    names = []
+    for i in range(teachers):
+        first, last = f"Teacher{i}", f"Lastname{i}"
+        contacts.append([first, last, 'they/them', f"teacher{i}@example.com", f"Bio for teacher {i}."])
+        names.append(f"{first} {last}")
+
+    header = ['Instructions', 'Date']
+    for slot in range(slots_per_day):
+        minutes = 6 * 60 + slot * 15
+        hour, minute = divmod(minutes, 60)
+        header.append(f"{hour % 12 or 12}:{minute:02d} {'am' if hour < 12 else 'pm'} EST | "
+                      f"{(hour - 1) % 12 or 12}:{minute:02d} {'am' if hour - 1 < 12 else 'pm'} CST")
+
+    signup = [['Sign up for a slot below'], [''], header]
+    days = -(-n_events // slots_per_day)
+    remaining = n_events
+    for day in range(days):
+        date = start_date + datetime.timedelta(days=day)
+        row = ['', f"{date.strftime('%A')}, {date.isoformat()}"]
+        for slot in range(slots_per_day):
+            row.append(names[(day * slots_per_day + slot) % teachers] if remaining > 0 else '')
+            remaining -= 1
+        signup.append(row)
+
+    return {spreadsheet_id: {signup_sheet: signup, contact_sheet: contacts}}
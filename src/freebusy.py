@@ -0,0 +1,214 @@
+import bisect
+import datetime
+from collections import defaultdict
+from zoneinfo import ZoneInfo
+import backoff
+from googleapiclient.errors import HttpError
+from utils_calendar_general import BACKOFF_MAX_TRIES, is_retryable_error
+from overlap_detection import begin_utc, find_overlaps
+from time_headers import EVENT_TIMEZONE
+from records import CreatedEvent
+from recurrence import expand_recurring
+from instrumentation import span, on_backoff
+
+# freebusy.query accepts at most this many calendars per request.
+FREEBUSY_MAX_CALENDARS = 50
+
+# Longer windows are split into several queries of at most this many days.
+FREEBUSY_MAX_DAYS = 60
+
+# Preview column listing each event's conflicts.
+CONFLICTS_COLUMN = 'Conflicts'
+
+def _rfc3339(dt):
+    return f"{dt.astimezone(datetime.timezone.utc):%Y-%m-%dT%H:%M:%SZ}"
+
+def _parse(value):
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+class BusyIndex:
+    """
+    Busy blocks per calendar, merged and sorted once so each lookup is a
+    binary search plus the blocks it returns.
+    """
+
+    def __init__(self):
+        self._blocks = defaultdict(list)
+        self._sorted = {}
+
+    def add(self, calendar_id, blocks):
+        """
+        Adds (start, end) UTC blocks for a calendar.
+        """
+        self._blocks[calendar_id].extend(blocks)
+        self._sorted.pop(calendar_id, None)
+
+    def _index(self, calendar_id):
+        if calendar_id not in self._sorted:
+            merged = []
+            for start, end in sorted(self._blocks.get(calendar_id, ())):
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            # Merged blocks do not overlap, so their ends are sorted too.
+            self._sorted[calendar_id] = ([start for start, _ in merged], [end for _, end in merged])
+        return self._sorted[calendar_id]
+
+    def conflicts(self, calendar_id, start, end):
+        """
+        The busy blocks of a calendar that intersect [start, end).
+
+        Returns:
+            list: (start, end) pairs in order.
+        """
+        starts, ends = self._index(calendar_id)
+        found = []
+        i = bisect.bisect_right(ends, start)
+        while i < len(starts) and starts[i] < end:
+            found.append((starts[i], ends[i]))
+            i += 1
+        return found
+
+def query_windows(time_min, time_max, max_days=FREEBUSY_MAX_DAYS):
+    """
+    Splits [time_min, time_max) into windows of at most `max_days`.
+    """
+    windows = []
+    while time_min < time_max:
+        window_end = min(time_min + datetime.timedelta(days=max_days), time_max)
+        windows.append((time_min, window_end))
+        time_min = window_end
+    return windows
+
+@backoff.on_exception(backoff.expo, HttpError, max_tries=BACKOFF_MAX_TRIES,
+                      giveup=lambda e: not is_retryable_error(e), on_backoff=on_backoff)
+def _query(service, body):
+    return service.freebusy().query(body=body).execute()
+
+def query_busy(service, calendar_ids, time_min, time_max):
+    """
+    Fetches busy blocks with the fewest freebusy.query calls: one per
+    FREEBUSY_MAX_CALENDARS calendars per FREEBUSY_MAX_DAYS window.
+
+    Returns:
+        tuple: (BusyIndex, {calendar_id: error reason} for calendars the
+        credentials cannot see, number of queries made).
+    """
+    index = BusyIndex()
+    errors = {}
+    calendar_ids = sorted(set(calendar_ids))
+    queries = 0
+    for window_min, window_max in query_windows(time_min, time_max):
+        for i in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+            body = {'timeMin': _rfc3339(window_min), 'timeMax': _rfc3339(window_max), 'timeZone': 'UTC',
+                    'items': [{'id': calendar_id} for calendar_id in calendar_ids[i:i + FREEBUSY_MAX_CALENDARS]]}
+            response = _query(service, body)
+            queries += 1
+            for calendar_id, result in response.get('calendars', {}).items():
+                if result.get('errors'):
+                    errors[calendar_id] = result['errors'][0].get('reason', 'unknown')
+                    continue
+                index.add(calendar_id, [(_parse(block['start']), _parse(block['end']))
+                                        for block in result.get('busy', [])])
+    return index, errors, queries
+
+def event_occurrences(event_body, tz=EVENT_TIMEZONE):
+    """
+    The UTC (start, end) of every occurrence of an event body; recurring
+    bodies (see recurrence) are expanded.
+    """
+    start, end = event_body.get('start') or {}, event_body.get('end') or {}
+    first = begin_utc(start.get('dateTime'), start.get('timeZone') or tz)
+    last = begin_utc(end.get('dateTime'), end.get('timeZone') or tz)
+    if first is None or last is None:
+        return []
+    if not event_body.get('recurrence'):
+        return [(first, last)]
+    begins = (begin_utc(record.begin, tz) for record in expand_recurring(event_body))
+    return [(begin, begin + (last - first)) for begin in begins if begin is not None]
+
+def event_calendars(event_body, calendar_id):
+    """
+    The calendars whose busy time an event must avoid: the target calendar and each attendee's.
+    """
+    attendees = event_body.get('attendees', [])
+    return [calendar_id] + [attendee['email'] for attendee in attendees if attendee.get('email')]
+
+@span('freebusy')
+def find_conflicts(service, events, calendar_id, existing=None, tz=EVENT_TIMEZONE):
+    """
+    Checks planned events against the busy time of the target calendar and
+    of every attendee, with one batch of freebusy queries over the whole
+    program window.
+
+    Events already created (matched against `existing` CreatedEvent records
+    on summary and start) are not checked: they would only collide with
+    themselves.
+
+    Returns:
+        tuple: (conflicts, errors). `conflicts` holds, for each event in
+        order, labels like "ann@example.com busy 2026-01-05 07:00-08:00";
+        `errors` maps unreadable calendars to the API's reason.
+    """
+    skip = [False] * len(events)
+    if existing:
+        matches = find_overlaps([CreatedEvent.from_api(ev) for ev in events], existing)
+        skip = [match is not None for match in matches]
+    occurrences = [[] if skipped else event_occurrences(ev, tz) for ev, skipped in zip(events, skip)]
+    windows = [window for event_windows in occurrences for window in event_windows]
+    if not windows:
+        return [[] for _ in events], {}
+
+    calendars = [[] if skipped else event_calendars(ev, calendar_id) for ev, skipped in zip(events, skip)]
+    checked = {c for ids in calendars for c in ids}
+    # Whole UTC days, so busy blocks are not clipped at the first and last event.
+    first = min(start for start, _ in windows).replace(hour=0, minute=0, second=0, microsecond=0)
+    last = max(end for _, end in windows).replace(hour=0, minute=0, second=0, microsecond=0)
+    index, errors, queries = query_busy(service, checked, first, last + datetime.timedelta(days=1))
+    local = ZoneInfo(tz)
+    conflicts = []
+    for event_windows, calendar_ids in zip(occurrences, calendars):
+        labels = []
+        for busy_calendar in calendar_ids:
+            who = 'calendar' if busy_calendar == calendar_id else busy_calendar
+            for start, end in event_windows:
+                for busy_start, busy_end in index.conflicts(busy_calendar, start, end):
+                    busy_start, busy_end = busy_start.astimezone(local), busy_end.astimezone(local)
+                    label = f"{who} busy {busy_start:%Y-%m-%d %H:%M}-{busy_end:%H:%M}"
+                    if label not in labels:
+                        labels.append(label)
+        conflicts.append(labels)
+    print(f"Free/busy: checked {len(checked)} calendar(s) in {queries} "
+          f"quer{'y' if queries == 1 else 'ies'}; {sum(1 for labels in conflicts if labels)} event(s) conflict.")
+    return conflicts, errors
+
+def annotate_preview(preview_data, conflicts):
+    """
+    Adds the CONFLICTS_COLUMN to every preview row (empty when there is none).
+    """
+    for row, labels in zip(preview_data, conflicts):
+        row[CONFLICTS_COLUMN] = '; '.join(labels)
+    return preview_data
+
+def preflight(service, calendar_id, events, preview_data, existing=None):
+    """
+    The free/busy pre-check run before events are created: finds conflicts,
+    annotates the preview and reports calendars that could not be read.
+
+    A failed query (e.g. credentials without a free/busy scope) skips the
+    check rather than the sync.
+
+    Returns:
+        list: Conflict labels per event (all empty if the check was skipped).
+    """
+    try:
+        conflicts, errors = find_conflicts(service, events, calendar_id, existing)
+    except HttpError as e:
+        print(f"Free/busy check skipped: {e}")
+        return [[] for _ in events]
+    if errors:
+        print(f"Free/busy unavailable for {len(errors)} calendar(s) (not shared with this account): "
+              f"{', '.join(sorted(errors))}")
+    annotate_preview(preview_data, conflicts)
+    return conflicts
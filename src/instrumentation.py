@@ -0,0 +1,227 @@
+import os
+import json
+import math
+import time
+import datetime
+import threading
+import contextlib
+import functools
+from collections import Counter, defaultdict
+
+# Written at the end of every `scheduler` run.
+RUN_REPORT = 'logs/run_report.json'
+
+# Latency percentiles reported per API endpoint.
+PERCENTILES = (50, 90, 99)
+
+# Endpoint name for batch HTTP requests (their sub-requests are not counted one by one).
+BATCH_ENDPOINT = 'batch'
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list (None if empty).
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def _error_status(error):
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    return str(status) if status is not None else type(error).__name__
+
+class RunRecorder:
+    """
+    Collects timings and API usage for one run.
+
+    Spans time named phases (they may nest, e.g. header_parse inside render).
+    Every API request executed through an instrumented service is counted per
+    endpoint with its latency and error status. Retries and the seconds spent
+    sleeping in backoff are recorded per retrying function. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._started_perf = time.perf_counter()
+            self.phases = defaultdict(list)
+            self.latencies = defaultdict(list)
+            self.errors = defaultdict(Counter)
+            self.retries = Counter()
+            self.backoff_seconds = 0.0
+
+    @contextlib.contextmanager
+    def span(self, phase):
+        """
+        Times the enclosed block as one occurrence of `phase`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[phase].append(elapsed)
+
+    def api_call(self, endpoint, seconds, error=None):
+        """
+        Records one executed request and, if it failed, its HTTP status (or exception name).
+        """
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            if error is not None:
+                self.errors[endpoint][_error_status(error)] += 1
+
+    def retry(self, source, wait):
+        """
+        Records a retry by `source` after sleeping `wait` seconds.
+        """
+        with self._lock:
+            self.retries[source] += 1
+            self.backoff_seconds += wait
+
+    def on_backoff(self, details):
+        """
+        `on_backoff` handler for the backoff decorators.
+        """
+        self.retry(details['target'].__name__, details.get('wait') or 0.0)
+
+    def report(self):
+        """
+        Returns the run report as a JSON-serializable dict.
+        """
+        with self._lock:
+            phases = {name: {'count': len(times), 'seconds': round(sum(times), 6), 'max_seconds': round(max(times), 6)}
+                      for name, times in self.phases.items()}
+            api = {}
+            for endpoint, times in self.latencies.items():
+                times = sorted(times)
+                latency = {f"p{p}": round(percentile(times, p) * 1000, 3) for p in PERCENTILES}
+                latency['max'] = round(times[-1] * 1000, 3)
+                api[endpoint] = {'calls': len(times), 'errors': dict(self.errors[endpoint]), 'latency_ms': latency}
+            return {
+                'started_at': datetime.datetime.fromtimestamp(self.started, datetime.timezone.utc).isoformat(),
+                'wall_seconds': round(time.perf_counter() - self._started_perf, 6),
+                'phases': phases,
+                'api': api,
+                'api_calls': sum(entry['calls'] for entry in api.values()),
+                'retries': dict(self.retries),
+                'backoff_sleep_seconds': round(self.backoff_seconds, 6),
+            }
+
+    def write_report(self, path=RUN_REPORT, format='json'):
+        """
+        Writes the report as JSON or, with format='prometheus', in the Prometheus text format.
+        """
+        report = self.report()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            if format == 'prometheus':
+                f.write(prometheus_text(report))
+            else:
+                json.dump(report, f, indent=2)
+        return report
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text(report):
+    """
+    Renders a run report in the Prometheus text exposition format.
+    """
+    lines = ['# TYPE scheduler_run_seconds gauge', f"scheduler_run_seconds {report['wall_seconds']}",
+             '# TYPE scheduler_phase_seconds gauge']
+    lines += [f'scheduler_phase_seconds{{phase="{_label(name)}"}} {phase["seconds"]}'
+              for name, phase in report['phases'].items()]
+    lines.append('# TYPE scheduler_api_calls_total counter')
+    lines += [f'scheduler_api_calls_total{{endpoint="{_label(name)}"}} {api["calls"]}'
+              for name, api in report['api'].items()]
+    lines.append('# TYPE scheduler_api_errors_total counter')
+    lines += [f'scheduler_api_errors_total{{endpoint="{_label(name)}",status="{_label(status)}"}} {count}'
+              for name, api in report['api'].items() for status, count in api['errors'].items()]
+    lines.append('# TYPE scheduler_api_latency_seconds summary')
+    lines += [f'scheduler_api_latency_seconds{{endpoint="{_label(name)}",quantile="{p / 100}"}} '
+              f'{api["latency_ms"][f"p{p}"] / 1000}'
+              for name, api in report['api'].items() for p in PERCENTILES]
+    lines.append('# TYPE scheduler_retries_total counter')
+    lines += [f'scheduler_retries_total{{source="{_label(source)}"}} {count}'
+              for source, count in report['retries'].items()]
+    lines += ['# TYPE scheduler_backoff_sleep_seconds_total counter',
+              f"scheduler_backoff_sleep_seconds_total {report['backoff_sleep_seconds']}"]
+    return '\n'.join(lines) + '\n'
+
+# The recorder every module reports to; `scheduler` writes its report at exit.
+RECORDER = RunRecorder()
+
+def span(phase):
+    return RECORDER.span(phase)
+
+def record_retry(source, wait):
+    RECORDER.retry(source, wait)
+
+def on_backoff(details):
+    RECORDER.on_backoff(details)
+
+def _unwrap(value):
+    return value._target if isinstance(value, InstrumentedService) else value
+
+class InstrumentedService:
+    """
+    Proxy over a Google API service (or the offline fake) that times every execute().
+
+    Resource and method calls are forwarded and their results wrapped, so
+    `service.events().insert(...).execute()` is recorded under the endpoint
+    "events.insert". Batch requests are recorded as "batch". Plain attributes
+    (credentials, `thread_safe`) pass through unchanged.
+    """
+
+    def __init__(self, target, endpoint='', recorder=None):
+        self._target = target
+        self._endpoint = endpoint
+        self._recorder = recorder or RECORDER
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        if name == 'new_batch_http_request':
+            endpoint = BATCH_ENDPOINT
+        elif name.endswith('_next'):
+            # list_next(...) builds the next page of the same list call.
+            endpoint = f"{self._endpoint}.{name[:-len('_next')]}"
+        else:
+            endpoint = f"{self._endpoint}.{name}" if self._endpoint else name
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            result = attr(*map(_unwrap, args), **{key: _unwrap(value) for key, value in kwargs.items()})
+            if result is None or isinstance(result, (dict, list, str, bytes, int, float)):
+                return result
+            return InstrumentedService(result, endpoint, self._recorder)
+        return call
+
+    def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        error = None
+        try:
+            return self._target.execute(*args, **kwargs)
+        except Exception as e:
+            # A 304 answers a conditional request (see response_cache); it is not a failure.
+            if getattr(getattr(e, 'resp', None), 'status', None) != 304:
+                error = e
+            raise
+        finally:
+            self._recorder.api_call(self._endpoint, time.perf_counter() - start, error)
+
+def instrument(service):
+    """
+    Wraps a service so its requests are recorded (a no-op if it already is).
+    """
+    if service is None or isinstance(service, InstrumentedService):
+        return service
+    return InstrumentedService(service)
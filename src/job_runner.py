@@ -0,0 +1,319 @@
+import os
+import sys
+import threading
+import traceback
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+from utils_calendar_general import build_service, get_credentials, fake_google_from_env, load_jsonc, iter_jsonc_array
+from instrumentation import instrument
+from event_store import open_event_store
+from event_importer import default_namespace, validate_event_body, prepare_import_body
+from sync_journal import SyncJournal
+from sync_scheduler import (
+    SIGNUP_SHEET,
+    CONTACT_SHEET,
+    TEMPLATE_FILE,
+    SCOPES,
+    TOKEN_PATH,
+    CREDS_PATH,
+    plan_sheet_events,
+    create_scheduled_events
+)
+
+JOBS_FILE = 'jobs.jsonc'
+
+# Jobs processed at the same time.
+DEFAULT_PARALLEL_JOBS = 4
+
+@dataclass(slots=True)
+class Job:
+    """
+    One program to sync: a source (signup spreadsheet or events file) and a calendar.
+
+    Attributes:
+        name (str): Unique job name, used for its log file.
+        calendar_id (str): Target calendar.
+        spreadsheet_id (str): Signup spreadsheet (sheet jobs).
+        signup_sheet (str): Name of the signup grid sheet.
+        contact_sheet (str): Name of the teacher contact sheet.
+        template_file (str): JSONC event template (sheet jobs).
+        events_file (str): JSONC list of event bodies (events-file jobs).
+        log_dir (str): Directory holding the job's CSV log, event store, journal and run log.
+    """
+    name: str
+    calendar_id: str
+    spreadsheet_id: str = None
+    signup_sheet: str = SIGNUP_SHEET
+    contact_sheet: str = CONTACT_SHEET
+    template_file: str = TEMPLATE_FILE
+    events_file: str = None
+    log_dir: str = None
+
+    def path(self, filename):
+        return os.path.join(self.log_dir or os.path.join('logs', self.name), filename)
+
+    @property
+    def created_events_csv(self):
+        return self.path('created_events.csv')
+
+    @property
+    def event_store_db(self):
+        return self.path('events.db')
+
+    @property
+    def sync_journal(self):
+        return self.path('sync_journal.jsonl')
+
+    @property
+    def log_file(self):
+        return self.path(f"{self.name}.log")
+
+@dataclass(slots=True)
+class JobResult:
+    """
+    Outcome of one job: events planned and created, and the error that stopped it, if any.
+    """
+    job: Job
+    events: list = None
+    preview: list = None
+    created: int = 0
+    error: str = None
+
+def load_jobs(path=JOBS_FILE):
+    """
+    Reads the job config: {"defaults": {...}, "jobs": [{...}, ...]}.
+
+    Each job needs a name, a calendar_id and either a spreadsheet_id or an
+    events_file; other keys fall back to "defaults", then to the Job defaults.
+
+    Raises:
+        ValueError: For unknown keys, missing sources or duplicate names.
+    """
+    config = load_jsonc(path)
+    defaults = config.get('defaults', {})
+    jobs = []
+    for i, entry in enumerate(config.get('jobs', [])):
+        fields = {**defaults, **entry}
+        label = fields.get('name', f"#{i + 1}")
+        unknown = set(fields) - set(Job.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Job {label}: unknown keys {sorted(unknown)}")
+        if 'name' not in fields or 'calendar_id' not in fields:
+            raise ValueError(f"Job {label}: 'name' and 'calendar_id' are required")
+        if bool(fields.get('spreadsheet_id')) == bool(fields.get('events_file')):
+            raise ValueError(f"Job {label}: set exactly one of 'spreadsheet_id' or 'events_file'")
+        jobs.append(Job(**fields))
+    names = [job.name for job in jobs]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate job names in {path}")
+    return jobs
+
+class ServicePool:
+    """
+    Sheets/Calendar services built from one shared credential.
+
+    OAuth runs (and the token refreshes) once; each worker thread then gets
+    its own pair of services over its own pooled HTTP connection, reused for
+    every job that thread runs (httplib2 connections are not thread-safe).
+    """
+
+    def __init__(self, credentials=None, fake=None):
+        self.credentials = credentials
+        self.fake = fake
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, token_path=TOKEN_PATH, creds_path=CREDS_PATH, scopes=SCOPES):
+        fake = fake_google_from_env()
+        if fake is not None:
+            return cls(fake=fake)
+        return cls(credentials=get_credentials(token_path, creds_path, scopes))
+
+    def _build(self, api, version):
+        import httplib2
+        import google_auth_httplib2
+
+        http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return build_service(api, version, http=http)
+
+    def services(self):
+        """
+        Returns this thread's (sheets_service, calendar_service).
+        """
+        if self.fake is not None:
+            return instrument(self.fake.sheets), instrument(self.fake.calendar)
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = (self._build('sheets', 'v4'), self._build('calendar', 'v3'))
+        return services
+
+class _ThreadRoutedStream:
+    """
+    A sys.stdout replacement that sends each thread's output to its own stream.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    @property
+    def current(self):
+        return getattr(self._local, 'stream', None) or self.default
+
+    def write(self, text):
+        return self.current.write(text)
+
+    def flush(self):
+        self.current.flush()
+
+    def route(self, stream):
+        self._local.stream = stream
+
+def _run_logged(stdout, job, fn, result=None):
+    """
+    Runs fn(job) with this thread's output appended to the job's log file.
+    Any exception is recorded on `result` (or a new JobResult) instead of
+    escaping to other jobs.
+    """
+    os.makedirs(os.path.dirname(job.log_file), exist_ok=True)
+    with open(job.log_file, 'a') as log:
+        stdout.route(log)
+        try:
+            return fn(job)
+        except (Exception, SystemExit) as e:
+            traceback.print_exc(file=log)
+            result = result or JobResult(job)
+            result.error = f"{type(e).__name__}: {e}"
+            return result
+        finally:
+            stdout.route(None)
+
+def plan_file_events(events_file, limit=None):
+    """
+    Loads and validates event bodies from a JSONC file, stamped as event_importer does.
+
+    Returns:
+        tuple: (events_to_create, preview_data)
+    """
+    events_to_create, preview_data = [], []
+    namespace = default_namespace(events_file)
+    for index, ev in enumerate(iter_jsonc_array(events_file)):
+        errors = validate_event_body(ev)
+        if errors:
+            raise ValueError(f"Event #{index + 1} in {events_file}: {'; '.join(errors)}")
+        ev = prepare_import_body(ev, namespace, test_mode=limit is not None)
+        events_to_create.append(ev)
+        preview_data.append({"Event Name": ev.get('summary'),
+                             "Event Start Time": ev['start'].get('dateTime') or ev['start'].get('date')})
+    print(f"Loaded {len(events_to_create)} events from {events_file}")
+    return events_to_create, preview_data
+
+def plan_job(pool, job, test_teacher=None, limit=None):
+    """
+    Fetches and renders a job's events without touching the calendar.
+    """
+    print(f"\n=== Planning {job.name} ===")
+    if job.events_file:
+        events, preview = plan_file_events(job.events_file, limit)
+    else:
+        sheets_service, _ = pool.services()
+        planned = plan_sheet_events(sheets_service, job.spreadsheet_id, job.signup_sheet, job.contact_sheet,
+                                    job.template_file, test_teacher=test_teacher, limit=limit)
+        events, preview = planned or ([], [])
+    if limit:
+        events, preview = events[:limit], preview[:limit]
+    for row in preview:
+        print(f"  {row['Event Start Time']}  {row['Event Name']}")
+    print(f"{len(events)} event(s) planned.")
+    return JobResult(job, events=events, preview=preview)
+
+def create_job_events(pool, result, batch_size=None, workers=None):
+    """
+    Creates a planned job's events with its own event store and journal.
+    """
+    job = result.job
+    print(f"\n=== Creating {job.name} ===")
+    _, calendar_service = pool.services()
+    with open_event_store(job.event_store_db, job.created_events_csv) as store:
+        journal = None if batch_size or workers else SyncJournal(job.sync_journal)
+        records = create_scheduled_events(calendar_service, job.calendar_id, result.events, job.created_events_csv,
+                                          batch_size=batch_size, workers=workers, store=store, journal=journal)
+    result.created = len(records)
+    if len(records) < len(result.events):
+        result.error = f"{len(result.events) - len(records)} event(s) not created; see {job.log_file}"
+    return result
+
+def run_jobs(jobs, pool, dry_run=True, test_teacher=None, limit=None, parallel=DEFAULT_PARALLEL_JOBS,
+             batch_size=None, workers=None, assume_yes=False):
+    """
+    Plans every job in parallel, asks for one confirmation, then creates in parallel.
+
+    Each job's output goes to its own log file and a failing job does not
+    affect the others; the console only shows the per-job summary.
+
+    Returns:
+        list: JobResult per job, in config order.
+    """
+    stdout = _ThreadRoutedStream(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+            results = list(executor.map(
+                lambda job: _run_logged(stdout, job, lambda j: plan_job(pool, j, test_teacher, limit)), jobs))
+
+            print("\n--- Job Plan ---")
+            for result in results:
+                status = f"FAILED ({result.error})" if result.error else f"{len(result.events)} event(s)"
+                print(f"  {result.job.name:<20} {status}  [log: {result.job.log_file}]")
+
+            ready = [r for r in results if not r.error and r.events]
+            total = sum(len(r.events) for r in ready)
+            if dry_run or not ready:
+                print("\n[DRY RUN] No events were created." if dry_run else "\nNo events found to create.")
+                return results
+            if not assume_yes:
+                confirm = input(f"\nProceed with creating {total} events across {len(ready)} job(s)? (y/n): ")
+                if confirm.lower() != 'y':
+                    print("Operation cancelled by user.")
+                    return results
+
+            list(executor.map(
+                lambda r: _run_logged(stdout, r.job, lambda _: create_job_events(pool, r, batch_size, workers), r),
+                ready))
+    finally:
+        sys.stdout = stdout.default
+
+    attempted = {id(r) for r in ready}
+    print("\n--- Job Results ---")
+    for result in results:
+        if id(result) in attempted:
+            line = f"{result.created}/{len(result.events)} created" + (f", {result.error}" if result.error else "")
+        else:
+            line = result.error or "nothing to create"
+        print(f"  {result.job.name:<20} {line}")
+    return results
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Sync every program listed in the jobs config.')
+    parser.add_argument('--config', default=JOBS_FILE, help=f'Job config file (default {JOBS_FILE}).')
+    parser.add_argument('--jobs', nargs='+', metavar='NAME', help='Only run these jobs.')
+    parser.add_argument('--run', action='store_true', help='Actually create events in the calendars.')
+    parser.add_argument('--yes', action='store_true', help='Skip the confirmation prompt.')
+    parser.add_argument('--limit', type=int, help='Test mode: at most N events per job.')
+    parser.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL_JOBS,
+                        help=f'Jobs processed at the same time (default {DEFAULT_PARALLEL_JOBS}).')
+    parser.add_argument('--batch-size', type=int, help='Create events with batch requests of this size.')
+    parser.add_argument('--workers', type=int, help='Create events concurrently with this many workers.')
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.config)
+    if args.jobs:
+        unknown = set(args.jobs) - {job.name for job in jobs}
+        if unknown:
+            parser.error(f"unknown job(s): {', '.join(sorted(unknown))}")
+        jobs = [job for job in jobs if job.name in args.jobs]
+
+    run_jobs(jobs, ServicePool.from_config(), dry_run=not args.run, limit=args.limit, parallel=args.parallel,
+             batch_size=args.batch_size, workers=args.workers, assume_yes=args.yes)
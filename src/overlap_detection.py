@@ -1,42 +1,188 @@
 import os
-import pandas as pd
+import heapq
 import datetime
-from utils_calendar_general import fetch_calendar_events
+import functools
+from zoneinfo import ZoneInfo
+from googleapiclient.errors import HttpError
+from utils_calendar_general import iter_calendar_events, sync_token_path, load_sync_token, save_sync_token
+from records import CreatedEvent, read_created_events, write_created_events
+from instrumentation import span
+from time_headers import EVENT_TIMEZONE, DEFAULT_DURATION_MINS
 
-def update_created_events_csv(calendar_service, calendar_id, csv_path):
+def _created_event_rows(calendar_events):
+    return [CreatedEvent.from_api(event) for event in calendar_events]
+
+def update_created_events_csv(calendar_service, calendar_id, csv_path, incremental=False, store=None):
     """
     Fetches events from Google Calendar and updates the local CSV store.
+
+    With `incremental=True`, the calendar's nextSyncToken is saved next to the
+    CSV and later runs only download events changed or deleted since then,
+    merging them into the existing CSV. An expired token (HTTP 410) falls
+    back to a full sync.
+
+    When an EventStore is given, it becomes the source of truth: changes are
+    upserted (deletions tombstoned), the sync token is kept in the store, and
+    the CSV is re-exported from it for compatibility.
     """
+    token_key = f"sync_token:{calendar_id}"
+    token_path = sync_token_path(csv_path)
+    if not incremental:
+        sync_token = None
+    elif store is not None:
+        sync_token = store.get_state(token_key)
+    else:
+        sync_token = load_sync_token(token_path) if os.path.exists(csv_path) else None
+    sync_state = {} if incremental else None
+
+    def save_token(token):
+        if store is not None:
+            store.set_state(token_key, token)
+        else:
+            save_sync_token(token_path, token)
+
+    if sync_token:
+        print(f"Incrementally syncing {csv_path} with Google Calendar...")
+        try:
+            changes = list(iter_calendar_events(calendar_service, calendar_id,
+                                                sync_token=sync_token, sync_state=sync_state))
+        except HttpError as e:
+            if e.resp.status != 410:
+                raise
+            print("Sync token expired; running a full sync.")
+            save_token(None)
+            return update_created_events_csv(calendar_service, calendar_id, csv_path, incremental, store)
+
+        changed_ids = {event.get('id') for event in changes}
+        live = [event for event in changes if event.get('status') != 'cancelled' and event.get('start')]
+        if store is not None:
+            store.mark_deleted(changed_ids - {event.get('id') for event in live})
+            store.upsert_events(_created_event_rows(live))
+            total = store.export_csv(csv_path)
+        else:
+            records = [record for record in read_created_events(csv_path) if record.id not in changed_ids]
+            records.extend(_created_event_rows(live))
+            write_created_events(csv_path, records)
+            total = len(records)
+        save_token(sync_state.get('nextSyncToken'))
+        print(f"Applied {len(changes)} changes; {total} events in {csv_path}.")
+        return
+
     print(f"Syncing {csv_path} with Google Calendar...")
-    calendar_events = fetch_calendar_events(calendar_service, calendar_id)
-    
-    records = []
-    for event in calendar_events:
-        start = event['start'].get('dateTime') or event['start'].get('date')
-        records.append({
-            'Summary': event.get('summary'),
-            'ID': event.get('id'),
-            'Begin': start
-        })
-    
-    df_sync = pd.DataFrame(records)
-    df_sync.to_csv(csv_path, index=False)
+    calendar_events = iter_calendar_events(calendar_service, calendar_id, sync_state=sync_state)
+
+    records = _created_event_rows(event for event in calendar_events if event.get('status') != 'cancelled')
+    if store is not None:
+        store.replace_all(records)
+        store.export_csv(csv_path)
+    else:
+        write_created_events(csv_path, records)
+    if incremental:
+        save_token(sync_state.get('nextSyncToken'))
     print(f"Successfully synced {len(records)} events to {csv_path}.")
 
-def check_overlaps(df_pending, df_created):
+@functools.lru_cache(maxsize=65536)
+def begin_utc(begin, tz=EVENT_TIMEZONE):
+    """
+    Converts an ISO Begin string to a timezone-aware UTC datetime.
+
+    Values with an explicit offset ("2026-01-01T07:00:00-05:00") keep it; naive
+    values ("2026-01-01T07:00:00") and all-day dates are localized to `tz` first.
+    Signups share a handful of start times, so results are cached.
+
+    Returns:
+        datetime.datetime: The UTC instant, or None for empty or unparsable input.
+    """
+    if not begin or not isinstance(begin, str):
+        return None
+    try:
+        dt = datetime.datetime.fromisoformat(begin)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo(tz))
+    return dt.astimezone(datetime.timezone.utc)
+
+@span('overlap_check')
+def find_overlaps(pending, created, tz=EVENT_TIMEZONE):
+    """
+    Matches pending events against created events on (summary, start instant).
+
+    Both sides are normalized to UTC so "2026-01-01T07:00:00" (pending, local)
+    matches "2026-01-01T07:00:00-05:00" (calendar). Matching is a single
+    hash join on the (summary, start) key rather than a scan per pending event.
+
+    Args:
+        pending (list): Records with `summary` and `begin` (e.g. PendingEvent).
+        created (list): Records with `summary`, `id` and `begin` (e.g. CreatedEvent).
+
+    Returns:
+        list: For each pending event, in order, the calendar event ID it
+        matches, or None.
+    """
+    index = {}
+    for record in created:
+        start = begin_utc(record.begin, tz)
+        if start is not None:
+            index.setdefault((record.summary, start), record.id)
+    return [index.get((record.summary, begin_utc(record.begin, tz))) for record in pending]
+
+def check_overlaps(pending, created):
     """
     Compares pending events with created events.
-    Returns a boolean series for df_pending.
+    Returns a list of booleans aligned with `pending`.
+    """
+    return [overlap_id is not None for overlap_id in find_overlaps(pending, created)]
+
+def event_interval(record, tz=EVENT_TIMEZONE):
     """
-    if df_created.empty:
-        return pd.Series([False] * len(df_pending))
+    Computes the [start, end) UTC interval of a record from its begin and duration (minutes).
 
-    def is_match(row):
-        # Summary match AND Start string match (start of string to avoid TZ issues if simple)
-        # Note: df_pending['Begin'] is like "2026-01-01T07:00:00"
-        # df_created['Begin'] is like "2026-01-01T07:00:00-05:00"
-        mask = (df_created['Summary'] == row['Summary']) & \
-               (df_created['Begin'].str.startswith(row['Begin']))
-        return mask.any()
+    Returns:
+        tuple: (start, end), or None when the start cannot be parsed.
+    """
+    start = begin_utc(record.begin, tz)
+    if start is None:
+        return None
+    try:
+        minutes = float(getattr(record, 'duration', None))
+    except (TypeError, ValueError):
+        minutes = DEFAULT_DURATION_MINS
+    return start, start + datetime.timedelta(minutes=minutes)
+
+def find_interval_conflicts(events, by=None, tz=EVENT_TIMEZONE):
+    """
+    Finds events whose [start, end) windows intersect.
+
+    Uses a sorted sweep per group: events are visited in start order while a
+    heap of active end times is kept, so each conflict is found without
+    comparing every pair.
+
+    Args:
+        events (list): Records with `begin` and (optionally) `duration`.
+        by (str): Attribute to group by, e.g. 'teacher' for teacher double-bookings.
+            None checks the whole calendar, i.e. events sharing a time slot.
+        tz (str): Timezone for naive begin values.
+
+    Returns:
+        list: One tuple per conflicting pair: (index, index of the event it
+        conflicts with) into `events`, plus the `by` value when grouped.
+    """
+    rows = []
+    for position, record in enumerate(events):
+        interval = event_interval(record, tz)
+        if interval is not None:
+            rows.append((getattr(record, by) if by else '', interval[0], position, interval[1]))
+    rows.sort(key=lambda row: (row[0], row[1]))
 
-    return df_pending.apply(is_match, axis=1)
+    pairs = []
+    active, current = [], None  # heap of (end, position) for the current group
+    for group, start, position, end in rows:
+        if group != current:
+            active, current = [], group
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, other in active:
+            pairs.append((other, position, group) if by else (other, position))
+        heapq.heappush(active, (end, position))
+    return pairs
@@ -0,0 +1,232 @@
+import datetime
+from googleapiclient.errors import HttpError
+from google_sheets_data import fetch_google_sheets_data
+from overlap_detection import find_overlaps
+from utils_calendar_general import EVENT_FIELDS, iter_calendar_events, insert_event_idempotent
+from event_store import open_event_store
+from event_template import load_template
+from records import CreatedEvent
+from sync_journal import PROGRAM_PROPERTY
+from sync_scheduler import (
+    SPREADSHEET_ID,
+    SIGNUP_SHEET,
+    CONTACT_SHEET,
+    CALENDAR_ID,
+    TEMPLATE_FILE,
+    CREATED_EVENTS_CSV,
+    EVENT_STORE_DB,
+    get_services,
+    prepare_event_body,
+    created_event_record
+)
+
+# Listing mask for reconciliation: the sync key and content hash live in
+# extendedProperties; recurringEventId marks occurrences of a recurring event.
+RECONCILE_FIELDS = EVENT_FIELDS + ',extendedProperties,recurringEventId'
+
+INSERT = 'insert'
+PATCH = 'patch'
+DELETE = 'delete'
+UNCHANGED = 'unchanged'
+PAST_TENSE = {INSERT: 'Inserted', PATCH: 'Patched', DELETE: 'Deleted'}
+
+def _private(event):
+    return event.get('extendedProperties', {}).get('private', {})
+
+def desired_events(sheets_service, template_file=TEMPLATE_FILE):
+    """
+    Renders the desired calendar state from the signup grid.
+
+    Returns:
+        dict: sync key -> event body (with `id` and contentHash stamped).
+    """
+    pending_events, _ = fetch_google_sheets_data(sheets_service, SPREADSHEET_ID, SIGNUP_SHEET, CONTACT_SHEET,
+                                                 template_file)
+    template = load_template(template_file)
+    desired = {}
+    for pending in pending_events:
+        body = prepare_event_body(pending, template, program=SPREADSHEET_ID)
+        desired[body['id']] = body
+    return desired
+
+def diff_events(desired, actual, program=None):
+    """
+    Three-way diff of desired bodies against calendar events.
+
+    The third side is the content hash stamped on each managed event when it
+    was last written: an event whose stamped hash equals the desired hash is
+    unchanged and costs no API call. Events created before sync keys existed
+    are matched on (summary, start) via find_overlaps and adopted with a patch.
+    Only managed events (carrying a syncKey) are ever deleted, and with
+    `program` only those tagged with it (see sync_journal.stamp_tags): events
+    imported from a file or synced for another program share the calendar
+    but are not this sheet's to remove.
+
+    Occurrences of a recurring event created with --recurring share their
+    series' sync key, so they are matched on (summary, start) instead: an
+    occurrence covering a desired signup leaves it unchanged, and one covering
+    none is deleted (which cancels just that occurrence).
+
+    Args:
+        desired (dict): sync key -> rendered event body.
+        actual (list): Calendar events (with extendedProperties).
+        program (str): The program tag whose events this diff may delete.
+
+    Returns:
+        list: (action, event_id, body) tuples; body is None for deletes and
+        unchanged events.
+    """
+    managed = {}
+    legacy = []
+    occurrences = []
+    for event in actual:
+        if event.get('status') == 'cancelled':
+            continue
+        key = _private(event).get('syncKey')
+        if key and event.get('recurringEventId'):
+            occurrences.append(event)
+        elif key:
+            managed[key] = event
+        else:
+            legacy.append(event)
+
+    operations = []
+    unmatched = {}
+    for key, body in desired.items():
+        event = managed.get(key)
+        if event is None:
+            unmatched[key] = body
+        elif _private(event).get('contentHash') == _private(body)['contentHash']:
+            operations.append((UNCHANGED, event['id'], None))
+        else:
+            operations.append((PATCH, event['id'], body))
+
+    covered = set()
+    if unmatched and occurrences:
+        matches = find_overlaps([CreatedEvent.from_api(body) for body in unmatched.values()],
+                                [CreatedEvent.from_api(event) for event in occurrences])
+        for key, event_id in zip(list(unmatched), matches):
+            if event_id is not None:
+                operations.append((UNCHANGED, event_id, None))
+                covered.add(event_id)
+                del unmatched[key]
+
+    adopted = {}
+    if unmatched and legacy:
+        matches = find_overlaps([CreatedEvent.from_api(body) for body in unmatched.values()],
+                                [CreatedEvent.from_api(event) for event in legacy])
+        adopted = {key: event_id for key, event_id in zip(unmatched, matches) if event_id is not None}
+
+    for key, body in unmatched.items():
+        if key in adopted:
+            # A legacy event keeps its own ID; the patch stamps the sync key on it.
+            operations.append((PATCH, adopted[key], {k: v for k, v in body.items() if k != 'id'}))
+        else:
+            operations.append((INSERT, key, body))
+
+    def owned(event):
+        return program is None or _private(event).get(PROGRAM_PROPERTY) == program
+
+    for key, event in managed.items():
+        if key not in desired and owned(event):
+            operations.append((DELETE, event['id'], None))
+    for event in occurrences:
+        if event['id'] not in covered and owned(event):
+            operations.append((DELETE, event['id'], None))
+    return operations
+
+def apply_operations(calendar_service, calendar_id, operations, store=None):
+    """
+    Issues the insert/patch/delete calls for a diff, continuing past failures.
+
+    Returns:
+        dict: Count of successful operations per action, plus 'failed'.
+    """
+    counts = {INSERT: 0, PATCH: 0, DELETE: 0, 'failed': 0}
+    for action, event_id, body in operations:
+        if action == UNCHANGED:
+            continue
+        try:
+            if action == INSERT:
+                result = insert_event_idempotent(calendar_service, calendar_id, body)
+            elif action == PATCH:
+                result = calendar_service.events().patch(calendarId=calendar_id, eventId=event_id,
+                                                         body=body).execute()
+            else:
+                try:
+                    calendar_service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+                except HttpError as e:
+                    if e.resp.status not in (404, 410):
+                        raise
+                result = None
+        except HttpError as e:
+            print(f"Failed to {action} {event_id}: {e}")
+            counts['failed'] += 1
+            continue
+
+        counts[action] += 1
+        print(f"{PAST_TENSE[action]} event: {event_id}")
+        if store is not None:
+            if result is not None:
+                store.upsert_events([created_event_record(result)])
+            else:
+                store.mark_deleted([event_id])
+    return counts
+
+def reconcile(sheets_service, calendar_service, calendar_id=CALENDAR_ID, dry_run=True, store=None):
+    """
+    Makes the calendar match the signup sheet with the fewest API calls.
+
+    Fetches the desired state (sheet + template) and the actual state
+    (calendar listing over the program's date range), diffs them and, unless
+    `dry_run`, applies the inserts, patches and deletes after confirmation.
+
+    Returns:
+        list: The computed operations.
+    """
+    desired = desired_events(sheets_service)
+    if not desired:
+        print("No events found in the signup sheet.")
+        return []
+
+    dates = sorted(body['start']['dateTime'][:10] for body in desired.values())
+    time_min = f"{(datetime.date.fromisoformat(dates[0]) - datetime.timedelta(days=1)).isoformat()}T00:00:00Z"
+    time_max = f"{(datetime.date.fromisoformat(dates[-1]) + datetime.timedelta(days=2)).isoformat()}T00:00:00Z"
+    actual = list(iter_calendar_events(calendar_service, calendar_id, time_min, time_max, fields=RECONCILE_FIELDS))
+
+    operations = diff_events(desired, actual, program=SPREADSHEET_ID)
+    summary = {action: sum(1 for op in operations if op[0] == action)
+               for action in (INSERT, PATCH, DELETE, UNCHANGED)}
+    print(f"\nReconcile plan: {summary[INSERT]} insert, {summary[PATCH]} patch, "
+          f"{summary[DELETE]} delete, {summary[UNCHANGED]} unchanged.")
+    for action, event_id, body in operations:
+        if action != UNCHANGED:
+            label = body.get('summary') if body else event_id
+            print(f"  {action:<7} {label}")
+
+    if len(operations) == summary[UNCHANGED]:
+        print("Calendar is already up to date.")
+        return operations
+    if dry_run:
+        print("\n[DRY RUN] No changes were made.")
+        return operations
+
+    confirm = input(f"\nApply {len(operations) - summary[UNCHANGED]} changes to the calendar? (y/n): ")
+    if confirm.lower() != 'y':
+        print("Operation cancelled by user.")
+        return operations
+
+    counts = apply_operations(calendar_service, calendar_id, operations, store)
+    print(f"\nApplied: {counts[INSERT]} inserted, {counts[PATCH]} patched, {counts[DELETE]} deleted, "
+          f"{counts['failed']} failed.")
+    return operations
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Reconcile the Google Calendar with the signup sheet.')
+    parser.add_argument('--run', action='store_true', help='Apply the changes (default is a dry run).')
+    args = parser.parse_args()
+
+    sheets_service, calendar_service = get_services()
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        reconcile(sheets_service, calendar_service, dry_run=not args.run, store=store)
@@ -0,0 +1,162 @@
+import os
+import csv
+from dataclasses import dataclass
+
+# Columns of created_events.csv, in file order.
+CREATED_CSV_COLUMNS = ['Summary', 'ID', 'Begin']
+
+@dataclass(slots=True)
+class Contact:
+    """
+    One "Teacher Contact" row.
+
+    Every contact from a sheet shares the same `columns` tuple, so a row
+    costs one tuple of values rather than a dict of its own.
+
+    Attributes:
+        name (str): "First Last", the key the signup grid uses.
+        columns (tuple): Sheet headers, shared by all contacts of the sheet.
+        values (tuple): Cell values aligned with `columns` (short rows padded with '').
+    """
+    name: str
+    columns: tuple
+    values: tuple
+
+    def get(self, column, default=''):
+        try:
+            return self.values[self.columns.index(column)]
+        except ValueError:
+            return default
+
+    def as_vars(self):
+        """
+        Returns {column header: value}, the template variables for this contact.
+        """
+        return dict(zip(self.columns, self.values))
+
+@dataclass(frozen=True, slots=True)
+class SlotHeader:
+    """
+    A time-slot column of the signup grid.
+
+    Attributes:
+        column (int): 0-based column index.
+        start (str): Start time as "HH:MM" (Eastern).
+        end (str): End time as "HH:MM".
+        duration (int): Length in minutes.
+        header (str): The header text, re-parsed per row date when its
+            times are converted from another zone (see signup_grid.slot_on).
+    """
+    column: int
+    start: str
+    end: str
+    duration: int
+    header: str = ''
+
+@dataclass(slots=True)
+class PendingEvent:
+    """
+    A signup that should become a calendar event.
+
+    Attributes:
+        summary (str): Event summary, as the created event will carry it.
+        begin (str): Naive ISO start ("2026-01-01T07:00:00", Eastern).
+        teacher (str): Teacher name as written in the grid.
+        contact (Contact): The teacher's contact row.
+        date (str): "YYYY-MM-DD".
+        day (str): Weekday name from the grid.
+        start (str): Start time "HH:MM".
+        end (str): End time "HH:MM".
+        duration (int): Length in minutes.
+        key (str): Deterministic sync key (see sync_journal.event_key).
+        overlap_id (str): ID of a matching calendar event, once overlaps are checked.
+    """
+    summary: str
+    begin: str
+    teacher: str
+    contact: Contact
+    date: str
+    day: str
+    start: str
+    end: str
+    duration: int
+    key: str = None
+    overlap_id: str = None
+
+    def as_row(self):
+        """
+        Returns the event as a flat dict for display.
+        """
+        return {'Summary': self.summary, 'Begin': self.begin, 'Teacher': self.teacher, 'Date': self.date,
+                'Day': self.day, 'Start': self.start, 'End': self.end, 'Duration': self.duration,
+                'Key': self.key, 'Overlap ID': self.overlap_id}
+
+@dataclass(slots=True)
+class CreatedEvent:
+    """
+    An event on the calendar, as logged in created_events.csv and the event store.
+
+    Attributes:
+        summary (str): Event summary.
+        id (str): Calendar event ID.
+        begin (str): ISO start dateTime (with offset) or all-day date.
+    """
+    summary: str
+    id: str
+    begin: str
+
+    @classmethod
+    def from_api(cls, event):
+        """
+        Builds the record for an event resource returned by the Calendar API.
+        """
+        start = event.get('start', {})
+        return cls(event.get('summary'), event.get('id'), start.get('dateTime') or start.get('date'))
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Builds the record for a created_events.csv row ('ID' or 'id' column).
+        Empty cells become None.
+        """
+        return cls(row.get('Summary', row.get('summary')) or None, row.get('ID', row.get('id')) or None,
+                   row.get('Begin') or None)
+
+    def as_row(self):
+        return {'Summary': self.summary, 'ID': self.id, 'Begin': self.begin}
+
+    def as_tuple(self):
+        return self.summary, self.id, self.begin
+
+def read_created_events(csv_path):
+    """
+    Reads a created_events.csv file.
+
+    Returns:
+        list: CreatedEvent per row; empty if the file is missing or has no ID column.
+    """
+    if not os.path.exists(csv_path):
+        return []
+    with open(csv_path, newline='') as f:
+        reader = csv.DictReader(f)
+        if not {'ID', 'id'} & set(reader.fieldnames or []):
+            return []
+        return [CreatedEvent.from_row(row) for row in reader]
+
+def write_created_events(csv_path, records):
+    """
+    Writes CreatedEvent records to a created_events.csv file, replacing it.
+    """
+    if os.path.dirname(csv_path):
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(CREATED_CSV_COLUMNS)
+        writer.writerows(record.as_tuple() for record in records)
+
+def records_frame(records):
+    """
+    Converts records to a pandas DataFrame for display or export (needs pandas).
+    """
+    import pandas as pd
+    return pd.DataFrame([record.as_row() for record in records])
@@ -0,0 +1,235 @@
+import re
+import copy
+import json
+import hashlib
+import datetime
+from zoneinfo import ZoneInfo
+from records import CreatedEvent
+from sync_journal import stamp_event_key, stamp_content_hash
+
+# Runs shorter than this stay individual events.
+MIN_OCCURRENCES = 3
+
+# A run is compacted only if at most this share of its occurrences needs an EXDATE.
+MAX_EXDATE_RATIO = 0.5
+
+# Signups further apart than this many days start a new run.
+MAX_GAP_DAYS = 7
+
+# Safety cap when expanding a recurrence rule.
+MAX_INSTANCES = 1000
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+# Google's instance IDs: the master ID, '_', and the UTC start (or the date, for all-day events).
+INSTANCE_ID_PATTERN = re.compile(r'^(.+)_\d{8}(T\d{6}Z)?$')
+
+def occurrence_shape(body):
+    """
+    Canonical form of an event body without its date, ID, sync key and hash.
+
+    Two signups with the same shape differ only in their date, so they can be
+    occurrences of one recurring event.
+    """
+    shape = {k: v for k, v in body.items() if k != 'id'}
+    for field in ('start', 'end'):
+        value = dict(shape.get(field) or {})
+        value['dateTime'] = (value.get('dateTime') or '')[10:]
+        shape[field] = value
+    private = dict(shape.get('extendedProperties', {}).get('private', {}))
+    for key in ('syncKey', 'contentHash'):
+        private.pop(key, None)
+    shape['extendedProperties'] = dict(shape.get('extendedProperties', {}), private=private)
+    return json.dumps(shape, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+def split_runs(dates, max_gap=MAX_GAP_DAYS):
+    """
+    Splits sorted dates wherever consecutive ones are more than `max_gap` days apart.
+    """
+    runs = []
+    for date in dates:
+        if runs and (date - runs[-1][-1]).days <= max_gap:
+            runs[-1].append(date)
+        else:
+            runs.append([date])
+    return runs
+
+def recurrence_rule(dates, min_occurrences=MIN_OCCURRENCES, max_exdate_ratio=MAX_EXDATE_RATIO):
+    """
+    Picks the rule covering a run of dates: daily if every weekday occurs,
+    otherwise weekly on the weekdays that do, with EXDATEs for the gaps.
+
+    Returns:
+        tuple: (RRULE line, excluded dates), or None if the run is too short or too sparse.
+    """
+    if len(dates) < min_occurrences:
+        return None
+    weekdays = sorted({date.weekday() for date in dates})
+    span = (dates[-1] - dates[0]).days + 1
+    expected = [dates[0] + datetime.timedelta(days=i) for i in range(span)
+                if (dates[0] + datetime.timedelta(days=i)).weekday() in weekdays]
+    present = set(dates)
+    excluded = [date for date in expected if date not in present]
+    if len(excluded) > len(dates) * max_exdate_ratio:
+        return None
+    if len(weekdays) == 7:
+        return f"RRULE:FREQ=DAILY;COUNT={len(expected)}", excluded
+    byday = ','.join(WEEKDAYS[day] for day in weekdays)
+    return f"RRULE:FREQ=WEEKLY;BYDAY={byday};COUNT={len(expected)}", excluded
+
+def exdate_line(excluded, start_time, tz):
+    """
+    EXDATE property for excluded dates at the series' local start time ("HH:MM:SS").
+    """
+    values = ','.join(f"{date:%Y%m%d}T{start_time.replace(':', '')}" for date in excluded)
+    return f"EXDATE;TZID={tz}:{values}"
+
+def master_body(bodies, rule, excluded):
+    """
+    The recurring event for a run: the first occurrence plus its recurrence lines.
+
+    Its ID (and sync key) hashes the member IDs, so re-planning the same run
+    gives the same master and a rerun's insert is idempotent.
+    """
+    master = copy.deepcopy(bodies[0])
+    start = master['start']
+    master['recurrence'] = [rule]
+    if excluded:
+        master['recurrence'].append(exdate_line(excluded, start['dateTime'][11:19], start['timeZone']))
+    member_ids = [body.get('id') for body in bodies]
+    if all(member_ids):
+        key = hashlib.sha1('|'.join(['recurring'] + member_ids).encode('utf-8')).hexdigest()
+        stamp_content_hash(stamp_event_key(master, key))
+    return master
+
+def compact_events(bodies, min_occurrences=MIN_OCCURRENCES):
+    """
+    Collapses repeating signups into recurring events.
+
+    Bodies with the same teacher, slot and template output (see
+    occurrence_shape) are grouped; each group is split into runs at gaps of
+    more than MAX_GAP_DAYS, and every run that recurrence_rule accepts becomes
+    one event with an RRULE (and EXDATEs). Everything else is kept as is.
+    Bodies need a local start dateTime and a timeZone to be compacted.
+
+    Returns:
+        tuple: (bodies, runs). `bodies` holds the recurring masters and the
+        remaining single events, ordered by first occurrence; `runs` is the
+        number of masters created.
+    """
+    groups = {}
+    singles = []
+    for index, body in enumerate(bodies):
+        start = body.get('start') or {}
+        date_time = start.get('dateTime') or ''
+        if 'recurrence' in body or not start.get('timeZone') or len(date_time) != 19:
+            singles.append((index, body))
+            continue
+        groups.setdefault(occurrence_shape(body), []).append(
+            (datetime.date.fromisoformat(date_time[:10]), index, body))
+
+    output = list(singles)
+    runs = 0
+    for members in groups.values():
+        members.sort(key=lambda member: member[0])
+        by_date = {}
+        for date, index, body in members:
+            if date in by_date:
+                output.append((index, body))  # the same slot twice on one day stays separate
+            else:
+                by_date[date] = (index, body)
+        for run in split_runs(sorted(by_date)):
+            rule = recurrence_rule(run, min_occurrences)
+            if rule is None:
+                output.extend(by_date[date] for date in run)
+                continue
+            indexed = [by_date[date] for date in run]
+            output.append((min(index for index, _ in indexed), master_body([body for _, body in indexed], *rule)))
+            runs += 1
+
+    output.sort(key=lambda item: item[0])
+    return [body for _, body in output], runs
+
+def _parse_rule(line):
+    return dict(part.split('=', 1) for part in line.split(':', 1)[1].split(';') if '=' in part)
+
+def _parse_exdates(line):
+    return {datetime.date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+            for value in line.split(':', 1)[1].split(',') if len(value) >= 8}
+
+def occurrence_dates(first, recurrence):
+    """
+    Dates of a series starting on `first`, for the DAILY/WEEKLY rules compact_events writes.
+
+    Returns:
+        list: Dates in order, or None if a rule uses features this does not expand.
+    """
+    rules = [_parse_rule(line) for line in recurrence if line.startswith('RRULE')]
+    excluded = set().union(*(_parse_exdates(line) for line in recurrence if line.startswith('EXDATE')))
+    if len(rules) != 1 or set(rules[0]) - {'FREQ', 'BYDAY', 'COUNT', 'UNTIL', 'WKST'}:
+        return None
+    rule = rules[0]
+    if rule.get('FREQ') not in ('DAILY', 'WEEKLY') or not (rule.get('COUNT') or rule.get('UNTIL')):
+        return None
+    if rule['FREQ'] == 'DAILY':
+        weekdays = set(range(7))
+    else:
+        weekdays = {WEEKDAYS.index(day) for day in rule.get('BYDAY', WEEKDAYS[first.weekday()]).split(',')}
+    count = int(rule['COUNT']) if 'COUNT' in rule else MAX_INSTANCES
+    until = datetime.date.fromisoformat(
+        f"{rule['UNTIL'][:4]}-{rule['UNTIL'][4:6]}-{rule['UNTIL'][6:8]}") if 'UNTIL' in rule else None
+
+    dates, day = [], first
+    while len(dates) < min(count, MAX_INSTANCES) and (until is None or day <= until):
+        if day.weekday() in weekdays:
+            dates.append(day)
+        day += datetime.timedelta(days=1)
+    return [date for date in dates if date not in excluded]
+
+def expand_recurring(event):
+    """
+    Records for every occurrence of a recurring event, with Google's instance IDs.
+
+    Non-recurring events (and rules occurrence_dates cannot expand) give the
+    event's own record.
+
+    Returns:
+        list: CreatedEvent per occurrence.
+    """
+    start = event.get('start') or {}
+    tz = start.get('timeZone')
+    if not event.get('recurrence') or not start.get('dateTime') or not tz:
+        return [CreatedEvent.from_api(event)]
+    local = datetime.datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
+    local = local.astimezone(ZoneInfo(tz)) if local.tzinfo else local.replace(tzinfo=ZoneInfo(tz))
+    dates = occurrence_dates(local.date(), event['recurrence'])
+    if dates is None:
+        return [CreatedEvent.from_api(event)]
+
+    records = []
+    for date in dates:
+        begin = datetime.datetime.combine(date, local.timetz().replace(tzinfo=None), tzinfo=ZoneInfo(tz))
+        utc = begin.astimezone(datetime.timezone.utc)
+        records.append(CreatedEvent(event.get('summary'), f"{event.get('id')}_{utc:%Y%m%dT%H%M%SZ}",
+                                    begin.isoformat()))
+    return records
+
+def master_event_id(event_id):
+    """
+    The recurring event an instance ID belongs to, or the ID itself.
+    """
+    match = INSTANCE_ID_PATTERN.match(event_id or '')
+    return match.group(1) if match else event_id
+
+def collapse_instances(event_ids):
+    """
+    Replaces instance IDs by their recurring event's ID, so deleting a whole
+    series is one call instead of one per occurrence.
+
+    Returns:
+        dict: ID to delete -> the recorded IDs it covers, in first-seen order.
+    """
+    targets = {}
+    for event_id in event_ids:
+        targets.setdefault(master_event_id(event_id), []).append(event_id)
+    return targets
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Disk cache of Sheets and Calendar read responses.
+RESPONSE_CACHE_DB = 'logs/response_cache.db'
+
+# Seconds a cached response is served without asking the API. Calendar
+# responses are then revalidated with their ETag; Sheets values carry no
+# ETag, so they are refetched.
+DEFAULT_TTLS = {'sheets': 120, 'calendar': 60}
+
+# Set (to any value) to bypass the default cache, as `scheduler --no-cache` does.
+NO_CACHE_ENV = 'SCHEDULER_NO_CACHE'
+
+# Least recently used responses are evicted beyond this many bytes.
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+
+# Methods whose responses are cached, and methods that change data (their
+# API's cached responses are dropped when one executes).
+READ_METHODS = {'get', 'list', 'batchGet'}
+WRITE_METHODS = {'insert', 'import_', 'patch', 'update', 'delete', 'move', 'quickAdd',
+                 'batchUpdate', 'append', 'clear', 'batchClear', 'new_batch_http_request'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    api TEXT,
+    etag TEXT,
+    stored_at REAL,
+    accessed_at REAL,
+    size INTEGER,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+class ResponseCache:
+    """
+    SQLite-backed store of API responses with per-API TTLs and LRU eviction.
+
+    Entries are keyed on the request (endpoint and parameters) and hold the
+    response body and its ETag, if any. Thread-safe, so services shared by
+    the concurrent executor can use one cache.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_DB, ttls=None, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, key):
+        """
+        Returns (body, etag, age_seconds) for a cached response, or None.
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT body, etag, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        return json.loads(row[0]), row[1], now - row[2]
+
+    def is_fresh(self, api, age):
+        return age < self.ttls.get(api, 0)
+
+    def put(self, key, api, body, etag=None):
+        """
+        Stores a response and evicts the least recently used ones past max_bytes.
+        """
+        data = json.dumps(body, separators=(',', ':'))
+        now = time.time()
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (key, api, etag, now, now, len(data), data))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in self.conn.execute(
+                        "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    total -= size
+            self.conn.commit()
+
+    def touch(self, key):
+        """
+        Marks a revalidated (304 Not Modified) response as fresh again.
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self.conn.commit()
+
+    def invalidate(self, api=None):
+        """
+        Drops the cached responses of one API ('sheets' or 'calendar'), or all of them.
+
+        Returns:
+            int: Number of responses dropped.
+        """
+        with self._lock:
+            if api is None:
+                cursor = self.conn.execute("DELETE FROM responses")
+            else:
+                cursor = self.conn.execute("DELETE FROM responses WHERE api = ?", (api,))
+            self.conn.commit()
+        return cursor.rowcount
+
+    def stats(self):
+        """
+        Returns (entries, bytes) currently cached.
+        """
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+def request_key(endpoint, params):
+    """
+    Cache key for a request: its endpoint and parameters in canonical JSON.
+    """
+    return json.dumps([endpoint, params], sort_keys=True, separators=(',', ':'), default=str)
+
+def _status(error):
+    return getattr(getattr(error, 'resp', None), 'status', None)
+
+def _unwrap(value):
+    return value._target if isinstance(value, CachedService) else value
+
+class CachedService:
+    """
+    Proxy over a Sheets or Calendar service that serves repeated reads from a ResponseCache.
+
+    get/list/batchGet requests are looked up by endpoint and parameters.
+    A response younger than the API's TTL is returned without a request.
+    An older one with an ETag is revalidated with If-None-Match, and a 304
+    reuses the cached body. Requests with a syncToken are never cached.
+    list_next pages are keyed on their page token. Executing any write
+    (insert, patch, delete, batch, ...) drops the API's cached responses,
+    so this process never reads back stale data after changing it.
+    """
+
+    def __init__(self, target, cache, api, endpoint='', params=None, writes=False):
+        self._target = target
+        self._cache = cache
+        self._api = api
+        self._endpoint = endpoint
+        self._params = params
+        self._writes = writes
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*map(_unwrap, args), **{key: _unwrap(value) for key, value in kwargs.items()})
+            if result is None or isinstance(result, (dict, list, str, bytes, int, float)):
+                return result
+            endpoint = f"{self._endpoint}.{name}" if self._endpoint else name
+            params, writes = None, name in WRITE_METHODS
+            if name in READ_METHODS and 'syncToken' not in kwargs:
+                params = kwargs
+            elif name.endswith('_next') and args and isinstance(args[0], CachedService) \
+                    and args[0]._params is not None:
+                # The next page of a cached listing: same parameters plus the page token.
+                endpoint = args[0]._endpoint
+                params = dict(args[0]._params, pageToken=(args[1] or {}).get('nextPageToken'))
+            return CachedService(result, self._cache, self._api, endpoint, params, writes)
+        return call
+
+    def execute(self, *args, **kwargs):
+        if self._writes:
+            try:
+                return self._target.execute(*args, **kwargs)
+            finally:
+                self._cache.invalidate(self._api)
+        if self._params is None:
+            return self._target.execute(*args, **kwargs)
+
+        key = request_key(f"{self._api}.{self._endpoint}", self._params)
+        cached = self._cache.get(key)
+        if cached is not None:
+            body, etag, age = cached
+            if self._cache.is_fresh(self._api, age):
+                return body
+            if etag and isinstance(getattr(self._target, 'headers', None), dict):
+                self._target.headers['If-None-Match'] = etag
+        try:
+            body = self._target.execute(*args, **kwargs)
+        except Exception as e:
+            if cached is not None and _status(e) == 304:
+                self._cache.touch(key)
+                return cached[0]
+            raise
+        if isinstance(body, dict):
+            self._cache.put(key, self._api, body, body.get('etag'))
+        return body
+
+def cached(service, cache, api):
+    """
+    Wraps a service so its reads go through `cache` (a no-op without a cache).
+    """
+    if service is None or cache is None or isinstance(service, CachedService):
+        return service
+    return CachedService(service, cache, api)
+
+def uncached(service):
+    """
+    The service underneath a CachedService, for reads that must reach the API.
+    """
+    return service._target if isinstance(service, CachedService) else service
+
+def cache_of(service):
+    """
+    The ResponseCache a service reads through, or None.
+    """
+    return service._cache if isinstance(service, CachedService) else None
@@ -0,0 +1,69 @@
+from records import Contact
+from instrumentation import span
+from response_cache import uncached
+
+def sheet_range(sheet_name):
+    """
+    A1 range covering a whole sheet.
+
+    A bare sheet name lets the API size the range from the sheet's grid
+    properties, so rows and columns added later are always included.
+    """
+    return "'{}'".format(sheet_name.replace("'", "''"))
+
+@span('sheet_fetch')
+def fetch_sheet_values(sheets_service, spreadsheet_id, sheet_names, use_cache=True):
+    """
+    Fetches several whole sheets in a single values().batchGet round trip.
+
+    Args:
+        sheets_service: Initialized Google Sheets API service.
+        spreadsheet_id (str): ID of the spreadsheet.
+        sheet_names (list): Names of the sheets to read.
+        use_cache (bool): False to bypass the service's response cache, if it has one.
+
+    Returns:
+        dict: sheet name -> list of rows (each a list of cell strings).
+    """
+    if not use_cache:
+        sheets_service = uncached(sheets_service)
+    result = sheets_service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=[sheet_range(name) for name in sheet_names],
+        majorDimension='ROWS',
+        fields='valueRanges(values)'
+    ).execute()
+    value_ranges = result.get('valueRanges', [])
+    return {name: value_range.get('values', []) for name, value_range in zip(sheet_names, value_ranges)}
+
+def build_teacher_map(contact_rows):
+    """
+    Maps each teacher's full name to their contact row.
+
+    Args:
+        contact_rows (list): "Teacher Contact" rows; the first row holds the headers.
+
+    Returns:
+        dict: "First Last" -> Contact. Short rows are padded with ''.
+    """
+    if not contact_rows:
+        return {}
+    headers = tuple(contact_rows[0])
+    first = headers.index('First Name') if 'First Name' in headers else None
+    last = headers.index('Last Name') if 'Last Name' in headers else None
+    teacher_map = {}
+    for row in contact_rows[1:]:
+        values = tuple(row[:len(headers)]) + ('',) * (len(headers) - len(row))
+        full_name = f"{values[first] if first is not None else ''} {values[last] if last is not None else ''}".strip()
+        teacher_map[full_name] = Contact(full_name, headers, values)
+    return teacher_map
+
+def fetch_signup_data(sheets_service, spreadsheet_id, signup_sheet, contact_sheet):
+    """
+    Loads the contact and signup sheets in one request.
+
+    Returns:
+        tuple: (teacher_map, signup_rows)
+    """
+    values = fetch_sheet_values(sheets_service, spreadsheet_id, [contact_sheet, signup_sheet])
+    return build_teacher_map(values.get(contact_sheet, [])), values.get(signup_sheet, [])
@@ -0,0 +1,184 @@
+import re
+import datetime
+from collections import defaultdict
+from records import SlotHeader, PendingEvent
+from time_headers import parse_time_header
+from sync_journal import event_key
+from instrumentation import span
+from contact_index import ContactIndex
+
+# Rows above the first signup row: two instruction rows and the time-slot header.
+HEADER_ROW = 2
+FIRST_SIGNUP_ROW = 3
+
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+@span('header_parse')
+def parse_slot_headers(header_row):
+    """
+    Parses the signup grid's time-slot header row (row 3).
+
+    The first two columns (instructions and dates) are skipped, as are
+    headers without a recognizable time. Times converted from another zone
+    use today's offsets here; slot_on redoes them for each row's date.
+
+    Returns:
+        dict: column index -> SlotHeader.
+    """
+    slots = {}
+    for i, header in enumerate(header_row):
+        if i < 2: continue
+        slot = parse_time_header(header)
+        if slot is not None:
+            slots[i] = SlotHeader(i, slot.start, slot.end, slot.duration, header)
+    return slots
+
+def slot_on(slot, date):
+    """
+    A column's slot on one row's date ("YYYY-MM-DD").
+
+    A header whose chosen time is labelled with another zone converts with
+    that date's offsets, so a column can start at different target-zone
+    times on either side of a DST change. parse_time_header caches by
+    (header, date), so each column is parsed once per distinct date.
+    """
+    parsed = parse_time_header(slot.header, on_date=datetime.date.fromisoformat(date)) if slot.header else None
+    if parsed is None or (parsed.start, parsed.end) == (slot.start, slot.end):
+        return slot
+    return SlotHeader(slot.column, parsed.start, parsed.end, parsed.duration, slot.header)
+
+def pad_row(row, width):
+    """
+    Pads (or cuts) a ragged `values` row to `width` stripped cells.
+
+    The API trims trailing empty cells, so rows come back with different lengths.
+    """
+    return tuple((cell or '').strip() for cell in row[:width]) + ('',) * (width - len(row))
+
+def parse_row_date(date_cell):
+    """
+    Parses a column B cell ("Weekday, YYYY-MM-DD").
+
+    Returns:
+        tuple: (date "YYYY-MM-DD", weekday), or None if the cell holds no valid date.
+    """
+    match = DATE_PATTERN.search(date_cell)
+    if not match:
+        return None
+    try:
+        datetime.date.fromisoformat(match.group(0))
+    except ValueError:
+        return None
+    return match.group(0), date_cell.split(',')[0].strip()
+
+def melt_grid(signup_rows, slots, cells=None):
+    """
+    Melts the signup grid into one (row_idx, col_idx, date, weekday, slot, name) tuple per filled slot.
+
+    Each row's date is parsed once and each column's header once (in
+    `slots`), so the work is linear in the number of cells, and only
+    time-slot columns are visited. Slots are resolved for the row's date
+    (see slot_on).
+
+    Args:
+        signup_rows (list): Signup sheet rows.
+        slots (dict): column index -> SlotHeader, from parse_slot_headers.
+        cells (set): Optional (row_idx, col_idx) pairs (0-based); only these
+            cells are considered. None walks the whole grid.
+
+    Returns:
+        list: Tuples in grid order (row by row, left to right).
+    """
+    columns = sorted(slots)
+    width = columns[-1] + 1 if columns else 0
+    if cells is None:
+        row_indices = range(FIRST_SIGNUP_ROW, len(signup_rows))
+    else:
+        row_indices = sorted({r for r, _ in cells if FIRST_SIGNUP_ROW <= r < len(signup_rows)})
+
+    triples = []
+    for row_idx in row_indices:
+        row = signup_rows[row_idx]
+        if len(row) < 2:
+            continue
+        parsed = parse_row_date(row[1] or '')
+        if parsed is None:
+            continue
+        date, weekday = parsed
+        padded = pad_row(row, width)
+        for col_idx in columns:
+            name = padded[col_idx]
+            if name and (cells is None or (row_idx, col_idx) in cells):
+                triples.append((row_idx, col_idx, date, weekday, slot_on(slots[col_idx], date), name))
+    return triples
+
+def r1c1(row_idx, col_idx):
+    """
+    R1C1 reference of a 0-based cell.
+    """
+    return f"R{row_idx + 1}C{col_idx + 1}"
+
+@span('ingest')
+def signup_events(teacher_map, signup_rows, cells=None, test_teacher=None, namespace=''):
+    """
+    Transforms the signup grid into pending events in one pass.
+
+    The header row is parsed once, the grid is melted into one tuple per
+    filled slot, and those are joined against the contacts with one dict
+    lookup each. Names are matched on their normalized form (and aliases;
+    see contact_index), and events use the contact's own name.
+
+    Args:
+        teacher_map (dict or ContactIndex): "First Last" -> Contact, or an index built from it.
+        signup_rows (list): Signup sheet rows; the time-slot header is row 3.
+        cells (set): Optional (row_idx, col_idx) pairs to restrict the transform to.
+        test_teacher (str): Only keep this teacher's signups.
+        namespace (str): Sync key namespace (see sync_journal.event_key).
+
+    Returns:
+        tuple: (pending, unmatched). `pending` is a list of PendingEvent in
+        grid order; `unmatched` maps each name missing from `teacher_map` to
+        the R1C1 references of its cells.
+    """
+    if len(signup_rows) <= HEADER_ROW:
+        return [], {}
+    slots = parse_slot_headers(signup_rows[HEADER_ROW])
+    index = teacher_map if hasattr(teacher_map, 'suggest') else ContactIndex(teacher_map)
+
+    pending = []
+    unmatched = defaultdict(list)
+    for row_idx, col_idx, date, weekday, slot, cell_name in melt_grid(signup_rows, slots, cells):
+        contact = index.get(cell_name)
+        if test_teacher and (contact.name if contact else cell_name) != test_teacher:
+            continue
+        if contact is None:
+            unmatched[cell_name].append(r1c1(row_idx, col_idx))
+            continue
+        name = contact.name
+        pending.append(PendingEvent(
+            summary=f"{slot.duration}-Minute Guided Session: {name}",
+            begin=f"{date}T{slot.start}:00",
+            teacher=name,
+            contact=contact,
+            date=date,
+            day=weekday,
+            start=slot.start,
+            end=slot.end,
+            duration=slot.duration,
+            key=event_key(name, date, slot.start, namespace=namespace)
+        ))
+    return pending, dict(unmatched)
+
+def unmatched_report(unmatched, index=None):
+    """
+    One line per unknown name, listing every cell it appears in and, given
+    a ContactIndex, the closest contact names.
+    """
+    lines = []
+    for name, refs in unmatched.items():
+        line = f"Error: No email found for '{name}' at {', '.join(refs)}"
+        suggestions = index.suggest(name) if index is not None else []
+        if suggestions:
+            line += f" (did you mean {' or '.join(repr(match) for match, _ in suggestions)}?)"
+        lines.append(line)
+    return lines
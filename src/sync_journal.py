@@ -0,0 +1,186 @@
+import os
+import json
+import uuid
+import hashlib
+import datetime
+
+# Journal states, in order. 'failed' records an error; the event stays pending.
+# 'deleted' marks an event deleted from the calendar or dropped from the sheet:
+# it is neither pending nor confirmed, and is planned again if it comes back.
+PLANNED = 'planned'
+SENT = 'sent'
+CONFIRMED = 'confirmed'
+FAILED = 'failed'
+DELETED = 'deleted'
+
+# Private extended properties tagging each created event with its run, its
+# program (spreadsheet ID or events file) and teacher, and whether it is a
+# test event, so bulk_delete can select events server-side. They are left
+# out of the content hash: retagging an event is not a change to sync.
+RUN_ID_PROPERTY = 'runId'
+PROGRAM_PROPERTY = 'program'
+TEACHER_PROPERTY = 'teacher'
+TEST_PROPERTY = 'test'
+TAG_PROPERTIES = (RUN_ID_PROPERTY, PROGRAM_PROPERTY, TEACHER_PROPERTY, TEST_PROPERTY)
+
+def new_run_id():
+    """
+    A sortable, unique ID for one run, e.g. '20260105T120000Z-3f9a1c'.
+    """
+    return f"{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}"
+
+# Stamped on every event this process creates.
+RUN_ID = new_run_id()
+
+def event_key(teacher, date, start, namespace=''):
+    """
+    Deterministic key for a signup: a hash of teacher + date + slot start.
+
+    The key only uses characters valid in a Calendar event ID (lowercase hex
+    is a subset of base32hex), so it is sent as the event `id`. A namespace
+    keeps test-mode events from claiming the IDs of the real ones.
+    """
+    raw = '|'.join([namespace, teacher.strip(), date, start])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def stamp_event_key(event_body, key):
+    """
+    Sets the event ID and a private extended property to the sync key.
+    """
+    event_body['id'] = key
+    private = event_body.setdefault('extendedProperties', {}).setdefault('private', {})
+    private['syncKey'] = key
+    return event_body
+
+def stamp_tags(event_body, program=None, teacher=None, test=False, run_id=None):
+    """
+    Tags an event body with the run ID (default: this process's RUN_ID),
+    program, teacher and test flag as private extended properties.
+    """
+    tags = {RUN_ID_PROPERTY: run_id or RUN_ID, PROGRAM_PROPERTY: program, TEACHER_PROPERTY: teacher,
+            TEST_PROPERTY: '1' if test else None}
+    private = event_body.setdefault('extendedProperties', {}).setdefault('private', {})
+    private.update({key: value for key, value in tags.items() if value})
+    return event_body
+
+def content_hash(event_body):
+    """
+    Stable hash of an event body, ignoring its ID, tags and the hash field itself.
+    """
+    body = {k: v for k, v in event_body.items() if k not in ('id', 'extendedProperties')}
+    private = {key: value for key, value in event_body.get('extendedProperties', {}).get('private', {}).items()
+               if key != 'contentHash' and key not in TAG_PROPERTIES}
+    body['private'] = private
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def stamp_content_hash(event_body):
+    """
+    Records the body's content hash in extendedProperties.private.contentHash.
+    """
+    digest = content_hash(event_body)
+    event_body.setdefault('extendedProperties', {}).setdefault('private', {})['contentHash'] = digest
+    return event_body
+
+class SyncJournal:
+    """
+    Append-only write-ahead journal of event creation.
+
+    Every event is recorded as planned (with its full body) before any API
+    call, as sent just before its insert, and as confirmed once the calendar
+    holds it. Each line is flushed and fsynced, so after a crash or quota
+    error the journal tells exactly which events still need work; replaying
+    it never requires re-reading the spreadsheet or scanning the calendar.
+
+    Attributes:
+        entries (dict): key -> {'state', 'body', 'event_id', 'error'}, the
+            latest state of each event after replaying the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            self._replay()
+
+    def _replay(self):
+        with open(self.path, 'r+') as f:
+            content = f.read()
+            if content and not content.endswith('\n'):
+                # A torn final line from a crash mid-write: drop it so the
+                # next record starts on a clean line.
+                content = content[:content.rfind('\n') + 1]
+                f.seek(0)
+                f.truncate(len(content.encode('utf-8')))
+        for line in content.splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+
+    def _apply(self, record):
+        entry = self.entries.setdefault(record['key'], {'state': None, 'body': None, 'event_id': None, 'error': None})
+        entry['state'] = record['state']
+        for field in ('body', 'event_id', 'error'):
+            if field in record:
+                entry[field] = record[field]
+
+    def record(self, key, state, **fields):
+        """
+        Appends a state transition and applies it.
+        """
+        record = {'key': key, 'state': state, 'ts': datetime.datetime.now(datetime.timezone.utc).isoformat()}
+        record.update(fields)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(record)
+
+    def is_confirmed(self, key):
+        """
+        True if the event for `key` is known to exist on the calendar.
+        """
+        return self.entries.get(key, {}).get('state') == CONFIRMED
+
+    def plan(self, event_bodies, existing_ids=None):
+        """
+        Records events (keyed by their `id`) as planned, skipping confirmed ones.
+
+        With `existing_ids` (the IDs the event store holds), a confirmed event
+        missing from them is planned again: the journal alone cannot tell
+        that it was deleted since.
+
+        Returns:
+            list: The bodies that still need to be created.
+        """
+        todo = []
+        for body in event_bodies:
+            key = body['id']
+            if self.is_confirmed(key) and (existing_ids is None or key in existing_ids):
+                continue
+            if self.entries.get(key, {}).get('body') != body or self.entries[key]['state'] == DELETED:
+                self.record(key, PLANNED, body=body)
+            todo.append(body)
+        return todo
+
+    def pending(self, planned_keys=None):
+        """
+        Returns bodies of every journaled event that is neither confirmed nor deleted.
+
+        With `planned_keys` (the keys of the current plan), pending events
+        no longer in it are recorded as deleted and left out.
+        """
+        if planned_keys is not None:
+            self.record_deleted([key for key, entry in self.entries.items()
+                                 if entry['state'] not in (CONFIRMED, DELETED) and key not in planned_keys])
+        return [entry['body'] for entry in self.entries.values()
+                if entry['state'] not in (CONFIRMED, DELETED) and entry['body'] is not None]
+
+    def record_deleted(self, keys):
+        """
+        Records journaled events as deleted; keys the journal does not hold are ignored.
+        """
+        for key in keys:
+            if key in self.entries and self.entries[key]['state'] != DELETED:
+                self.record(key, DELETED)
@@ -1,12 +1,39 @@
 import os
-import re
+import csv
 import json
-import datetime
-import pandas as pd
 import backoff
 from googleapiclient.errors import HttpError
-from jsonc_parser.parser import JsoncParser
-from utils_calendar_general import get_google_services, create_calendar_event
+from utils_calendar_general import (
+    get_google_services,
+    create_calendar_event,
+    iter_batched_inserts,
+    restore_conflicts,
+    insert_event_idempotent,
+    CALENDAR_BATCH_LIMIT
+)
+from calendar_executor import DEFAULT_WORKERS, executor_for_service, insert_keyed_event
+from event_store import open_event_store
+from sheets_ingest import fetch_signup_data
+from records import CreatedEvent, CREATED_CSV_COLUMNS
+from instrumentation import RECORDER, RUN_REPORT, span
+from response_cache import NO_CACHE_ENV
+from recurrence import expand_recurring, compact_events, collapse_instances
+from overlap_detection import find_overlaps
+from freebusy import preflight
+from event_template import load_template, compile_template_text
+from time_headers import parse_time_header
+from signup_grid import signup_events, unmatched_report
+from contact_index import ContactIndex
+from sync_journal import (
+    RUN_ID,
+    SyncJournal,
+    stamp_event_key,
+    stamp_tags,
+    stamp_content_hash,
+    SENT,
+    CONFIRMED,
+    FAILED
+)
 
 # --- Configuration ---
 SPREADSHEET_ID = '10Z993MrZHH0Da_pXEFZoo0MBdxKhf619fZSuuvaAdlQ'
@@ -15,8 +42,12 @@ CONTACT_SHEET = 'Teacher Contact'
 CALENDAR_ID = 'b45a2d5121fed950d815cfa167dd4b3a6aa74c5d62fea928702e6f4300d96545@group.calendar.google.com'  # Replace with specific calendar ID if needed
 TEMPLATE_FILE = '_calendar_event_template.jsonc'
 CREATED_EVENTS_CSV = 'logs/created_events.csv'
+EVENT_STORE_DB = 'logs/events.db'
+SYNC_JOURNAL = 'logs/sync_journal.jsonl'
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly', 
           'https://www.googleapis.com/auth/calendar.events']
+# Requested only by syncs that run the free/busy pre-check.
+FREEBUSY_SCOPE = 'https://www.googleapis.com/auth/calendar.freebusy'
 
 # Credentials Paths
 TOKEN_PATH = '.credentials/token.json'
@@ -24,61 +55,21 @@ CREDS_PATH = '.credentials/credentials.json'
 
 # --- Helper Functions ---
 
-def get_services():
-    return get_google_services(TOKEN_PATH, CREDS_PATH, SCOPES)
+def get_services(scopes=SCOPES):
+    return get_google_services(TOKEN_PATH, CREDS_PATH, scopes)
 
 def parse_time_est(header_str):
     """
     Extracts time(s) from headers like '7 am CST | 1 pm GMT | 8 am EST'
     or '7 am - 7:45 am EST | 6 am CST'.
-    Specifically looks for the 'am/pm EST' part as requested.
+    Uses the EST time when present; otherwise a time in another zone is
+    converted to Eastern (see time_headers.parse_time_header).
     Returns (start_iso, end_iso, duration_mins) or (None, None, None).
     """
-
-    def to_24h(time_str):
-        time_str = time_str.lower().replace(' ', '')
-        if 'pm' in time_str and '12' not in time_str:
-            h = int(time_str.replace('pm', '').split(':')[0]) + 12
-            m = time_str.replace('pm', '').split(':')[1] if ':' in time_str else '00'
-            return f"{h:02d}:{m}"
-        elif 'am' in time_str and '12' in time_str:
-            m = time_str.replace('am', '').split(':')[1] if ':' in time_str else '00'
-            return f"00:{m}"
-        else:
-            time_part = time_str.replace('am', '').replace('pm', '')
-            h = int(time_part.split(':')[0])
-            m = time_part.split(':')[1] if ':' in time_part else '00'
-            return f"{h:02d}:{m}"
-
-    # Try range first: 7 am - 7:45 am EST
-    range_match = re.search(r'(\d+(?::\d+)?\s*[ap]m)\s*-\s*(\d+(?::\d+)?\s*[ap]m)\s*EST', header_str, re.IGNORECASE)
-    if not range_match:
-        # Fallback to single time: 7 am EST
-        single_match = re.search(r'(\d+(?::\d+)?\s*[ap]m)\s*EST', header_str, re.IGNORECASE)
-        if not single_match:
-            # Fallback to first available time if EST isn't found
-            single_match = re.search(r'(\d+(?::\d+)?\s*[ap]m)', header_str, re.IGNORECASE)
-        
-        if single_match:
-            start_iso = to_24h(single_match.group(1))
-            # Default to 10 mins
-            start_dt = datetime.datetime.strptime(start_iso, "%H:%M")
-            end_dt = start_dt + datetime.timedelta(minutes=10)
-            return start_iso, end_dt.strftime("%H:%M"), 10
-    else:
-        start_iso = to_24h(range_match.group(1))
-        end_iso = to_24h(range_match.group(2))
-        
-        start_dt = datetime.datetime.strptime(start_iso, "%H:%M")
-        end_dt = datetime.datetime.strptime(end_iso, "%H:%M")
-        # Handle overnight ranges if any (though unlikely for this use case)
-        if end_dt <= start_dt:
-            end_dt += datetime.timedelta(days=1)
-        
-        duration = int((end_dt - start_dt).total_seconds() / 60)
-        return start_iso, end_iso, duration
-
-    return None, None, None
+    slot = parse_time_header(header_str)
+    if slot is None:
+        return None, None, None
+    return slot.as_tuple()
 
 def col_to_letter(n):
     string = ""
@@ -88,82 +79,210 @@ def col_to_letter(n):
     return string
 
 def validate_template(template_path):
+    """
+    Loads and compiles the event template, exiting if it is invalid.
+
+    Returns:
+        EventTemplate: The compiled template.
+    """
     try:
-        JsoncParser.parse_file(template_path)
-        with open(template_path, 'r') as f:
-            return f.read()
+        return load_template(template_path)
     except Exception as e:
-        print(f"\nCRITICAL ERROR: {TEMPLATE_FILE} is not valid JSONC.")
+        print(f"\nCRITICAL ERROR: {template_path} is not a valid event template.")
         print(f"Details: {str(e)}")
         raise SystemExit(1)
 
-def create_scheduled_events(calendar_service, calendar_id, events_to_create, csv_path):
+def created_event_record(created_event):
+    """
+    Builds the created_events.csv record (a CreatedEvent) for an event returned by the Calendar API.
+    """
+    return CreatedEvent.from_api(created_event)
+
+def created_event_records(created_event):
+    """
+    Like created_event_record, but a recurring event gives one record per
+    occurrence (with Google's instance IDs), so overlap checks see every slot it fills.
+    """
+    return expand_recurring(created_event)
+
+def stored_ids(store):
+    """
+    The event IDs an EventStore holds (a series once, not per occurrence), or None without a store.
+    """
+    return None if store is None else set(collapse_instances(store.active_ids()))
+
+def append_created_records(csv_path, records, store=None):
+    """
+    Appends CreatedEvent records to the CSV log, writing the header on first use.
+    Records are also upserted into the event store when one is given.
+    """
+    if not records:
+        return
+    if store is not None:
+        store.upsert_events(records)
+    write_header = not os.path.exists(csv_path)
+    with open(csv_path, 'a', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        if write_header:
+            writer.writerow(CREATED_CSV_COLUMNS)
+        writer.writerows(record.as_tuple() for record in records)
+
+@span('insert')
+def create_scheduled_events(calendar_service, calendar_id, events_to_create, csv_path, batch_size=None,
+                            workers=None, store=None, journal=None):
     """
     Creates a batch of events and logs them to a CSV file.
     Breaks on the first failure and prints the offending event body.
+
+    When `batch_size` is given, events are sent through Calendar batch HTTP
+    requests instead (see create_scheduled_events_batched). When `workers` is
+    given, they are inserted concurrently (see create_scheduled_events_concurrently);
+    the two modes are exclusive and giving both raises ValueError. Created events are also recorded in `store` (an EventStore) if provided.
+
+    With a SyncJournal (serial mode only), events must carry their sync key as
+    `id`: each one is journaled as planned/sent/confirmed, already-confirmed
+    events are skipped, and inserts are idempotent, so a rerun after a failure
+    picks up exactly where this one stopped. With a store, a confirmed event
+    the store no longer holds (deleted since) is created again.
     """
+    if batch_size and workers:
+        raise ValueError("batch_size and workers are exclusive; pass one or the other.")
+    if batch_size:
+        return create_scheduled_events_batched(calendar_service, calendar_id, events_to_create, csv_path,
+                                               batch_size, store=store)
+    if workers:
+        return create_scheduled_events_concurrently(calendar_service, calendar_id, events_to_create, csv_path,
+                                                    workers, store=store)
+
+    if journal is not None:
+        events_to_create = journal.plan(events_to_create, stored_ids(store))
+
     created_records = []
     for ev in events_to_create:
         try:
-            created_event = calendar_service.events().insert(calendarId=calendar_id, body=ev).execute()
+            if journal is not None:
+                journal.record(ev['id'], SENT)
+                created_event = insert_event_idempotent(calendar_service, calendar_id, ev)
+                journal.record(ev['id'], CONFIRMED, event_id=created_event.get('id'))
+            else:
+                created_event = calendar_service.events().insert(calendarId=calendar_id, body=ev).execute()
             print(f"Created event: {created_event.get('htmlLink')}")
-            created_records.append({
-                'Summary': created_event.get('summary'),
-                'ID': created_event.get('id'),
-                'Begin': created_event['start'].get('dateTime') or created_event['start'].get('date')
-            })
+            records = created_event_records(created_event)
+            created_records.extend(records)
             
             # Incremental save
-            new_row = pd.DataFrame([created_records[-1]])
-            if os.path.exists(csv_path):
-                new_row.to_csv(csv_path, mode='a', header=False, index=False)
-            else:
-                new_row.to_csv(csv_path, index=False)
+            append_created_records(csv_path, records, store)
                 
         except HttpError as error:
             print(f"An error occurred: {error}")
             print(f"Offending Event Body:\n{json.dumps(ev, indent=2)}")
             print("Stopping execution due to API failure.")
+            if journal is not None:
+                journal.record(ev['id'], FAILED, error=str(error))
+                print("Rerun with --resume to continue from this event.")
             break
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             print(f"Offending Event Body:\n{json.dumps(ev, indent=2)}")
             print("Stopping execution due to unexpected failure.")
+            if journal is not None:
+                journal.record(ev['id'], FAILED, error=str(e))
+                print("Rerun with --resume to continue from this event.")
             break
             
     return created_records
 
-def prepare_event_body(row, template_text):
+def create_scheduled_events_batched(calendar_service, calendar_id, events_to_create, csv_path,
+                                    batch_size=CALENDAR_BATCH_LIMIT, store=None):
+    """
+    Creates events through Calendar batch HTTP requests and logs them to a CSV file.
+
+    Unlike create_scheduled_events, a failing event does not stop the run: failed
+    sub-requests are retried with backoff, and anything still failing is reported
+    at the end. The CSV is written once per batch. Events whose `id` already
+    exists (a rerun after a partial run) are returned or restored, not failed.
+
+    Returns:
+        list: Records of the created events, in the same format as create_scheduled_events.
+    """
+    created_records = []
+    failures = []
+    for created, failed in iter_batched_inserts(calendar_service, calendar_id, events_to_create, batch_size):
+        restored, failed = restore_conflicts(calendar_service, calendar_id, events_to_create, failed)
+        created = created + restored
+        batch_records = [record for _, event in created for record in created_event_records(event)]
+        append_created_records(csv_path, batch_records, store)
+        created_records.extend(batch_records)
+        failures.extend(failed)
+        print(f"Batch complete: {len(created)} created, {len(failed)} failed "
+              f"({len(created_records)}/{len(events_to_create)} total).")
+
+    for idx, error in failures:
+        print(f"\nFailed to create event #{idx + 1}: {error}")
+        print(f"Offending Event Body:\n{json.dumps(events_to_create[idx], indent=2)}")
+
+    return created_records
+
+def create_scheduled_events_concurrently(calendar_service, calendar_id, events_to_create, csv_path,
+                                         workers=DEFAULT_WORKERS, store=None):
+    """
+    Creates events on a bounded thread pool with a shared, throttle-aware rate limiter.
+
+    Each worker thread uses its own Calendar service. Results are appended to
+    the CSV as they complete; failures are reported without stopping the run.
+    As in the serial path, an event whose `id` already exists is not a failure.
+
+    Returns:
+        list: Records of the created events, in completion order.
+    """
+    executor = executor_for_service(calendar_service, workers=workers)
+    items = [(calendar_id, ev) for ev in events_to_create]
+
+    created_records = []
+    for (_, ev), created_event, error in executor.run(insert_keyed_event, items):
+        if error is not None:
+            print(f"An error occurred: {error}")
+            print(f"Offending Event Body:\n{json.dumps(ev, indent=2)}")
+            continue
+        print(f"Created event: {created_event.get('htmlLink')}")
+        records = created_event_records(created_event)
+        created_records.extend(records)
+        append_created_records(csv_path, records, store)
+
+    return created_records
+
+def prepare_event_body(pending, template, program=None, test=False):
     """
     Prepares the event JSON body by substituting variables into the template.
+
+    Args:
+        pending (PendingEvent): The signup to render.
+        template: A compiled EventTemplate, or the template's JSONC text.
+        program (str): Program tag for the event (see sync_journal.stamp_tags).
+        test (bool): Test mode: the summary gets a TEST prefix and attendees are dropped.
     """
+    if isinstance(template, str):
+        template = compile_template_text(template)
+
     vars = {
-        "date": row['Date'],
-        "day_of_week": row['Day'],
-        "time_iso": row['Start'],
-        "end_time_iso": row['End'],
-        "duration": row['Duration']
+        "date": pending.date,
+        "day_of_week": pending.day,
+        "time_iso": pending.start,
+        "end_time_iso": pending.end,
+        "duration": pending.duration
     }
-    vars.update(row['Contact'])
-    
-    event_json_str = template_text
-    for key, val in vars.items():
-        # Properly escape the value for JSON
-        escaped_val = json.dumps(str(val))
-        # If the placeholder is inside quotes like "{key}", we want to replace the whole thing 
-        # but since our template has "{key}" and we want to preserve quotes if we were doing simple string replace,
-        # but here we are substituting into a JSON structure.
-        # The existing logic did: escaped_val = json.dumps(str(val))[1:-1]
-        # which strips the surrounding quotes. This is only safe for single-line strings.
-        # For multiline strings, we need to be more careful.
-        
-        # Actually, let's keep it simple: the template uses "{key}". 
-        # If we replace {key} with the contents of json.dumps(val)[1:-1], it should work 
-        # because json.dumps handles newlines and control characters as \n, \r, etc.
-        safe_val = json.dumps(str(val))[1:-1]
-        event_json_str = event_json_str.replace(f"{{{key}}}", safe_val)
-    
-    return JsoncParser.parse_str(event_json_str)
+    vars.update(pending.contact.as_vars()) # Adds {First Name}, {Last Name}, etc.
+    event_body = template.render(vars)
+
+    if test:
+        event_body['summary'] = f"TEST: {event_body.get('summary', '')}"
+        event_body['attendees'] = []
+
+    stamp_tags(event_body, program=program, teacher=pending.teacher, test=test)
+    if pending.key:
+        # Deterministic ID so reruns and --resume never insert duplicates
+        stamp_content_hash(stamp_event_key(event_body, pending.key))
+    return event_body
 
 def create_event(service, calendar_id, event_body):
     """
@@ -171,166 +290,237 @@ def create_event(service, calendar_id, event_body):
     """
     return create_calendar_event(service, calendar_id, event_body)
 
-def main(dry_run=True, test_teacher=None, limit=None):
-    if dry_run:
-        print("\n[DRY RUN MODE] Use --run to actually create events.")
-    
-    sheets_service, calendar_service = get_services()
+@span('render')
+def build_events(teacher_map, signup_rows, template, test_teacher=None, limit=None, program=None):
+    """
+    Renders an event body for every matched signup in the grid.
+
+    Args:
+        teacher_map (dict): "First Last" -> Contact.
+        signup_rows (list): Signup sheet rows; the time-slot header is row 3.
+        template (EventTemplate): Compiled event template.
+        test_teacher (str): Only render this teacher's signups.
+        limit (int): Test mode marker: summaries get a TEST prefix, attendees are
+            dropped and sync keys are namespaced. Truncation is left to the caller.
+        program (str): Program tag for the events (see sync_journal.stamp_tags).
+
+    Returns:
+        tuple: (events_to_create, preview_data, errors)
+    """
+    test = limit is not None
+    contacts = ContactIndex(teacher_map)
+    pending, unmatched = signup_events(contacts, signup_rows, test_teacher=test_teacher,
+                                       namespace='test' if test else '')
 
-    # 0. Validate Template early
-    template_str = validate_template(TEMPLATE_FILE)
-    
-    # 1. Fetch Contact Data
-    contact_range = f"'{CONTACT_SHEET}'!A1:F100"
-    contact_result = sheets_service.spreadsheets().values().get(
-        spreadsheetId=SPREADSHEET_ID, range=contact_range).execute()
-    contact_rows = contact_result.get('values', [])
-    
-    if not contact_rows:
-        print("No contact data found.")
-        return
+    events_to_create = []
+    preview_data = []
+    for event in pending:
+        event_data = prepare_event_body(event, template, program=program, test=test)
+        events_to_create.append(event_data)
+        preview_data.append(preview_row(event_data))
 
-    contact_headers = contact_rows[0]
-    contacts_df = pd.DataFrame(contact_rows[1:], columns=contact_headers)
-    
-    # Mapping unique names to their full contact dict
-    teacher_map = {}
-    for _, row in contacts_df.iterrows():
-        full_name = f"{row['First Name']} {row['Last Name']}".strip()
-        teacher_map[full_name] = row.to_dict()
-
-    # 2. Fetch Signup Data
-    signup_range = f"'{SIGNUP_SHEET}'!A1:Z50" # Adjust range as needed
-    signup_result = sheets_service.spreadsheets().values().get(
-        spreadsheetId=SPREADSHEET_ID, range=signup_range).execute()
-    signup_rows = signup_result.get('values', [])
+    return events_to_create, preview_data, unmatched_report(unmatched, contacts)
 
-    if not signup_rows:
-        print("No signup data found.")
-        return
+def preview_row(event_data):
+    """
+    The preview table row for an event body.
+    """
+    return {
+        "Event Name": event_data.get('summary'),
+        "Event Start Time": event_data['start'].get('dateTime'),
+        "Event End Time": event_data['end'].get('dateTime'),
+        "Event Guest Name(s)": ", ".join([a.get('email', '') for a in event_data.get('attendees', [])])
+    }
 
-    # Header is at index 2 (Row 3)
-    header_row = signup_rows[2]
-    time_slots = {} # col_index -> (start_iso, end_iso, duration)
-    for i, header in enumerate(header_row):
-        if i < 2: continue # Skip first two columns (Instructions/Dates)
-        start_iso, end_iso, duration = parse_time_est(header)
-        if start_iso:
-            time_slots[i] = (start_iso, end_iso, duration)
-
-    # 3. Iterate and Process
-    errors = []
-    events_to_create = []
-    preview_data = []
+def compact_planned(events_to_create, existing=None):
+    """
+    Collapses repeating signups into recurring events (see recurrence.compact_events).
 
-    for row_idx, row in enumerate(signup_rows):
-        if row_idx < 3: continue # Skip instructions and headers
-        
-        # Column B (idx 1) is Date: "Weekday, YYYY-MM-DD"
-        if len(row) < 2: continue
-        date_raw = row[1]
-        date_match = re.search(r'\d{4}-\d{2}-\d{2}', date_raw)
-        if not date_match: continue
-        date_str = date_match.group(0)
-        
-        day_of_week = date_raw.split(',')[0].strip()
-
-        for col_idx, teacher_name in enumerate(row):
-            if col_idx not in time_slots: continue
-            if not teacher_name or teacher_name.strip() == "": continue
-            
-            teacher_name = teacher_name.strip()
-            
-            # Filter if test_teacher is provided
-            if test_teacher and teacher_name != test_teacher:
-                continue
-
-            if teacher_name not in teacher_map:
-                r1c1 = f"R{row_idx+1}C{col_idx+1}"
-                errors.append(f"Error: No email found for '{teacher_name}' at {r1c1}")
-                continue
-            
-            contact_info = teacher_map[teacher_name]
-            start_time_iso, end_time_iso, duration = time_slots[col_idx]
-            
-            # Prepare substitution variables
-            vars = {
-                "date": date_str,
-                "day_of_week": day_of_week,
-                "time_iso": start_time_iso,
-                "end_time_iso": end_time_iso,
-                "duration": duration
-            }
-            vars.update(contact_info) # Adds {First Name}, {Last Name}, etc.
-
-            # Substitute in template safely
-            event_json_str = template_str
-            for key, val in vars.items():
-                # We dump the value to JSON to ensure high/low characters and quotes are escaped
-                # Then we strip the surrounding quotes that json.dumps adds to strings
-                escaped_val = json.dumps(str(val))[1:-1]
-                event_json_str = event_json_str.replace(f"{{{key}}}", escaped_val)
-            
-            try:
-                event_data = JsoncParser.parse_str(event_json_str)
-                
-                # Test Mode Enhancements: Prefix summary and remove attendees if --limit is used
-                if limit is not None:
-                    event_data['summary'] = f"TEST: {event_data.get('summary', '')}"
-                    event_data['attendees'] = []
-
-                events_to_create.append(event_data)
-
-                # Collect preview info
-                preview_data.append({
-                    "Event Name": event_data.get('summary'),
-                    "Event Start Time": event_data['start'].get('dateTime'),
-                    "Event End Time": event_data['end'].get('dateTime'),
-                    "Event Guest Name(s)": ", ".join([a.get('email', '') for a in event_data.get('attendees', [])])
-                })
-            except Exception as e:
-                r1c1 = f"R{row_idx+1}C{col_idx+1}"
-                print(f"\nERROR: Failed to parse generated JSON for {teacher_name} at {r1c1}")
-                print(f"Parsing error: {str(e)}")
-                # Potentially print the failing JSON for debugging
-                # print(f"Offending JSON:\n{event_json_str}")
-                continue
+    Signups already on the calendar (matched against `existing` CreatedEvent
+    records on summary and start) are dropped first: a series' ID depends on
+    all of its occurrences, so a grown run would otherwise repeat them.
 
-    # 4. Report Errors
+    Returns:
+        tuple: (events_to_create, preview_data); the preview gains a Repeats column.
+    """
+    if existing:
+        matches = find_overlaps([CreatedEvent.from_api(ev) for ev in events_to_create], existing)
+        events_to_create = [ev for ev, match in zip(events_to_create, matches) if match is None]
+    compacted, runs = compact_events(events_to_create)
+    print(f"Collapsed {len(events_to_create)} signups into {len(compacted)} events "
+          f"({runs} recurring).")
+    preview_data = [dict(preview_row(ev), Repeats=(ev.get('recurrence') or [''])[0].split(':', 1)[-1])
+                    for ev in compacted]
+    return compacted, preview_data
+
+def print_matching_errors(errors):
     if errors:
         print("\n--- Matching Errors ---")
         for err in errors:
             print(err)
 
-    # 5. Confirmation and Limiting
+def plan_sheet_events(sheets_service, spreadsheet_id, signup_sheet, contact_sheet, template_file,
+                      test_teacher=None, limit=None, recurring=False, existing=None):
+    """
+    Validates the template, fetches the signup grid and renders its events.
+
+    With `recurring`, repeating signups are collapsed into recurring events
+    (see compact_planned; `existing` are the events already created).
+
+    Returns:
+        tuple: (events_to_create, preview_data), or None if a sheet has no data.
+    """
+    # 0. Validate Template early
+    template = validate_template(template_file)
+
+    # 1. Fetch Contact and Signup Data (single batchGet over both sheets)
+    teacher_map, signup_rows = fetch_signup_data(sheets_service, spreadsheet_id, signup_sheet, contact_sheet)
+
+    if not teacher_map:
+        print("No contact data found.")
+        return None
+
+    if not signup_rows:
+        print("No signup data found.")
+        return None
+
+    events_to_create, preview_data, errors = build_events(teacher_map, signup_rows, template,
+                                                          test_teacher=test_teacher, limit=limit,
+                                                          program=spreadsheet_id)
+
+    # 4. Report Errors
+    print_matching_errors(errors)
+    if recurring:
+        events_to_create, preview_data = compact_planned(events_to_create, existing)
+    return events_to_create, preview_data
+
+def format_table(rows):
+    """
+    Formats a list of dicts (sharing keys) as a plain-text table with aligned columns.
+    """
+    if not rows:
+        return ''
+    columns = list(rows[0])
+    cells = [[str(row.get(col, '')) for col in columns] for row in rows]
+    widths = [max(len(col), *(len(line[i]) for line in cells)) for i, col in enumerate(columns)]
+    lines = [' '.join(col.rjust(width) for col, width in zip(columns, widths))]
+    lines.extend(' '.join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+    return '\n'.join(lines)
+
+def confirm_events(events_to_create, preview_data, limit=None, dry_run=True):
+    """
+    Shows the preview, applies `limit` and asks for confirmation when live.
+
+    Returns:
+        list: The events to create, or an empty list if there is nothing to
+        do (no events, a dry run, or the user declined).
+    """
     if not events_to_create:
         print("\nNo events found to create.")
-        return
+        return []
 
     # Display Preview Table
-    df_preview = pd.DataFrame(preview_data)
     print("\n--- Event Preview ---")
-    print(df_preview.to_string(index=False))
+    print(format_table(preview_data))
     print(f"\nTotal events found: {len(events_to_create)}")
 
     if limit:
         print(f"Limit applied: only the first {limit} event(s) will be processed.")
         events_to_create = events_to_create[:limit]
 
-    # Ask for confirmation if running live
-    if not dry_run:
-        confirm = input(f"\nProceed with creating {len(events_to_create)} events? (y/n): ")
-        if confirm.lower() != 'y':
-            print("Operation cancelled by user.")
-            return
-
-        # 6. Create Events
-        created_records = create_scheduled_events(calendar_service, CALENDAR_ID, events_to_create, CREATED_EVENTS_CSV)
-        
-        if created_records:
-            print(f"\nSuccessfully created {len(created_records)} new events.")
-    else:
+    if dry_run:
         print("\n[DRY RUN] No events were created.")
+        return []
+
+    confirm = input(f"\nProceed with creating {len(events_to_create)} events? (y/n): ")
+    if confirm.lower() != 'y':
+        print("Operation cancelled by user.")
+        return []
+    return events_to_create
+
+def resume_sync(sheets_service, calendar_service, dry_run=True, test_teacher=None, limit=None, recurring=False):
+    """
+    Continues an interrupted run from the journal.
+
+    Only events the journal does not list as confirmed are sent, with the
+    bodies it recorded. The signup grid is re-read (the calendar is not
+    scanned) so that signups removed since the interrupted run are dropped
+    rather than created.
+    """
+    journal = SyncJournal(SYNC_JOURNAL)
+    existing = None
+    if recurring:
+        with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+            existing = store.created_events()
+    planned = plan_sheet_events(sheets_service, SPREADSHEET_ID, SIGNUP_SHEET, CONTACT_SHEET, TEMPLATE_FILE,
+                                test_teacher=test_teacher, limit=limit, recurring=recurring, existing=existing)
+    pending = journal.pending({ev['id'] for ev in planned[0]} if planned else set())
+    if not pending:
+        print(f"Nothing to resume: every event in {SYNC_JOURNAL} is confirmed.")
+        return
+
+    print(f"\n{len(pending)} unconfirmed event(s) in {SYNC_JOURNAL}:")
+    for ev in pending:
+        print(f"  {ev.get('summary')} at {ev.get('start', {}).get('dateTime')}")
+
+    if dry_run:
+        print("\n[DRY RUN] No events were created.")
+        return
+
+    confirm = input(f"\nProceed with creating {len(pending)} events? (y/n): ")
+    if confirm.lower() != 'y':
+        print("Operation cancelled by user.")
+        return
+
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        created_records = create_scheduled_events(calendar_service, CALENDAR_ID, pending, CREATED_EVENTS_CSV,
+                                                  store=store, journal=journal)
+    if created_records:
+        print(f"\nSuccessfully created {len(created_records)} new events.")
+
+def main(dry_run=True, test_teacher=None, limit=None, batch_size=None, workers=None, resume=False,
+         recurring=False, busy_check=True):
+    if dry_run:
+        print("\n[DRY RUN MODE] Use --run to actually create events.")
+    
+    busy_check = busy_check and not resume
+    sheets_service, calendar_service = get_services(SCOPES + [FREEBUSY_SCOPE] if busy_check else SCOPES)
+
+    if resume:
+        resume_sync(sheets_service, calendar_service, dry_run, test_teacher, limit, recurring)
+        return
+
+    existing = None
+    if recurring or busy_check:
+        with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+            existing = store.created_events()
+
+    planned = plan_sheet_events(sheets_service, SPREADSHEET_ID, SIGNUP_SHEET, CONTACT_SHEET, TEMPLATE_FILE,
+                                test_teacher=test_teacher, limit=limit, recurring=recurring,
+                                existing=existing if recurring else None)
+    if planned is None:
+        return
+    events_to_create, preview_data = planned
+
+    # Pre-flight: conflicts with busy time on the calendar or the teachers' calendars
+    if busy_check and events_to_create:
+        preflight(calendar_service, CALENDAR_ID, events_to_create, preview_data, existing)
+
+    # 5. Confirmation and Limiting
+    events_to_create = confirm_events(events_to_create, preview_data, limit, dry_run)
+    if not events_to_create:
+        return
+
+    # 6. Create Events
+    print(f"Run ID: {RUN_ID} (undo with: scheduler delete --run-id {RUN_ID} --run)")
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        journal = None if batch_size or workers else SyncJournal(SYNC_JOURNAL)
+        created_records = create_scheduled_events(calendar_service, CALENDAR_ID, events_to_create,
+                                                  CREATED_EVENTS_CSV, batch_size=batch_size, workers=workers,
+                                                  store=store, journal=journal)
+
+    if created_records:
+        print(f"\nSuccessfully created {len(created_records)} new events.")
 
 if __name__ == '__main__':
     import argparse
@@ -338,7 +528,30 @@ if __name__ == '__main__':
     parser.add_argument('--run', action='store_true', help='Actually create events in the calendar.')
     parser.add_argument('--test', action='store_true', help='Only process events for Stephen Holsenbeck.')
     parser.add_argument('--limit', type=int, help='Limit the number of events to create.')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--batch-size', type=int, nargs='?', const=CALENDAR_BATCH_LIMIT,
+                      help=f'Create events with batch requests (default {CALENDAR_BATCH_LIMIT} per batch).')
+    mode.add_argument('--workers', type=int, nargs='?', const=DEFAULT_WORKERS,
+                      help=f'Create events concurrently (default {DEFAULT_WORKERS} workers).')
+    parser.add_argument('--resume', action='store_true',
+                        help=f'Continue an interrupted run using only unconfirmed events in {SYNC_JOURNAL}.')
+    parser.add_argument('--recurring', action='store_true',
+                        help='Collapse repeating signups (same teacher and slot) into recurring events.')
+    parser.add_argument('--no-busy-check', action='store_true',
+                        help="Skip the free/busy check of the calendar and the teachers' calendars.")
+    
+    parser.add_argument('--report', default=RUN_REPORT,
+                        help='Where to write the run report (timings, API calls, retries).')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Read the sheet and calendar from the API, bypassing the response cache.')
     
     args = parser.parse_args()
+    if args.no_cache:
+        os.environ[NO_CACHE_ENV] = '1'
     
-    main(dry_run=not args.run, test_teacher="Stephen Holsenbeck" if args.test else None, limit=args.limit)
+    try:
+        main(dry_run=not args.run, test_teacher="Stephen Holsenbeck" if args.test else None, limit=args.limit,
+             batch_size=args.batch_size, workers=args.workers, resume=args.resume, recurring=args.recurring,
+             busy_check=not args.no_busy_check)
+    finally:
+        RECORDER.write_report(args.report)
@@ -0,0 +1,129 @@
+import re
+import datetime
+import functools
+from dataclasses import dataclass
+from zoneinfo import ZoneInfo
+
+# Zone the calendar events are scheduled in (matches the template's timeZone);
+# naive event times everywhere else are read in it too.
+EVENT_TIMEZONE = 'America/New_York'
+
+# Length given to slots whose header has a single time rather than a range.
+DEFAULT_DURATION_MINS = 10
+
+# Abbreviations seen in signup headers, mapped to IANA zones. Daylight and
+# standard variants share a zone: the offset comes from the event date.
+TIMEZONE_ABBREVIATIONS = {
+    'EST': 'America/New_York', 'EDT': 'America/New_York', 'ET': 'America/New_York',
+    'CST': 'America/Chicago', 'CDT': 'America/Chicago', 'CT': 'America/Chicago',
+    'MST': 'America/Denver', 'MDT': 'America/Denver', 'MT': 'America/Denver',
+    'PST': 'America/Los_Angeles', 'PDT': 'America/Los_Angeles', 'PT': 'America/Los_Angeles',
+    'GMT': 'UTC', 'UTC': 'UTC',
+    'BST': 'Europe/London',
+    'CET': 'Europe/Paris', 'CEST': 'Europe/Paris',
+    'IST': 'Asia/Kolkata',
+    'JST': 'Asia/Tokyo',
+    'AEST': 'Australia/Sydney', 'AEDT': 'Australia/Sydney',
+}
+
+_TIME = r'(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?'
+_ZONES = '|'.join(sorted(TIMEZONE_ABBREVIATIONS, key=len, reverse=True))
+
+# One header segment: "7 am", "7:30 pm EST" or "7 am - 7:45 am EST".
+SEGMENT_RE = re.compile(
+    rf'{_TIME}(?:\s*[-–]\s*{_TIME})?(?:\s*({_ZONES})\b)?',
+    re.IGNORECASE)
+
+@dataclass(frozen=True, slots=True)
+class TimeSlot:
+    """
+    A signup column's time window, expressed in the target timezone.
+
+    Attributes:
+        start (str): Start time as "HH:MM".
+        end (str): End time as "HH:MM" (may be past midnight, i.e. before start).
+        duration (int): Length in minutes.
+        timezone (str): IANA zone the times are expressed in.
+    """
+    start: str
+    end: str
+    duration: int
+    timezone: str
+
+    def as_tuple(self):
+        """
+        Returns (start, end, duration), the shape parse_time_est has always returned.
+        """
+        return self.start, self.end, self.duration
+
+def _minutes(hour, minute, meridiem):
+    hour, minute = int(hour), int(minute or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    hour %= 12
+    if meridiem.lower() == 'p':
+        hour += 12
+    return hour * 60 + minute
+
+def _hhmm(minutes):
+    return f"{(minutes // 60) % 24:02d}:{minutes % 60:02d}"
+
+def _segments(header):
+    """
+    Yields (start_minutes, end_minutes or None, zone name or None) per time in the header.
+    """
+    for match in SEGMENT_RE.finditer(header):
+        start = _minutes(*match.group(1, 2, 3))
+        if start is None:
+            continue
+        end = _minutes(*match.group(4, 5, 6)) if match.group(4) else None
+        abbreviation = match.group(7)
+        yield start, end, TIMEZONE_ABBREVIATIONS[abbreviation.upper()] if abbreviation else None
+
+def _convert(minutes, source_tz, target_tz, on_date):
+    if source_tz == target_tz:
+        return minutes
+    local = datetime.datetime.combine(on_date, datetime.time(minutes // 60, minutes % 60),
+                                      tzinfo=ZoneInfo(source_tz))
+    converted = local.astimezone(ZoneInfo(target_tz))
+    return converted.hour * 60 + converted.minute
+
+@functools.lru_cache(maxsize=1024)
+def _parse_header(header, target_tz, on_date):
+    segments = list(_segments(header))
+    if not segments:
+        return None
+
+    # Prefer a time already labelled in the target zone, then any labelled
+    # time (converted), then the first time, which is taken as target-zone.
+    chosen = next((s for s in segments if s[2] == target_tz), None)
+    if chosen is None:
+        chosen = next((s for s in segments if s[2] is not None), segments[0])
+    start, end, source_tz = chosen
+    source_tz = source_tz or target_tz
+
+    duration = DEFAULT_DURATION_MINS if end is None else (end - start) % (24 * 60) or 24 * 60
+    start = _convert(start, source_tz, target_tz, on_date)
+    return TimeSlot(_hhmm(start), _hhmm(start + duration), duration, target_tz)
+
+def parse_time_header(header, target_tz=EVENT_TIMEZONE, on_date=None):
+    """
+    Parses a signup column header into a TimeSlot in `target_tz`.
+
+    Headers list one time per region, e.g. '7 am CST | 1 pm GMT | 8 am EST' or
+    '7 am - 7:45 am EST | 6 am CST'. A time labelled with the target zone is
+    used as-is; otherwise the first labelled time is converted with zoneinfo
+    (using `on_date` for daylight saving), and an unlabelled time is assumed
+    to already be in the target zone. Results are cached per header.
+
+    Args:
+        header (str): Column header text.
+        target_tz (str): IANA zone to express the slot in.
+        on_date (datetime.date): Date used for zone conversion. Defaults to today.
+
+    Returns:
+        TimeSlot or None if the header contains no time.
+    """
+    if not header:
+        return None
+    return _parse_header(header, target_tz, on_date or datetime.date.today())
@@ -1,22 +1,50 @@
 import os
+import csv
 import json
+import time
 import datetime
-import pandas as pd
+import itertools
 import backoff
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from jsonc_parser.parser import JsoncParser
+from instrumentation import span, instrument, record_retry, on_backoff, BATCH_ENDPOINT
+from response_cache import ResponseCache, NO_CACHE_ENV, cached
+from recurrence import collapse_instances
+from exporters import export_events
 
-def get_google_services(token_path, creds_path, scopes):
+# google-auth, googleapiclient.discovery and jsonc_parser are imported
+# inside the functions that need them, keeping CLI startup fast.
+
+# Retry policy shared by single and batched inserts.
+BACKOFF_MAX_TRIES = 5
+
+# The Calendar API accepts up to 1000 calls per batch, but Google recommends
+# keeping Calendar batches at 50 or fewer sub-requests.
+CALENDAR_BATCH_LIMIT = 50
+
+# events().list page size and the partial-response mask used when listing events.
+CALENDAR_PAGE_SIZE = 250
+EVENT_FIELDS = 'id,summary,start,end,updated,status'
+
+# Set to a FakeGoogle fixture file (see fake_google_api.py) to run offline.
+FAKE_GOOGLE_ENV = 'SCHEDULER_FAKE_GOOGLE'
+
+def get_credentials(token_path, creds_path, scopes):
     """
-    Unified authentication for Google Sheets and Calendar.
+    Loads cached OAuth credentials, refreshing or running the consent flow as needed.
+
+    A saved token that records its granted scopes but lacks one of `scopes`
+    cannot be refreshed into it, so consent is asked for again.
     """
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, scopes)
+        with open(token_path) as f:
+            granted = json.load(f).get('scopes') or []
+        if not (granted and set(scopes) - set(granted)):
+            creds = Credentials.from_authorized_user_file(token_path, scopes)
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
@@ -25,10 +53,87 @@ def get_google_services(token_path, creds_path, scopes):
             creds = flow.run_local_server(port=0)
         with open(token_path, 'w') as token:
             token.write(creds.to_json())
-    
-    sheets_service = build('sheets', 'v4', credentials=creds)
-    calendar_service = build('calendar', 'v3', credentials=creds)
-    return sheets_service, calendar_service
+    return creds
+
+def fake_google_from_env():
+    """
+    Returns a FakeGoogle loaded from the SCHEDULER_FAKE_GOOGLE fixture, or None if unset.
+    """
+    if not os.environ.get(FAKE_GOOGLE_ENV):
+        return None
+    from fake_google_api import FakeGoogle
+    print(f"Using offline Google API fake from {os.environ[FAKE_GOOGLE_ENV]}")
+    return FakeGoogle.from_fixture(os.environ[FAKE_GOOGLE_ENV])
+
+def get_google_services(token_path, creds_path, scopes, fake=None, cache=True):
+    """
+    Unified authentication for Google Sheets and Calendar.
+
+    If `fake` (a fake_google_api.FakeGoogle) is given, or the
+    SCHEDULER_FAKE_GOOGLE environment variable names a fixture file, the
+    in-process fakes are returned instead and no credentials are needed.
+
+    Args:
+        cache: A response_cache.ResponseCache, True for the default one in
+            logs/response_cache.db, or False for none. Repeated reads (e.g.
+            rerunning notebook cells) are then served from the cache; see
+            response_cache.CachedService. The default cache is skipped for
+            fakes and when SCHEDULER_NO_CACHE is set.
+    """
+    with span('auth'):
+        if fake is None:
+            fake = fake_google_from_env()
+        if cache is True:
+            cache = ResponseCache() if fake is None and not os.environ.get(NO_CACHE_ENV) else None
+        if fake is not None:
+            sheets_service, calendar_service = instrument(fake.sheets), instrument(fake.calendar)
+        else:
+            creds = get_credentials(token_path, creds_path, scopes)
+            sheets_service = build_service('sheets', 'v4', credentials=creds)
+            calendar_service = build_service('calendar', 'v3', credentials=creds)
+        return cached(sheets_service, cache or None, 'sheets'), cached(calendar_service, cache or None, 'calendar')
+
+def build_service(api, version, **kwargs):
+    """
+    Builds an API client from the discovery document bundled with googleapiclient.
+
+    static_discovery avoids fetching (and cache_discovery avoids writing) the
+    discovery document on every run. The service is instrumented, so its
+    requests show up in the run report.
+    """
+    from googleapiclient.discovery import build
+    return instrument(build(api, version, static_discovery=True, cache_discovery=False, **kwargs))
+
+def credentials_from_service(service):
+    """
+    Returns the credentials an API service was built with, or None if unavailable.
+    """
+    return getattr(getattr(service, '_http', None), 'credentials', None)
+
+def is_rate_limit_error(error):
+    """
+    True if an HttpError is Calendar/Sheets throttling (429 or a 403 rate-limit reason).
+    """
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    if error.resp.status != 403:
+        return False
+    try:
+        details = json.loads(error.content.decode('utf-8'))
+        reasons = {e.get('reason') for e in details.get('error', {}).get('errors', [])}
+    except (ValueError, AttributeError):
+        return False
+    return bool(reasons & {'rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded'})
+
+def is_retryable_error(error):
+    """
+    True for errors worth retrying: throttling and server-side (5xx) failures.
+    """
+    if not isinstance(error, HttpError):
+        return False
+    return is_rate_limit_error(error) or error.resp.status >= 500
 
 def load_jsonc(path):
     """
@@ -36,106 +141,584 @@ def load_jsonc(path):
     """
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
+    from jsonc_parser.parser import JsoncParser
     return JsoncParser.parse_file(path)
 
-def fetch_calendar_events(service, calendar_id, time_min=None, time_max=None):
+def strip_jsonc_comments(chunks):
     """
-    Fetches events from the specified Google Calendar.
+    Removes // and /* */ comments from a stream of JSONC text chunks.
+
+    Comment markers inside strings are kept, and a marker split across two
+    chunks is still recognized.
+
+    Yields:
+        str: The chunks with comments removed.
+    """
+    in_string = escape = False
+    comment = None
+    pending = ''
+    for chunk in chunks:
+        out = []
+        for ch in chunk:
+            if comment == 'line':
+                if ch == '\n':
+                    comment = None
+                    out.append(ch)
+                continue
+            if comment == 'block':
+                if pending == '*' and ch == '/':
+                    comment, pending = None, ''
+                else:
+                    pending = '*' if ch == '*' else ''
+                continue
+            if in_string:
+                out.append(ch)
+                if escape:
+                    escape = False
+                elif ch == '\\':
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+                continue
+            if pending == '/':
+                pending = ''
+                if ch in '/*':
+                    comment = 'line' if ch == '/' else 'block'
+                    continue
+                out.append('/')
+            if ch == '/':
+                pending = '/'
+                continue
+            if ch == '"':
+                in_string = True
+            out.append(ch)
+        yield ''.join(out)
+    if pending == '/' and comment is None:
+        yield '/'
+
+def _strip_trailing_commas(chunks):
+    """
+    Drops commas directly before a closing ] or } (allowed in JSONC, not JSON).
+    """
+    in_string = escape = False
+    held = ''
+    for chunk in chunks:
+        out = []
+        for ch in chunk:
+            if in_string:
+                out.append(ch)
+                if escape:
+                    escape = False
+                elif ch == '\\':
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+                continue
+            if held:
+                if ch in ' \t\r\n':
+                    held += ch
+                    continue
+                out.append(held[1:] if ch in ']}' else held)
+                held = ''
+            if ch == ',':
+                held = ch
+                continue
+            if ch == '"':
+                in_string = True
+            out.append(ch)
+        yield ''.join(out)
+    if held:
+        yield held
+
+def _iter_array_items(chunks):
+    """
+    Incrementally decodes the items of a top-level JSON array from text chunks.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, started = '', 0, False
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is not None:
+            buffer, pos = buffer[pos:] + chunk, 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array at the top level.")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if chunk is None:
+                    raise
+                break  # the item continues in the next chunk
+            yield item
+    raise ValueError("Unexpected end of input: the JSON array is not closed.")
+
+class _ChunkReader:
+    """
+    Minimal binary file object over text chunks, for ijson.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+
+    def read(self, size=-1):
+        if size == 0:
+            return b''  # ijson probes the stream type with read(0)
+        for chunk in self.chunks:
+            if chunk:
+                return chunk.encode('utf-8')
+        return b''
+
+def iter_jsonc_array(path, chunk_size=65536):
+    """
+    Streams the items of a JSONC file whose top level is an array.
+
+    The streaming counterpart of load_jsonc: the file is read in chunks,
+    comments and trailing commas are stripped on the fly and items are decoded one at a time,
+    so memory use does not grow with the file. Uses ijson when installed,
+    otherwise an incremental json decoder.
+
+    Yields:
+        The array items (dicts for event files).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        chunks = _strip_trailing_commas(strip_jsonc_comments(iter(lambda: f.read(chunk_size), '')))
+        try:
+            import ijson
+        except ImportError:
+            yield from _iter_array_items(chunks)
+            return
+        yield from ijson.items(_ChunkReader(chunks), 'item', use_float=True)
+
+def default_time_window(time_min=None, time_max=None):
+    """
+    Fills in the default fetch window: 30 days ago through the end of the current year.
     """
     if time_min is None:
-        now = datetime.datetime.now(datetime.timezone.utc)
-        time_min = (now - datetime.timedelta(days=30)).isoformat()
+        # Whole days, so repeated listings make the same request (and can be served from the cache).
+        today = datetime.datetime.now(datetime.timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        time_min = (today - datetime.timedelta(days=30)).isoformat()
     
     if time_max is None:
         # Default to end of current year
         year = datetime.datetime.now().year
         time_max = datetime.datetime(year, 12, 31, 23, 59, 59, tzinfo=datetime.timezone.utc).isoformat()
+    return time_min, time_max
+
+def iter_calendar_events(service, calendar_id, time_min=None, time_max=None, max_results=CALENDAR_PAGE_SIZE,
+                         fields=EVENT_FIELDS, sync_token=None, sync_state=None, private_properties=None,
+                         query=None, default_window=True):
+    """
+    Streams events from the specified Google Calendar, following every page.
+
+    Args:
+        service: Initialized Google Calendar API service.
+        calendar_id (str): Calendar to read.
+        time_min (str): RFC 3339 lower bound. Ignored when `sync_token` is given.
+        time_max (str): RFC 3339 upper bound. Ignored when `sync_token` is given.
+        max_results (int): Page size (the API allows up to 2500).
+        fields (str): Partial-response mask for each event, or None for full events.
+        sync_token (str): nextSyncToken from a previous run. Only events changed
+            since then are returned, including cancelled ones (status 'cancelled').
+        sync_state (dict): If given, receives 'nextSyncToken' once the last page
+            is read. Results are then left unordered, since the API does not
+            issue sync tokens for startTime-ordered listings.
+        private_properties (dict): Only events whose private extended properties
+            hold these values, filtered server-side (privateExtendedProperty).
+        query (str): Free-text filter matched server-side (the `q` parameter).
+        default_window (bool): False to leave out timeMin/timeMax when they
+            are not given, listing the whole calendar.
 
-    events_result = service.events().list(
-        calendarId=calendar_id, 
-        timeMin=time_min,
-        timeMax=time_max,
-        singleEvents=True,
-        orderBy='startTime'
-    ).execute()
-    return events_result.get('items', [])
+    Yields:
+        dict: Event resources.
 
-@backoff.on_exception(backoff.expo, HttpError, max_tries=5)
+    Raises:
+        HttpError: 410 if `sync_token` has expired; callers should do a full sync.
+    """
+    params = {'calendarId': calendar_id, 'singleEvents': True, 'maxResults': max_results}
+    if fields:
+        params['fields'] = f"etag,nextPageToken,nextSyncToken,items({fields})"
+    if sync_token:
+        params['syncToken'] = sync_token
+    else:
+        if default_window:
+            time_min, time_max = default_time_window(time_min, time_max)
+        params.update({key: value for key, value in (('timeMin', time_min), ('timeMax', time_max)) if value})
+        if private_properties:
+            params['privateExtendedProperty'] = [f"{key}={value}" for key, value in private_properties.items()]
+        if query:
+            params['q'] = query
+        if sync_state is None:
+            params['orderBy'] = 'startTime'
+
+    request = service.events().list(**params)
+    events_result = {}
+    while request is not None:
+        events_result = request.execute()
+        yield from events_result.get('items', [])
+        request = service.events().list_next(request, events_result)
+
+    if sync_state is not None:
+        sync_state['nextSyncToken'] = events_result.get('nextSyncToken')
+
+def fetch_calendar_events(service, calendar_id, time_min=None, time_max=None, fields=EVENT_FIELDS):
+    """
+    Fetches events from the specified Google Calendar.
+    """
+    return list(iter_calendar_events(service, calendar_id, time_min, time_max, fields=fields))
+
+def sync_token_path(csv_path):
+    """
+    Location of the persisted nextSyncToken for a created-events CSV.
+    """
+    return os.path.splitext(csv_path)[0] + '.sync_token'
+
+def load_sync_token(path):
+    """
+    Returns the saved sync token, or None if there is none.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return f.read().strip() or None
+
+def save_sync_token(path, token):
+    """
+    Persists a sync token, removing the file when the token is empty.
+    """
+    if not token:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(token)
+
+@backoff.on_exception(backoff.expo, HttpError, max_tries=BACKOFF_MAX_TRIES, on_backoff=on_backoff)
 def create_calendar_event(service, calendar_id, event_body):
     """
     Inserts an event into Google Calendar with exponential backoff.
     """
     return service.events().insert(calendarId=calendar_id, body=event_body).execute()
 
-def delete_events_from_csv(csv_path, service, calendar_id):
+@backoff.on_exception(backoff.expo, HttpError, max_tries=BACKOFF_MAX_TRIES,
+                      giveup=lambda e: e.resp.status == 409, on_backoff=on_backoff)
+def insert_event_idempotent(service, calendar_id, event_body):
+    """
+    Inserts an event whose body carries a client-chosen `id`, safely re-runnable.
+
+    If the ID already exists (409) the existing event is returned instead of
+    creating a duplicate. A previously deleted (cancelled) event with that ID
+    is restored by updating it with the new body.
+    """
+    try:
+        return service.events().insert(calendarId=calendar_id, body=event_body).execute()
+    except HttpError as e:
+        if e.resp.status != 409:
+            raise
+    existing = service.events().get(calendarId=calendar_id, eventId=event_body['id']).execute()
+    if existing.get('status') != 'cancelled':
+        return existing
+    restored = dict(event_body, status='confirmed')
+    return service.events().update(calendarId=calendar_id, eventId=event_body['id'], body=restored).execute()
+
+def _execute_batch(service, indexed_requests):
+    """
+    Sends one batch HTTP request.
+
+    Returns:
+        dict: request_id -> (response, exception) for every sub-request.
+    """
+    results = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    batch = service.new_batch_http_request(callback=callback)
+    for idx, request in indexed_requests:
+        batch.add(request, request_id=str(idx))
+    batch.execute()
+    return results
+
+def _execute_insert_batch(service, calendar_id, indexed_bodies):
+    """
+    Sends one batch HTTP request of event inserts.
+    """
+    return _execute_batch(service, [(idx, service.events().insert(calendarId=calendar_id, body=body))
+                                    for idx, body in indexed_bodies])
+
+def iter_batched_inserts(service, calendar_id, event_bodies, batch_size=CALENDAR_BATCH_LIMIT,
+                         max_tries=BACKOFF_MAX_TRIES):
+    """
+    Inserts events through Calendar batch HTTP requests, one batch at a time.
+
+    Failed sub-requests are retried with the same policy as create_calendar_event
+    (exponential backoff with full jitter, up to `max_tries` attempts); sub-requests
+    that already succeeded are never resent.
+
+    Args:
+        service: Initialized Google Calendar API service.
+        calendar_id (str): Target calendar ID.
+        event_bodies (list): Event bodies to insert.
+        batch_size (int): Sub-requests per batch, capped at CALENDAR_BATCH_LIMIT.
+        max_tries (int): Attempts per sub-request before it is reported as failed.
+
+    Yields:
+        tuple: (created, failed) for each batch. `created` is a list of
+        (index, event) pairs and `failed` a list of (index, error) pairs, where
+        index refers to the position in `event_bodies`.
+    """
+    batch_size = max(1, min(batch_size, CALENDAR_BATCH_LIMIT))
+    indexed = list(enumerate(event_bodies))
+
+    for offset in range(0, len(indexed), batch_size):
+        pending = indexed[offset:offset + batch_size]
+        created, failed = [], []
+        wait = backoff.expo()
+        wait.send(None)
+
+        for attempt in range(1, max_tries + 1):
+            try:
+                results = _execute_insert_batch(service, calendar_id, pending)
+            except HttpError as e:
+                # The whole batch request failed; every sub-request is retryable.
+                results = {str(idx): (None, e) for idx, _ in pending}
+
+            retry = []
+            for idx, body in pending:
+                response, exception = results.get(str(idx), (None, None))
+                if exception is None and response is not None:
+                    created.append((idx, response))
+                elif isinstance(exception, HttpError) and exception.resp.status != 409 and attempt < max_tries:
+                    # A 409 (ID already exists) will not change on retry.
+                    retry.append((idx, body))
+                else:
+                    failed.append((idx, exception))
+
+            if not retry:
+                break
+            delay = backoff.full_jitter(next(wait))
+            record_retry(BATCH_ENDPOINT, delay)
+            time.sleep(delay)
+            pending = retry
+
+        yield created, failed
+
+def restore_conflicts(service, calendar_id, event_bodies, failed):
+    """
+    Resolves batched inserts that failed because their event ID already exists (409).
+
+    Each such body goes through insert_event_idempotent, as in the serial path:
+    the existing event is returned, or a deleted one is restored.
+
+    Args:
+        event_bodies (list): The bodies passed to iter_batched_inserts.
+        failed (list): (index, error) pairs it yielded.
+
+    Returns:
+        tuple: (restored, failed) - (index, event) pairs now on the calendar and
+        the (index, error) pairs that still failed.
+    """
+    restored, still_failed = [], []
+    for idx, error in failed:
+        if isinstance(error, HttpError) and error.resp.status == 409 and 'id' in event_bodies[idx]:
+            try:
+                restored.append((idx, insert_event_idempotent(service, calendar_id, event_bodies[idx])))
+                continue
+            except HttpError as e:
+                error = e
+        still_failed.append((idx, error))
+    return restored, still_failed
+
+def iter_batched_deletes(service, calendar_id, event_ids, batch_size=CALENDAR_BATCH_LIMIT,
+                         max_tries=BACKOFF_MAX_TRIES):
+    """
+    Deletes events through Calendar batch HTTP requests, one batch at a time.
+
+    An event that is already gone (404/410) counts as deleted. Throttled and
+    5xx sub-requests are retried with exponential backoff and full jitter, up
+    to `max_tries` attempts.
+
+    Yields:
+        tuple: (deleted, failed) for each batch: a list of event IDs and a
+        list of (event_id, error) pairs.
+    """
+    batch_size = max(1, min(batch_size, CALENDAR_BATCH_LIMIT))
+    event_ids = list(event_ids)
+
+    for offset in range(0, len(event_ids), batch_size):
+        pending = event_ids[offset:offset + batch_size]
+        deleted, failed = [], []
+        wait = backoff.expo()
+        wait.send(None)
+
+        for attempt in range(1, max_tries + 1):
+            try:
+                results = _execute_batch(service, [(event_id, service.events().delete(calendarId=calendar_id,
+                                                                                     eventId=event_id))
+                                                   for event_id in pending])
+            except HttpError as e:
+                results = {event_id: (None, e) for event_id in pending}
+
+            retry = []
+            for event_id in pending:
+                _, exception = results.get(event_id, (None, None))
+                if exception is None or (isinstance(exception, HttpError) and exception.resp.status in (404, 410)):
+                    deleted.append(event_id)
+                elif is_retryable_error(exception) and attempt < max_tries:
+                    retry.append(event_id)
+                else:
+                    failed.append((event_id, exception))
+
+            if not retry:
+                break
+            delay = backoff.full_jitter(next(wait))
+            record_retry(BATCH_ENDPOINT, delay)
+            time.sleep(delay)
+            pending = retry
+
+        yield deleted, failed
+
+@span('delete')
+def delete_events_from_csv(csv_path, service, calendar_id, workers=None, journal=None):
     """
     Delete events from the calendar based on a CSV file containing event IDs.
+
+    With `workers`, deletions run concurrently through a rate-limited
+    CalendarExecutor instead of one at a time. Deleted events are recorded
+    in `journal` (a SyncJournal) if given, so the next sync creates them again.
     """
     if not os.path.exists(csv_path):
         print(f"CSV not found: {csv_path}")
         return
     
-    df = pd.read_csv(csv_path)
-    if 'ID' not in df.columns and 'id' not in df.columns:
-        print("No 'ID' or 'id' column found in CSV.")
-        return
-    
-    id_col = 'ID' if 'ID' in df.columns else 'id'
+    with open(csv_path, newline='') as f:
+        reader = csv.DictReader(f)
+        if 'ID' not in (reader.fieldnames or []) and 'id' not in (reader.fieldnames or []):
+            print("No 'ID' or 'id' column found in CSV.")
+            return
+        id_col = 'ID' if 'ID' in reader.fieldnames else 'id'
+        # Occurrences of a recurring event are deleted with their series.
+        event_ids = list(collapse_instances(row[id_col] for row in reader))
     
-    print(f"Identified {len(df)} events for deletion.")
-    confirm = input(f"Are you sure you want to delete {len(df)} events from calendar? (y/n): ")
+    print(f"Identified {len(event_ids)} events for deletion.")
+    confirm = input(f"Are you sure you want to delete {len(event_ids)} events from calendar? (y/n): ")
     if confirm.lower() != 'y':
         print("Deletion cancelled.")
         return
 
-    for event_id in df[id_col]:
-        try:
-            service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-            print(f"Deleted event: {event_id}")
-        except HttpError as e:
-            if e.resp.status == 404:
-                print(f"Event already deleted or not found: {event_id}")
-            else:
+    if workers:
+        deleted = delete_events_concurrently(service, calendar_id, event_ids, workers)
+    else:
+        deleted = []
+        for event_id in event_ids:
+            try:
+                service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+                print(f"Deleted event: {event_id}")
+                deleted.append(event_id)
+            except HttpError as e:
+                if e.resp.status in (404, 410):
+                    print(f"Event already deleted or not found: {event_id}")
+                    deleted.append(event_id)
+                else:
+                    print(f"Error deleting {event_id}: {e}")
+            except Exception as e:
                 print(f"Error deleting {event_id}: {e}")
-        except Exception as e:
-            print(f"Error deleting {event_id}: {e}")
+
+    if journal is not None:
+        journal.record_deleted(deleted)
+
+def delete_events_concurrently(service, calendar_id, event_ids, workers):
+    """
+    Deletes events on a bounded thread pool with a shared rate limiter.
+
+    Returns:
+        list: IDs deleted, or already gone (404/410).
+    """
+    # Imported here: calendar_executor depends on this module.
+    from calendar_executor import executor_for_service, delete_event
+
+    executor = executor_for_service(service, workers=workers)
+    items = [(calendar_id, event_id) for event_id in event_ids]
+    deleted = []
+    for (_, event_id), _, error in executor.run(delete_event, items):
+        if error is None:
+            print(f"Deleted event: {event_id}")
+            deleted.append(event_id)
+        elif isinstance(error, HttpError) and error.resp.status in (404, 410):
+            print(f"Event already deleted or not found: {event_id}")
+            deleted.append(event_id)
+        else:
+            print(f"Error deleting {event_id}: {error}")
+    return deleted
+
+@span('delete')
+def delete_events_from_store(store, service, calendar_id, workers=None, journal=None):
+    """
+    Delete every active event recorded in an EventStore, tombstoning each one.
+
+    Events the calendar reports as already gone (404/410) are tombstoned too.
+    Recorded occurrences of a recurring event are deleted with one call for
+    their series. Deleted events are recorded in `journal` (a SyncJournal)
+    if given.
+    """
+    targets = collapse_instances(store.active_ids())
+    event_ids = list(targets)
+    print(f"Identified {len(event_ids)} events for deletion.")
+    confirm = input(f"Are you sure you want to delete {len(event_ids)} events from calendar? (y/n): ")
+    if confirm.lower() != 'y':
+        print("Deletion cancelled.")
+        return
+
+    deleted = []
+    if workers:
+        from calendar_executor import executor_for_service, delete_event
+
+        executor = executor_for_service(service, workers=workers)
+        outcomes = ((event_id, error) for (_, event_id), _, error
+                    in executor.run(delete_event, [(calendar_id, event_id) for event_id in event_ids]))
+    else:
+        def delete_serially():
+            for event_id in event_ids:
+                try:
+                    service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+                    yield event_id, None
+                except Exception as e:
+                    yield event_id, e
+        outcomes = delete_serially()
+
+    for event_id, error in outcomes:
+        if error is None:
+            print(f"Deleted event: {event_id}")
+            deleted.append(event_id)
+        elif isinstance(error, HttpError) and error.resp.status in (404, 410):
+            print(f"Event already deleted or not found: {event_id}")
+            deleted.append(event_id)
+        else:
+            print(f"Error deleting {event_id}: {error}")
+
+    store.mark_deleted([recorded for event_id in deleted for recorded in targets[event_id]])
+    if journal is not None:
+        journal.record_deleted(deleted)
 
 def write_events_to_csv(events, filename):
     """
     Writes Google calendar event data to a csv file.
+
+    Events are streamed in chunks, so any iterable works (e.g.
+    iter_calendar_events); see exporters.export_events for Parquet and .ics.
     
     Args:
-        events (list): List of event dictionaries returned by fetch_calendar_events.
+        events (iterable): Event dictionaries, e.g. from fetch_calendar_events.
         filename (str): The path to the CSV file to be created.
     """
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
-    data = []
-    for ev in events:
-        summary = ev.get('summary', '')
-        start_info = ev.get('start', {})
-        
-        # Get datetime string
-        dt_str = start_info.get('dateTime') or start_info.get('date')
-        if not dt_str:
-            continue
-            
-        dt = pd.to_datetime(dt_str)
-        
-        # Extract Teacher: text following the ':' in summary
-        teacher = ''
-        if ':' in summary:
-            teacher = summary.split(':', 1)[1].strip()
-            
-        data.append({
-            'Summary': summary,
-            'Begin (Datetime)': dt_str,
-            'Teacher': teacher,
-            'Date': dt.strftime('%Y-%m-%d'),
-            'Day': dt.strftime('%A'),
-            'Start': dt.strftime('%H:%M')
-        })
-        
-    df = pd.DataFrame(data)
-    df.to_csv(filename, index=False)
-    print(f"Exported {len(df)} events to {filename}")
+    export_events(events, filename, 'csv')
@@ -0,0 +1,259 @@
+import os
+import json
+import time
+import random
+import hashlib
+import backoff
+from sheets_ingest import fetch_sheet_values, build_teacher_map
+from google_sheets_data import pending_events_from_rows
+from overlap_detection import find_overlaps
+from contact_index import ContactIndex
+from event_template import load_template
+from event_store import open_event_store
+from reconcile import INSERT, PATCH, DELETE, apply_operations
+from sync_scheduler import (
+    SPREADSHEET_ID,
+    SIGNUP_SHEET,
+    CONTACT_SHEET,
+    CALENDAR_ID,
+    TEMPLATE_FILE,
+    CREATED_EVENTS_CSV,
+    EVENT_STORE_DB,
+    get_services,
+    prepare_event_body
+)
+
+# Last-seen contact and signup grids, diffed against on every poll.
+WATCH_SNAPSHOT = 'logs/watch_snapshot.json'
+
+# Seconds between polls, and the ceiling the backoff grows to after failed polls.
+DEFAULT_POLL_INTERVAL = 60
+DEFAULT_MAX_INTERVAL = 900
+
+# Polls are spread by +/- this fraction of the interval.
+POLL_JITTER = 0.1
+
+def values_hash(values):
+    """
+    Digest of a batchGet values response, used to detect an unchanged sheet.
+    """
+    canonical = json.dumps(values, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def load_snapshot(path):
+    """
+    Returns the saved snapshot ({"hash", "contacts", "signup"}), or None if there is none yet.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_snapshot(path, snapshot):
+    """
+    Writes the snapshot atomically, so an interrupted write never leaves a partial grid.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+def _cell(rows, row_idx, col_idx):
+    row = rows[row_idx] if row_idx < len(rows) else []
+    return (row[col_idx] or '').strip() if col_idx < len(row) else ''
+
+def changed_cells(old_rows, new_rows):
+    """
+    Compares two signup grids cell by cell.
+
+    A changed date (column B) marks its whole row as changed.
+
+    Returns:
+        set: (row_idx, col_idx) of changed signup cells, or None when the
+        time-slot header row differs and the whole grid must be compared.
+    """
+    if len(old_rows) > 2 and len(new_rows) > 2 and old_rows[2] != new_rows[2]:
+        return None
+    if (len(old_rows) > 2) != (len(new_rows) > 2):
+        return None
+
+    cells = set()
+    for row_idx in range(3, max(len(old_rows), len(new_rows))):
+        old_row = old_rows[row_idx] if row_idx < len(old_rows) else []
+        new_row = new_rows[row_idx] if row_idx < len(new_rows) else []
+        width = max(len(old_row), len(new_row))
+        if _cell(old_rows, row_idx, 1) != _cell(new_rows, row_idx, 1):
+            cells.update((row_idx, col_idx) for col_idx in range(width))
+            continue
+        cells.update((row_idx, col_idx) for col_idx in range(2, width)
+                     if _cell(old_rows, row_idx, col_idx) != _cell(new_rows, row_idx, col_idx))
+    return cells
+
+def teacher_cells(rows, teachers, contacts):
+    """
+    Returns the (row_idx, col_idx) of every signup cell naming one of `teachers`.
+
+    Cells are resolved through `contacts` (a ContactIndex), as signup_events
+    resolves them, so "ann lee" or an alias counts as "Ann Lee".
+    """
+    def teacher(value):
+        contact = contacts.get(value) if value else None
+        return contact.name if contact is not None else None
+    return {(row_idx, col_idx)
+            for row_idx in range(3, len(rows))
+            for col_idx, value in enumerate(rows[row_idx])
+            if col_idx >= 2 and teacher(value) in teachers}
+
+def changed_teachers(old_map, new_map):
+    """
+    Names whose contact row was added, removed or edited.
+    """
+    def fields(contact):
+        return contact.as_vars() if contact is not None else None
+    return {name for name in old_map.keys() | new_map.keys() if fields(old_map.get(name)) != fields(new_map.get(name))}
+
+class SheetWatcher:
+    """
+    Polls the signup spreadsheet and pushes only what changed to the calendar.
+
+    Each poll is one values().batchGet over the contact and signup sheets. The
+    response is hashed and, when it matches the last snapshot, nothing else
+    happens. Otherwise the grid is diffed cell by cell against the snapshot:
+    added signups are inserted (skipping any already on the calendar, per
+    find_overlaps against the event store), removed ones are deleted, and the
+    events of teachers whose contact row changed are patched. Event IDs are
+    the deterministic sync keys, so a retried cycle never duplicates an event.
+    """
+
+    def __init__(self, sheets_service, calendar_service, store=None, calendar_id=CALENDAR_ID,
+                 spreadsheet_id=SPREADSHEET_ID, signup_sheet=SIGNUP_SHEET, contact_sheet=CONTACT_SHEET,
+                 template_file=TEMPLATE_FILE, snapshot_path=WATCH_SNAPSHOT, dry_run=True, sleep=time.sleep):
+        self.sheets_service = sheets_service
+        self.calendar_service = calendar_service
+        self.store = store
+        self.calendar_id = calendar_id
+        self.spreadsheet_id = spreadsheet_id
+        self.signup_sheet = signup_sheet
+        self.contact_sheet = contact_sheet
+        self.template = load_template(template_file)
+        self.snapshot_path = snapshot_path
+        self.dry_run = dry_run
+        self.sleep = sleep
+        self.snapshot = load_snapshot(snapshot_path) or {'hash': None, 'contacts': [], 'signup': []}
+
+    def plan(self, old_contacts, old_signup, new_contacts, new_signup):
+        """
+        Diffs two versions of the sheets.
+
+        Returns:
+            list: (action, event_id, body) operations, as reconcile.apply_operations takes them.
+        """
+        old_map, new_map = build_teacher_map(old_contacts), build_teacher_map(new_contacts)
+        old_index, new_index = ContactIndex(old_map), ContactIndex(new_map)
+        teachers = changed_teachers(old_map, new_map)
+        cells = changed_cells(old_signup, new_signup)
+        if cells is not None and teachers:
+            cells |= teacher_cells(old_signup, teachers, old_index) | teacher_cells(new_signup, teachers, new_index)
+        if cells == set():
+            return []
+
+        old = {event.key: event for event in pending_events_from_rows(old_index, old_signup, cells)}
+        new = {event.key: event for event in pending_events_from_rows(new_index, new_signup, cells)}
+
+        added = [event for key, event in new.items() if key not in old]
+        if added and self.store is not None:
+            existing = find_overlaps(added, self.store.created_events())
+            skipped = sum(1 for overlap_id in existing if overlap_id)
+            if skipped:
+                print(f"Skipping {skipped} new signup(s) already on the calendar.")
+            added = [event for event, overlap_id in zip(added, existing) if not overlap_id]
+
+        operations = [(INSERT, event.key, prepare_event_body(event, self.template)) for event in added]
+        operations += [(PATCH, key, prepare_event_body(event, self.template))
+                       for key, event in new.items() if key in old and event.teacher in teachers]
+        operations += [(DELETE, key, None) for key in old if key not in new]
+        return operations
+
+    def poll(self):
+        """
+        Runs one cycle.
+
+        Returns:
+            list: The operations planned (and, unless dry_run, applied); None
+            when the sheet is unchanged since the last poll.
+        """
+        # Always a fresh read: a cached response would hide the edits being watched for.
+        values = fetch_sheet_values(self.sheets_service, self.spreadsheet_id,
+                                    [self.contact_sheet, self.signup_sheet], use_cache=False)
+        digest = values_hash(values)
+        if digest == self.snapshot['hash']:
+            return None
+
+        contacts, signup = values.get(self.contact_sheet, []), values.get(self.signup_sheet, [])
+        operations = self.plan(self.snapshot['contacts'], self.snapshot['signup'], contacts, signup)
+        snapshot = {'hash': digest, 'contacts': contacts, 'signup': signup}
+        if not operations:
+            print("Sheet changed; no calendar changes needed.")
+        else:
+            print(f"\nSheet changed: {sum(op[0] == INSERT for op in operations)} insert, "
+                  f"{sum(op[0] == PATCH for op in operations)} patch, {sum(op[0] == DELETE for op in operations)} delete.")
+            for action, event_id, body in operations:
+                print(f"  {action:<7} {body.get('summary') if body else event_id}")
+
+        if operations and not self.dry_run:
+            counts = apply_operations(self.calendar_service, self.calendar_id, operations, self.store)
+            if counts['failed']:
+                # Keep the old snapshot so the next poll retries the failed changes.
+                print(f"{counts['failed']} change(s) failed; they will be retried on the next poll.")
+                return operations
+
+        self.snapshot = snapshot
+        if not self.dry_run:
+            save_snapshot(self.snapshot_path, snapshot)
+        return operations
+
+    def run(self, interval=DEFAULT_POLL_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL, max_polls=None):
+        """
+        Polls until interrupted (or `max_polls` polls).
+
+        Polls are spaced `interval` seconds apart with jitter. After a failed
+        poll the wait doubles, with full jitter, up to `max_interval`, and
+        resets on the next successful poll.
+        """
+        failures = 0
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            polls += 1
+            try:
+                self.poll()
+                failures = 0
+                delay = interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+            except Exception as e:
+                failures += 1
+                delay = backoff.full_jitter(min(max_interval, interval * 2 ** failures))
+                print(f"Poll failed ({type(e).__name__}: {e}); retrying in {delay:.0f}s.")
+            if max_polls is None or polls < max_polls:
+                self.sleep(delay)
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Watch the signup sheet and push changes to the calendar.')
+    parser.add_argument('--run', action='store_true', help='Apply changes (default only prints them).')
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f'Seconds between polls (default {DEFAULT_POLL_INTERVAL}).')
+    parser.add_argument('--max-interval', type=float, default=DEFAULT_MAX_INTERVAL,
+                        help=f'Longest wait after repeated failures (default {DEFAULT_MAX_INTERVAL}).')
+    parser.add_argument('--once', action='store_true', help='Poll once and exit (e.g. from cron).')
+    parser.add_argument('--snapshot', default=WATCH_SNAPSHOT, help=f'Snapshot file (default {WATCH_SNAPSHOT}).')
+    args = parser.parse_args()
+
+    sheets_service, calendar_service = get_services()
+    with open_event_store(EVENT_STORE_DB, CREATED_EVENTS_CSV) as store:
+        watcher = SheetWatcher(sheets_service, calendar_service, store=store, snapshot_path=args.snapshot,
+                               dry_run=not args.run)
+        try:
+            watcher.run(args.interval, args.max_interval, max_polls=1 if args.once else None)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
@@ -0,0 +1,151 @@
+import io
+import functools
+import contextlib
+import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.fake_google_api import FakeGoogle, synthetic_program
+from src.google_sheets_data import fetch_google_sheets_data
+from src.event_template import load_template
+from src.overlap_detection import find_overlaps
+from src.records import CreatedEvent, write_created_events
+from src.sync_scheduler import prepare_event_body, create_scheduled_events
+from src.calendar_executor import CalendarExecutor, TokenBucket, insert_event, delete_event
+from src.utils_calendar_general import delete_events_from_csv
+
+SIZES = [100, 1_000, 10_000]
+# Fewer rounds for the big runs keep the whole suite to a few minutes.
+ROUNDS = {100: 5, 1_000: 3, 10_000: 1}
+
+TEMPLATE_FILE = str(Path(__file__).resolve().parents[2] / '_calendar_event_template.jsonc')
+SPREADSHEET_ID = 'fake-spreadsheet'
+CALENDAR_ID = 'bench@group.calendar.google.com'
+
+def quietly(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+@functools.lru_cache(maxsize=None)
+def pending_events(n):
+    fake = FakeGoogle(spreadsheets=synthetic_program(n, SPREADSHEET_ID))
+    pending, _ = quietly(fetch_google_sheets_data, fake.sheets, SPREADSHEET_ID, 'Signup',
+                         'Teacher Contact', TEMPLATE_FILE)
+    return tuple(pending)
+
+@functools.lru_cache(maxsize=None)
+def event_bodies(n):
+    template = load_template(TEMPLATE_FILE)
+    return tuple(prepare_event_body(pending, template) for pending in pending_events(n))
+
+def seeded_calendar(n):
+    fake = FakeGoogle()
+    for body in event_bodies(n):
+        fake.calendar.insert(CALENDAR_ID, body).handler()
+    return fake
+
+def unlimited_executor(fake, workers=8):
+    return CalendarExecutor(lambda: fake.calendar, workers=workers, limiter=TokenBucket(rate=1e9))
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_sheet_ingestion(benchmark, n):
+    fake = FakeGoogle(spreadsheets=synthetic_program(n, SPREADSHEET_ID))
+    pending, _ = benchmark.pedantic(
+        quietly, args=(fetch_google_sheets_data, fake.sheets, SPREADSHEET_ID, 'Signup', 'Teacher Contact',
+                       TEMPLATE_FILE), rounds=ROUNDS[n])
+    assert len(pending) == n
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_template_render(benchmark, n):
+    template = load_template(TEMPLATE_FILE)
+    rows = pending_events(n)
+    bodies = benchmark.pedantic(lambda: [prepare_event_body(row, template) for row in rows], rounds=ROUNDS[n])
+    assert len(bodies) == n
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_overlap_detection(benchmark, n):
+    pending = pending_events(n)
+    # Half the signups already exist on the calendar, as the API returns them.
+    eastern = ZoneInfo('America/New_York')
+    created = [CreatedEvent(event.summary, f"id{i}",
+                            datetime.datetime.fromisoformat(event.begin).replace(tzinfo=eastern).isoformat())
+               for i, event in enumerate(pending[::2])]
+    result = benchmark.pedantic(find_overlaps, args=(pending, created), rounds=ROUNDS[n])
+    assert sum(overlap_id is not None for overlap_id in result) == len(created)
+
+def _create_setup(tmp_path):
+    def setup():
+        csv_path = tmp_path / 'created_events.csv'
+        if csv_path.exists():
+            csv_path.unlink()
+        return (FakeGoogle(), str(csv_path)), {}
+    return setup
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_create_serial(benchmark, tmp_path, n):
+    bodies = list(event_bodies(n))
+    records = benchmark.pedantic(
+        lambda fake, csv_path: quietly(create_scheduled_events, fake.calendar, CALENDAR_ID, bodies, csv_path),
+        setup=_create_setup(tmp_path), rounds=ROUNDS[n])
+    assert len(records) == n
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_create_batched(benchmark, tmp_path, n):
+    bodies = list(event_bodies(n))
+    records = benchmark.pedantic(
+        lambda fake, csv_path: quietly(create_scheduled_events, fake.calendar, CALENDAR_ID, bodies, csv_path,
+                                       batch_size=50),
+        setup=_create_setup(tmp_path), rounds=ROUNDS[n])
+    assert len(records) == n
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_create_concurrent(benchmark, n):
+    items = [(CALENDAR_ID, body) for body in event_bodies(n)]
+
+    def run(fake):
+        return [error for _, _, error in unlimited_executor(fake).run(insert_event, items)]
+    errors = benchmark.pedantic(run, setup=lambda: ((FakeGoogle(),), {}), rounds=ROUNDS[n])
+    assert not any(errors)
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_delete_serial(benchmark, tmp_path, monkeypatch, n):
+    monkeypatch.setattr('builtins.input', lambda prompt: 'y')
+    csv_path = tmp_path / 'created_events.csv'
+    write_created_events(str(csv_path), [CreatedEvent(body['summary'], body['id'], None) for body in event_bodies(n)])
+
+    def run(fake):
+        quietly(delete_events_from_csv, str(csv_path), fake.calendar, CALENDAR_ID)
+        return fake
+    fake = benchmark.pedantic(run, setup=lambda: ((seeded_calendar(n),), {}), rounds=ROUNDS[n])
+    assert fake.events(CALENDAR_ID) == []
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_delete_concurrent(benchmark, n):
+    items = [(CALENDAR_ID, body['id']) for body in event_bodies(n)]
+
+    def run(fake):
+        return [error for _, _, error in unlimited_executor(fake).run(delete_event, items)]
+    errors = benchmark.pedantic(run, setup=lambda: ((seeded_calendar(n),), {}), rounds=ROUNDS[n])
+    assert not any(errors)
+
+@pytest.mark.parametrize("mode", ["serial", "batched", "concurrent"])
+def test_bench_create_with_latency(benchmark, tmp_path, mode):
+    # 2 ms per round trip makes the cost of one request per event visible.
+    bodies = list(event_bodies(100))
+
+    def setup():
+        csv_path = tmp_path / 'created_events.csv'
+        if csv_path.exists():
+            csv_path.unlink()
+        return (FakeGoogle(latency=0.002), str(csv_path)), {}
+
+    def run(fake, csv_path):
+        if mode == 'concurrent':
+            return [e for _, _, e in unlimited_executor(fake).run(insert_event, [(CALENDAR_ID, b) for b in bodies])]
+        batch_size = 50 if mode == 'batched' else None
+        return quietly(create_scheduled_events, fake.calendar, CALENDAR_ID, bodies, csv_path, batch_size=batch_size)
+    assert len(benchmark.pedantic(run, setup=setup, rounds=3)) == 100
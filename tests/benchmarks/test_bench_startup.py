@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Generous ceiling for a cold interpreter; --help normally takes ~70 ms.
+MAX_HELP_SECONDS = 0.5
+
+def test_bench_cli_help_startup(benchmark):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT / "src"))
+    timings = []
+
+    def run():
+        # Timed here too: under --benchmark-disable the run happens once and no stats are kept.
+        started = time.perf_counter()
+        subprocess.run([sys.executable, str(REPO_ROOT / "src" / "cli.py"), "sync", "--help"],
+                       capture_output=True, env=env, check=True)
+        timings.append(time.perf_counter() - started)
+
+    benchmark.pedantic(run, rounds=5, warmup_rounds=1)
+    rounds = timings[-5:]  # without the warmup round
+    assert sum(rounds) / len(rounds) < MAX_HELP_SECONDS
+
+def test_bench_sync_module_import(benchmark):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT / "src"))
+    run = lambda: subprocess.run([sys.executable, "-c", "import sync_scheduler"], capture_output=True, env=env,
+                                 check=True)
+    benchmark.pedantic(run, rounds=5, warmup_rounds=1)
@@ -0,0 +1,26 @@
+import pytest
+from src.time_headers import _parse_header, parse_time_header
+
+pytest.importorskip("pytest_benchmark")
+
+# A realistic signup header row: one column per daily slot.
+HEADERS = [
+    f"{h % 12 or 12}{':30' if half else ''} {'am' if h < 12 else 'pm'} EST | "
+    f"{(h - 1) % 12 or 12} {'am' if h - 1 < 12 else 'pm'} CST | {(h + 5) % 12 or 12} pm GMT"
+    for h in range(6, 22) for half in (0, 1)
+]
+
+def parse_row():
+    return [parse_time_header(header) for header in HEADERS]
+
+def test_bench_parse_header_row_cold(benchmark):
+    def run():
+        _parse_header.cache_clear()
+        return parse_row()
+    slots = benchmark(run)
+    assert all(slots)
+
+def test_bench_parse_header_row_cached(benchmark):
+    parse_row()
+    slots = benchmark(parse_row)
+    assert all(slots)
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+from src.fake_google_api import FakeGoogle, synthetic_program
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+@pytest.fixture
+def repo_root(monkeypatch):
+    """
+    Runs the test from the repository root, where the template and config
+    files are found by their default relative paths.
+    """
+    monkeypatch.chdir(REPO_ROOT)
+    return REPO_ROOT
+
+@pytest.fixture
+def calendar_id():
+    """
+    The calendar the fake-backed tests write to.
+    """
+    return "fake@group.calendar.google.com"
+
+@pytest.fixture
+def program_fake():
+    """
+    A FakeGoogle holding a small signup program: spreadsheet "sid", 6 days
+    of 3 slots shared by 2 teachers.
+    """
+    return FakeGoogle(spreadsheets=synthetic_program(6, "sid", slots_per_day=3, teachers=2))
@@ -0,0 +1,85 @@
+import asyncio
+import datetime
+
+import pytest
+from src.fake_google_api import FakeGoogle, synthetic_program
+from src.async_sync import HttpxTransport, ThreadTransport, insert_idempotent, sync_async
+from src.sync_journal import SyncJournal
+from src.sync_scheduler import SPREADSHEET_ID, CALENDAR_ID
+
+@pytest.fixture
+def fake(repo_root):
+    start = datetime.date.today() + datetime.timedelta(days=1)
+    return FakeGoogle(spreadsheets=synthetic_program(12, SPREADSHEET_ID, slots_per_day=4, teachers=3,
+                                                     start_date=start))
+
+def run(fake, tmp_path, **kwargs):
+    transport = ThreadTransport(fake.sheets, fake.calendar)
+    return asyncio.run(sync_async(transport, csv_path=str(tmp_path / "created.csv"), **kwargs))
+
+def test_dry_run_creates_nothing(fake, tmp_path):
+    assert run(fake, tmp_path, dry_run=True) == []
+    assert fake.events(CALENDAR_ID) == []
+    assert fake.calls["sheets.values.batchGet"] == 1
+    assert fake.calls["calendar.events.list"] == 1
+
+def test_live_run_inserts_and_skips_existing(fake, tmp_path, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    records = run(fake, tmp_path, dry_run=False, concurrency=4, journal=journal)
+    assert len(records) == 12
+    assert len(fake.events(CALENDAR_ID)) == 12
+    assert all(journal.is_confirmed(event["id"]) for event in fake.events(CALENDAR_ID))
+
+    # A second run finds every event on the calendar and sends nothing.
+    inserts = fake.calls["calendar.events.insert"]
+    assert run(fake, tmp_path, dry_run=False) == []
+    assert fake.calls["calendar.events.insert"] == inserts
+
+def test_limit_keeps_test_mode_semantics(fake, tmp_path, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+    run(fake, tmp_path, dry_run=False, limit=2)
+    events = fake.events(CALENDAR_ID)
+    assert len(events) == 2
+    assert all(e["summary"].startswith("TEST: ") and e["attendees"] == [] for e in events)
+
+def test_declined_confirmation_creates_nothing(fake, tmp_path, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt: "n")
+    assert run(fake, tmp_path, dry_run=False) == []
+    assert fake.events(CALENDAR_ID) == []
+
+class Credentials:
+    valid, token = True, "t"
+
+def test_httpx_transport_quotes_ids_and_follows_pages():
+    httpx = pytest.importorskip("httpx")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.method == "POST":
+            return httpx.Response(409, json={"error": {"code": 409, "message": "duplicate"}})
+        if request.url.path.endswith("/events"):
+            if "pageToken" in request.url.params:
+                return httpx.Response(200, json={"items": [{"id": "b"}]})
+            return httpx.Response(200, json={"items": [{"id": "a"}], "nextPageToken": "p2"})
+        return httpx.Response(200, json={"id": "k1", "status": "confirmed"})
+
+    calendar_id = "team/a#contacts@group.v.calendar.google.com"
+    transport = HttpxTransport(Credentials(), transport=httpx.MockTransport(handler))
+
+    async def exercise():
+        try:
+            listed = await transport.list_events(calendar_id, "2026-01-01T00:00:00Z", "2026-02-01T00:00:00Z")
+            existing = await insert_idempotent(transport, calendar_id, {"id": "k1", "summary": "Session"})
+            return listed, existing
+        finally:
+            await transport.aclose()
+
+    listed, existing = asyncio.run(exercise())
+    assert [e["id"] for e in listed] == ["a", "b"] and existing["id"] == "k1"
+    assert requests[0].url.params["fields"] == "nextPageToken,items(id,status)"
+    assert requests[0].headers["Authorization"] == "Bearer t"
+    quoted = b"/calendar/v3/calendars/team%2Fa%23contacts%40group.v.calendar.google.com/events"
+    assert all(r.url.raw_path.startswith(quoted) for r in requests)
+    assert requests[-1].url.raw_path == quoted + b"/k1"
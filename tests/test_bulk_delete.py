@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from src.fake_google_api import FakeGoogle
+from src.bulk_delete import bulk_delete, delete_events, find_events, selection_properties
+from src.sync_journal import CONFIRMED, DELETED, SyncJournal, stamp_tags
+
+CAL = "fake@group.calendar.google.com"
+
+def event(i, **tags):
+    body = {"summary": f"{'TEST: ' if tags.get('test') else ''}Session {i}",
+            "start": {"dateTime": f"2026-01-{1 + i // 20:02d}T07:00:00-05:00"},
+            "end": {"dateTime": f"2026-01-{1 + i // 20:02d}T07:45:00-05:00"}}
+    return stamp_tags(body, **tags) if tags else body
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return FakeGoogle(calendars={CAL: [event(i, run_id="run-1", program="sid", test=True) for i in range(120)]
+                                      + [event(i, run_id="run-2", program="sid", teacher="Ann Lee") for i in range(30)]
+                                      + [event(i) for i in range(5)]})
+
+def test_dry_run_only_counts_matches(fake):
+    matched = bulk_delete(fake.calendar, CAL, selection_properties(run_id="run-1"))
+    assert len(matched) == 120
+    assert fake.calls["calendar.events.delete"] == 0
+    assert len(find_events(fake.calendar, CAL, selection_properties(program="sid", teacher="Ann Lee"))) == 30
+    assert len(find_events(fake.calendar, CAL, summary_prefix="TEST:")) == 120
+    assert len(find_events(fake.calendar, CAL, time_max="2026-01-02T00:00:00Z")) == 45
+    with pytest.raises(ValueError):
+        find_events(fake.calendar, CAL)
+
+def test_test_events_are_deleted_in_retried_batches(fake):
+    ids = bulk_delete(fake.calendar, CAL, selection_properties(test=True))
+    fake.fail_next(3, status=503)
+    deleted, failures = delete_events(fake.calendar, CAL, ids)
+    assert sorted(deleted) == sorted(ids) and len(ids) == 120 and not failures
+    assert fake.calls["batch"] == 4  # three batches of 50, 50 and 20, plus one retry
+    assert len(fake.events(CAL)) == 35
+    assert all(not e["summary"].startswith("TEST:") for e in fake.events(CAL))
+
+def test_already_deleted_events_count_as_deleted(fake):
+    ids = [e["id"] for e in find_events(fake.calendar, CAL, selection_properties(run_id="run-2"))]
+    fake.calendar.delete(calendarId=CAL, eventId=ids[0]).execute()
+    deleted, failures = delete_events(fake.calendar, CAL, ids + ["never-existed"])
+    assert len(deleted) == 31 and not failures
+
+def test_deletions_are_journaled(fake, tmp_path):
+    journal = SyncJournal(str(tmp_path / "journal.jsonl"))
+    ids = [e["id"] for e in find_events(fake.calendar, CAL, selection_properties(run_id="run-2"))]
+    for event_id in ids:
+        journal.record(event_id, CONFIRMED, body={"id": event_id})
+    bulk_delete(fake.calendar, CAL, selection_properties(run_id="run-2"), dry_run=False, assume_yes=True,
+                journal=journal)
+    assert {entry["state"] for entry in SyncJournal(journal.path).entries.values()} == {DELETED}
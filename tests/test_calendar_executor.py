@@ -0,0 +1,51 @@
+import pytest
+from src.fake_google_api import FakeGoogle
+from src.calendar_executor import CalendarExecutor, TokenBucket, executor_for_service, insert_event
+
+def body(n):
+    return {"summary": f"Session {n}", "start": {"dateTime": "2026-01-05T07:00:00-05:00"},
+            "end": {"dateTime": "2026-01-05T07:10:00-05:00"}}
+
+@pytest.fixture(autouse=True)
+def no_backoff_wait(monkeypatch):
+    monkeypatch.setattr("backoff.full_jitter", lambda value: 0)
+
+def test_token_bucket_halves_on_throttle_and_recovers():
+    bucket = TokenBucket(rate=8, min_rate=1)
+    bucket.throttle()
+    assert bucket.rate == 4 and bucket.tokens <= 0
+    for _ in range(3):
+        bucket.throttle()
+    assert bucket.rate == 1  # floored at min_rate
+    bucket.recover()
+    assert bucket.rate == 1.4
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 8
+
+def test_throttled_calls_are_retried_at_a_lower_rate(calendar_id):
+    fake = FakeGoogle()
+    limiter = TokenBucket(rate=1000)
+    executor = executor_for_service(fake.calendar, workers=1, limiter=limiter)
+    fake.fail_next(2, status=429)
+
+    [(item, result, error)] = executor.run(insert_event, [(calendar_id, body(1))])
+    assert error is None and result["summary"] == "Session 1"
+    assert fake.calls["calendar.events.insert"] == 3
+    assert limiter.rate == 250 + 1000 / 20  # halved twice, then one step back up
+    assert len(fake.events(calendar_id)) == 1
+
+def test_only_retryable_errors_are_retried(calendar_id):
+    fake = FakeGoogle()
+    limiter = TokenBucket(rate=1000)
+    executor = CalendarExecutor(lambda: fake.calendar, workers=1, limiter=limiter, max_tries=2)
+
+    fake.fail_next(1, status=400)
+    [(_, _, error)] = executor.run(insert_event, [(calendar_id, body(1))])
+    assert error.resp.status == 400 and fake.calls["calendar.events.insert"] == 1
+
+    fake.fail_next(2, status=503)  # server errors retry without throttling, up to max_tries
+    [(_, _, error)] = executor.run(insert_event, [(calendar_id, body(2))])
+    assert error.resp.status == 503 and fake.calls["calendar.events.insert"] == 3
+    assert limiter.rate == 1000
+    assert fake.events(calendar_id) == []
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.cli import DEFAULT, build_parser
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ["pandas", "numpy", "googleapiclient.discovery", "google_auth_oauthlib", "jsonc_parser",
+                 "sync_scheduler"]
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT / "src"))
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+def test_help_does_not_import_heavy_dependencies():
+    out = run_python(
+        "import sys, cli\n"
+        "for argv in (['--help'], ['sync', '--help'], ['export', '--help']):\n"
+        "    try:\n"
+        "        cli.main(argv)\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules], file=sys.stderr)")
+    assert out.stderr.strip() == "[]"
+
+def test_sync_arguments():
+    args = build_parser().parse_args(["sync", "--run", "--workers", "--limit", "3"])
+    assert args.run and args.workers is DEFAULT and args.limit == 3 and args.batch_size is None
+    assert build_parser().parse_args(["delete", "--workers", "4"]).workers == 4
+    with pytest.raises(SystemExit):
+        build_parser().parse_args([])
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["sync", "--batch-size", "--workers"])
+
+def test_services_use_bundled_discovery_documents(monkeypatch):
+    import googleapiclient.discovery
+    from src.utils_calendar_general import build_service
+
+    calls = []
+    monkeypatch.setattr(googleapiclient.discovery, "build", lambda *a, **kw: calls.append((a, kw)))
+    build_service("calendar", "v3", credentials=None)
+    assert calls == [(("calendar", "v3"), {"static_discovery": True, "cache_discovery": False, "credentials": None})]
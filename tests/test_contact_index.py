@@ -0,0 +1,47 @@
+from src.contact_index import ContactIndex, normalize_name
+from src.sheets_ingest import build_teacher_map
+from src.signup_grid import signup_events, unmatched_report
+
+CONTACTS = [["First Name", "Last Name", "Email Address", "Aliases"],
+            ["Stephen", "Holsenbeck", "stephen@example.com", "Steve Holsenbeck; Steve H"],
+            ["José", "Álvarez", "jose@example.com"],
+            ["Ann", "Lee", "ann@example.com", "Annie, A Lee"],
+            ["Anne", "Leigh", "anne@example.com", "A Lee, Ann Lee"]]
+
+def grid(*names):
+    rows = [["Instructions"], ["Sign up below"], ["", "Date", "7:00 am EST | 6:00 am CST"]]
+    rows += [["", f"Monday, 2026-01-{5 + i:02d}", name] for i, name in enumerate(names)]
+    return rows
+
+def test_names_normalize_case_accents_and_whitespace():
+    assert normalize_name("  JOSÉ   álvarez ") == normalize_name("Jose Alvarez") == "jose alvarez"
+    assert normalize_name("Ｓｔｅｐｈｅｎ") == "stephen"
+
+def test_lookup_resolves_variants_and_aliases_but_not_shared_aliases():
+    index = ContactIndex(build_teacher_map(CONTACTS))
+    assert index.get("ann  LEE").name == "Ann Lee"  # a full name beats another teacher's alias
+    assert index.get("jose alvarez").name == "José Álvarez"
+    assert index.get("Steve H").name == "Stephen Holsenbeck"
+    assert index.get("A Lee") is None and index.suggest("a lee")[:2] == [("Ann Lee", 1.0), ("Anne Leigh", 1.0)]
+    assert index.get("Nobody") is None
+
+def test_misspellings_get_ranked_suggestions():
+    teacher_map = build_teacher_map(CONTACTS[:1] + [["Teacher", f"Number{i}", f"t{i}@example.com"]
+                                                    for i in range(3000)] + CONTACTS[1:])
+    index = ContactIndex(teacher_map)
+    assert index.suggest("Stephan Holsenbek")[0][0] == "Stephen Holsenbeck"
+    assert index.suggest("Teacher Number1234")[0] == ("Teacher Number1234", 1.0)
+    assert index.suggest("Zzyzx Qwerty") == []
+
+def test_signup_events_resolve_in_one_pass_and_report_the_rest():
+    index = ContactIndex(build_teacher_map(CONTACTS))
+    pending, unmatched = signup_events(index, grid("ann lee", "Annie", "Stephan Holsenbek", "Stephan Holsenbek"))
+    assert [(event.teacher, event.summary) for event in pending] == \
+        [("Ann Lee", "10-Minute Guided Session: Ann Lee")] * 2
+    assert pending[0].key != pending[1].key
+    assert unmatched == {"Stephan Holsenbek": ["R6C3", "R7C3"]}
+    assert unmatched_report(unmatched, index) == [
+        "Error: No email found for 'Stephan Holsenbek' at R6C3, R7C3 (did you mean 'Stephen Holsenbeck'?)"]
+
+    pending, unmatched = signup_events(index, grid("Steve Holsenbeck", "ann lee"), test_teacher="Stephen Holsenbeck")
+    assert [event.teacher for event in pending] == ["Stephen Holsenbeck"] and not unmatched
@@ -0,0 +1,98 @@
+import datetime
+import json
+import sys
+
+import pytest
+from src.fake_google_api import FakeGoogle, http_error
+from src.utils_calendar_general import iter_jsonc_array, load_jsonc
+import src.event_importer as event_importer
+from src.event_importer import validate_event_body, import_events
+
+YSC = "calendars/ysc/ysc_cal.jsonc"
+CAL = "fake@group.calendar.google.com"
+
+def event(summary="Class", start="2026-03-01T16:00:00", end="2026-03-01T17:00:00", **extra):
+    body = {"summary": summary, "start": {"dateTime": start, "timeZone": "America/New_York"},
+            "end": {"dateTime": end, "timeZone": "America/New_York"}}
+    body.update(extra)
+    return body
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_streaming_matches_load_jsonc(monkeypatch, tmp_path, use_ijson):
+    if use_ijson:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setitem(sys.modules, "ijson", None)
+    assert list(iter_jsonc_array(YSC, chunk_size=5)) == load_jsonc(YSC)
+
+    tricky = tmp_path / "tricky.jsonc"
+    tricky.write_text('/* header */ [ {"url": "https://x.y/*z*/", // note\n "n": 1,}, // trailing\n ]')
+    assert list(iter_jsonc_array(str(tricky), chunk_size=3)) == [{"url": "https://x.y/*z*/", "n": 1}]
+
+def test_validate_event_body():
+    assert validate_event_body(event()) == []
+    assert validate_event_body(event(start="2026-03-01T18:00:00")) == ["'end' is before 'start'"]
+    errors = validate_event_body({"summary": "x", "start": {"dateTime": "2026-03-01T16:00:00"},
+                                  "end": {"date": "2026-03-01"}, "colour": 1, "id": "UPPER",
+                                  "attendees": [{"name": "no email"}],
+                                  "reminders": {"overrides": [{"method": "sms", "minutes": 10}]}})
+    assert len(errors) == 5
+
+def test_import_dedupes_and_batches(tmp_path, monkeypatch):
+    fake = FakeGoogle(calendars={CAL: [
+        # Created by the notebook before sync keys: matched on summary + start.
+        dict(load_jsonc(YSC)[0], start={"dateTime": "2026-01-11T16:00:00-05:00"}),
+    ]})
+    csv_path = str(tmp_path / "created.csv")
+
+    assert import_events(YSC, fake.calendar, CAL, dry_run=True, csv_path=csv_path) == []
+    records = import_events(YSC, fake.calendar, CAL, dry_run=False, assume_yes=True, csv_path=csv_path)
+    assert len(records) == len(load_jsonc(YSC)) - 1
+    assert fake.calls["batch"] == 1
+    assert fake.calls["calendar.events.list"] == 2  # one listing per run
+
+    # Re-importing the same file finds everything on the calendar.
+    assert import_events(YSC, fake.calendar, CAL, dry_run=False, assume_yes=True, csv_path=csv_path) == []
+    assert fake.calls["batch"] == 1
+
+def test_invalid_file_is_rejected_before_any_api_call(tmp_path):
+    path = tmp_path / "events.json"
+    path.write_text(json.dumps([event("Ok"), event("Bad", start="not a time"), event("Ok")]))
+    fake = FakeGoogle()
+    assert import_events(str(path), fake.calendar, CAL, dry_run=False, assume_yes=True,
+                         csv_path=str(tmp_path / "c.csv")) == []
+    assert sum(fake.calls.values()) == 0
+
+    # --skip-invalid imports the valid entries; the in-file duplicate is dropped.
+    records = import_events(str(path), fake.calendar, CAL, dry_run=False, assume_yes=True, skip_invalid=True,
+                            csv_path=str(tmp_path / "c.csv"))
+    assert len(records) == 1
+
+def test_large_batches_report_progress_and_survive_a_failed_restore(tmp_path, monkeypatch, capsys):
+    day = datetime.date(2026, 3, 1)
+    bodies = [event(f"Class {i}", start=f"{day + datetime.timedelta(days=i)}T16:00:00",
+                    end=f"{day + datetime.timedelta(days=i)}T17:00:00") for i in range(120)]
+    path = tmp_path / "events.json"
+    path.write_text(json.dumps(bodies))
+
+    # Two of the IDs already exist outside the listed window, so their inserts conflict (409).
+    first = FakeGoogle()
+    import_events(str(path), first.calendar, CAL, dry_run=False, assume_yes=True, csv_path=str(tmp_path / "a.csv"))
+    moved = [dict(e, start={"dateTime": "2025-01-05T16:00:00-05:00"}, end={"dateTime": "2025-01-05T17:00:00-05:00"})
+             for e in first.events(CAL)[:2]]
+    fake = FakeGoogle(calendars={CAL: moved})
+
+    restore = event_importer.insert_event_idempotent
+    def flaky_restore(service, calendar_id, body):
+        if body["id"] == moved[0]["id"]:
+            raise http_error(500, "backendError")
+        return restore(service, calendar_id, body)
+    monkeypatch.setattr(event_importer, "insert_event_idempotent", flaky_restore)
+    capsys.readouterr()
+
+    records = import_events(str(path), fake.calendar, CAL, dry_run=False, assume_yes=True, batch_size=100,
+                            csv_path=str(tmp_path / "b.csv"))
+    assert len(records) == 119
+    progress = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Progress")]
+    assert progress[-1] == "Progress: 120/120 (100%), 119 created, 1 failed."
+    assert len(progress) == 3  # 100-event chunks go out as batches of 50
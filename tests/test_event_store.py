@@ -0,0 +1,35 @@
+from src.event_store import EventStore
+
+def test_upsert_find_and_tombstone(tmp_path):
+    store = EventStore(str(tmp_path / "events.db"))
+    store.upsert_events([
+        {"Summary": "10-Minute Guided Session: Ann Lee", "ID": "a1", "Begin": "2026-01-01T07:00:00-05:00"},
+        {"Summary": "10-Minute Guided Session: Bo Kim", "ID": "b1", "Begin": "2026-01-01T07:10:00"},
+    ])
+
+    # Naive and offset-aware starts resolve to the same instant.
+    assert store.find("10-Minute Guided Session: Ann Lee", "2026-01-01T07:00:00") == "a1"
+    assert store.find("10-Minute Guided Session: Bo Kim", "2026-01-01T12:10:00Z") == "b1"
+    assert [r.id for r in store.events_for_teacher("Ann Lee")] == ["a1"]
+
+    store.mark_deleted(["a1"])
+    assert store.find("10-Minute Guided Session: Ann Lee", "2026-01-01T07:00:00") is None
+    assert store.active_ids() == ["b1"]
+    assert len(store.to_dataframe(include_deleted=True)) == 2
+
+    # Re-creating a tombstoned event revives it.
+    store.upsert_events([{"Summary": "10-Minute Guided Session: Ann Lee", "ID": "a1",
+                          "Begin": "2026-01-01T07:00:00-05:00"}])
+    assert sorted(store.active_ids()) == ["a1", "b1"]
+
+def test_csv_round_trip(tmp_path):
+    csv_path = tmp_path / "created_events.csv"
+    csv_path.write_text("Summary,ID,Begin\nA: Ann,a1,2026-01-01T07:00:00-05:00\nB: Bo,b1,2026-01-02\n")
+
+    store = EventStore(str(tmp_path / "events.db"))
+    assert store.import_csv(str(csv_path)) == 2
+
+    store.replace_all([{"Summary": "B: Bo", "ID": "b1", "Begin": "2026-01-02"}])
+    out_path = tmp_path / "export.csv"
+    assert store.export_csv(str(out_path)) == 1
+    assert out_path.read_text().splitlines() == ["Summary,ID,Begin", "B: Bo,b1,2026-01-02"]
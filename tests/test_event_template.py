@@ -0,0 +1,57 @@
+import json
+import pytest
+from jsonc_parser.parser import JsoncParser
+from src.event_template import EventTemplate, TemplateError
+
+TEMPLATE_FILE = '_calendar_event_template.jsonc'
+
+VARS = {
+    "date": "2026-01-05",
+    "day_of_week": "Monday",
+    "time_iso": "07:00",
+    "end_time_iso": "07:45",
+    "duration": 45,
+    "First Name": "Ann",
+    "Last Name": "O'Lee \"AJ\"",
+    "Pronouns": "she/her",
+    "Email Address": "ann@example.com",
+    "Bio": "Line one\nLine two {not a var}",
+}
+
+def render_by_text_replace(template_text, variables):
+    """The original approach: substitute into the raw text, then parse JSONC."""
+    for key, val in variables.items():
+        template_text = template_text.replace(f"{{{key}}}", json.dumps(str(val))[1:-1])
+    return JsoncParser.parse_str(template_text)
+
+def test_render_matches_text_substitution():
+    with open(TEMPLATE_FILE) as f:
+        template_text = f.read()
+    template = EventTemplate.from_text(template_text)
+
+    assert template.render(VARS) == render_by_text_replace(template_text, VARS)
+    assert {"date", "time_iso", "First Name", "Email Address"} <= template.placeholders
+
+def test_render_returns_independent_bodies():
+    template = EventTemplate.from_file(TEMPLATE_FILE)
+    first = template.render(VARS)
+    first['attendees'].clear()
+    first['reminders']['overrides'][0]['minutes'] = 99
+
+    second = template.render(VARS)
+    assert second['attendees'][0]['email'] == "ann@example.com"
+    assert second['reminders']['overrides'][0]['minutes'] == 10
+
+def test_unknown_placeholders_are_left_untouched():
+    template = EventTemplate.from_text('{"summary": "{First Name} / {Missing}"}')
+    assert template.render({"First Name": "Ann"}) == {"summary": "Ann / {Missing}"}
+
+@pytest.mark.parametrize("text", [
+    '{"summary": "{First Name"}',
+    '{"summary": "First Name}"}',
+    '{"summary": "{}"}',
+    '{"start": {"dateTime": "{date}T{time_iso:00"}}',
+])
+def test_malformed_placeholders_fail_at_load(text):
+    with pytest.raises(TemplateError):
+        EventTemplate.from_text(text)
@@ -0,0 +1,96 @@
+import csv
+import datetime
+
+import pytest
+from src.fake_google_api import FakeGoogle
+from src.exporters import export_events, export_format, ics_fold, write_ics
+from src.utils_calendar_general import iter_calendar_events, write_events_to_csv
+
+CAL = "fake@group.calendar.google.com"
+
+def event(i):
+    day = datetime.date(2026, 1, 1) + datetime.timedelta(days=i // 10)
+    return {"summary": f"45-Minute Guided Session: Teacher {i}",
+            "start": {"dateTime": f"{day}T07:00:00-05:00"}, "end": {"dateTime": f"{day}T07:45:00-05:00"}}
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+def test_csv_export_streams_a_generator_in_chunks(tmp_path):
+    fake = FakeGoogle(calendars={CAL: [event(i) for i in range(250)]}, max_page_size=100)
+    events = iter_calendar_events(fake.calendar, CAL, "2026-01-01T00:00:00Z", "2026-02-01T00:00:00Z")
+    assert export_events(events, str(tmp_path / "out" / "events.csv"), chunk_size=64) == 250
+
+    rows = read_csv(tmp_path / "out" / "events.csv")
+    assert len(rows) == 250
+    assert rows[0] == {"Summary": "45-Minute Guided Session: Teacher 0", "Begin (Datetime)": "2026-01-01T07:00:00-05:00",
+                       "Teacher": "Teacher 0", "Date": "2026-01-01", "Day": "Thursday", "Start": "07:00"}
+
+    write_events_to_csv(iter([event(1), {"summary": "No start"}]), str(tmp_path / "legacy.csv"))
+    assert [row["Teacher"] for row in read_csv(tmp_path / "legacy.csv")] == ["Teacher 1"]
+
+def test_ics_export_is_rfc5545(tmp_path):
+    recurring = {"id": "abc", "summary": "Session: Ann; Lee, Jr.", "description": "Line one\nLine two " + "é" * 60,
+                 "start": {"dateTime": "2026-01-05T07:00:00", "timeZone": "America/New_York"},
+                 "end": {"dateTime": "2026-01-05T07:45:00", "timeZone": "America/New_York"},
+                 "recurrence": ["RRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=3",
+                                "EXDATE;TZID=America/New_York:20260112T070000"]}
+    all_day = {"id": "day", "summary": "Retreat", "start": {"date": "2026-02-01"}, "end": {"date": "2026-02-02"}}
+    cancelled = dict(event(0), id="gone", status="cancelled")
+    path = str(tmp_path / "feed.ics")
+    assert write_ics(iter([recurring, all_day, cancelled]), path, calendar_name="Guided Sessions") == 2
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    assert raw.startswith(b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\n") and raw.endswith(b"END:VCALENDAR\r\n")
+    assert all(len(line) <= 75 for line in raw.split(b"\r\n"))
+    text = raw.decode("utf-8").replace("\r\n ", "")  # unfold
+    assert "UID:abc@google.com\r\n" in text and "X-WR-CALNAME:Guided Sessions\r\n" in text
+    assert ("DTSTART;TZID=America/New_York:20260105T070000\r\n"
+            "DTEND;TZID=America/New_York:20260105T074500\r\n") in text
+    assert "RRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=3\r\nEXDATE;TZID=America/New_York:20260112T070000\r\n" in text
+    assert text.count("BEGIN:VTIMEZONE\r\nTZID:America/New_York\r\n") == 1
+    assert "SUMMARY:Session: Ann\\; Lee\\, Jr.\r\n" in text
+    assert "DESCRIPTION:Line one\\nLine two " + "é" * 60 + "\r\n" in text
+    assert "DTSTART;VALUE=DATE:20260201\r\n" in text and "gone" not in text
+
+def test_recurring_events_keep_their_local_time_across_dst(tmp_path):
+    daily = {"id": "daily", "summary": "Morning", "recurrence": ["RRULE:FREQ=DAILY;COUNT=10", "EXDATE:20261102T120000Z"],
+             "start": {"dateTime": "2026-10-28T07:00:00-04:00", "timeZone": "America/New_York"},
+             "end": {"dateTime": "2026-10-28T07:45:00-04:00", "timeZone": "America/New_York"}}
+    evening = {"id": "evening", "summary": "Evening", "recurrence": ["RRULE:FREQ=WEEKLY;BYDAY=MO,WE;COUNT=6"],
+               "start": {"dateTime": "2026-10-26T20:30:00-04:00", "timeZone": "America/New_York"},
+               "end": {"dateTime": "2026-10-26T21:15:00-04:00", "timeZone": "America/New_York"}}
+    single = dict(event(0), id="single")
+    path = str(tmp_path / "feed.ics")
+    assert write_ics(iter([daily, evening, single]), path) == 3
+
+    with open(path, encoding="utf-8", newline="") as f:
+        text = f.read().replace("\r\n ", "")
+    assert "DTSTART;TZID=America/New_York:20261028T070000\r\n" in text
+    assert "EXDATE;TZID=America/New_York:20261102T070000\r\n" in text  # 07:00 EST, after the change
+    assert "DTSTART;TZID=America/New_York:20261026T203000\r\n" in text  # still a Monday
+    assert "DTSTART:20260101T120000Z\r\n" in text  # single instants stay in UTC
+    assert ("BEGIN:STANDARD\r\nDTSTART:20261101T020000\r\nTZOFFSETFROM:-0400\r\nTZOFFSETTO:-0500\r\n"
+            "TZNAME:EST\r\nEND:STANDARD\r\n") in text
+    assert text.index("END:VTIMEZONE") < text.index("END:VCALENDAR")
+
+def test_fold_keeps_multibyte_characters_whole():
+    folded = ics_fold("SUMMARY:" + "é" * 50).encode("utf-8")
+    assert folded.decode("utf-8")  # no character was split across lines
+    assert [len(line) for line in folded.split(b"\r\n")][:2] == [74, 35]
+
+def test_parquet_export_has_typed_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "events.parquet")
+    assert export_events((event(i) for i in range(25)), path, chunk_size=10) == 25
+    table = pq.read_table(path)
+    assert table.num_rows == 25 and pq.ParquetFile(path).num_row_groups == 3
+    assert str(table.schema.field("Begin (Datetime)").type) == "timestamp[us, tz=America/New_York]"
+    assert table.column("Date")[0].as_py() == datetime.date(2026, 1, 1)
+
+def test_format_comes_from_the_extension():
+    assert export_format("logs/feed.ICS") == "ics"
+    with pytest.raises(ValueError):
+        export_format("logs/events.txt")
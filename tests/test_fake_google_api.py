@@ -0,0 +1,83 @@
+import pytest
+from googleapiclient.errors import HttpError
+from src.fake_google_api import FakeGoogle, synthetic_program
+from src.utils_calendar_general import (
+    get_google_services,
+    iter_calendar_events,
+    insert_event_idempotent,
+    iter_batched_inserts,
+    is_rate_limit_error
+)
+from src.sheets_ingest import fetch_signup_data
+
+CAL = "fake@group.calendar.google.com"
+
+def event(i, **extra):
+    day = 1 + i // 10
+    body = {"summary": f"Session {i}",
+            "start": {"dateTime": f"2026-01-{day:02d}T07:{i % 10:02d}:00-05:00"},
+            "end": {"dateTime": f"2026-01-{day:02d}T07:{i % 10:02d}:30-05:00"}}
+    body.update(extra)
+    return body
+
+def test_get_google_services_returns_fake():
+    fake = FakeGoogle()
+    sheets, calendar = get_google_services("unused", "unused", [], fake=fake)
+    # Wrapped for the run report; requests still reach the fakes.
+    assert sheets._target is fake.sheets and calendar._target is fake.calendar
+
+def test_sheet_values_are_trimmed_like_the_api():
+    fake = FakeGoogle(spreadsheets=synthetic_program(25, "sid", slots_per_day=10, teachers=3))
+    teacher_map, rows = fetch_signup_data(fake.sheets, "sid", "Signup", "Teacher Contact")
+    assert len(teacher_map) == 3
+    assert rows[-1][-1] != ""  # the last day's empty slots are trimmed
+    assert sum(1 for row in rows[3:] for cell in row[2:] if cell) == 25
+    assert fake.calls["sheets.values.batchGet"] == 1
+
+def test_list_paginates_and_filters_window():
+    fake = FakeGoogle(calendars={CAL: [event(i) for i in range(30)]}, max_page_size=7)
+    events = list(iter_calendar_events(fake.calendar, CAL, "2026-01-01T00:00:00Z", "2026-01-03T00:00:00Z"))
+    assert [e["summary"] for e in events] == [f"Session {i}" for i in range(20)]
+    assert fake.calls["calendar.events.list"] == 3
+
+def test_sync_token_returns_changes_including_deletions():
+    fake = FakeGoogle(calendars={CAL: [event(i) for i in range(3)]})
+    state = {}
+    list(iter_calendar_events(fake.calendar, CAL, sync_state=state))
+    first = fake.events(CAL)[0]["id"]
+    fake.calendar.delete(calendarId=CAL, eventId=first).execute()
+    fake.calendar.insert(calendarId=CAL, body=event(5)).execute()
+
+    changes = list(iter_calendar_events(fake.calendar, CAL, sync_token=state["nextSyncToken"], sync_state=state))
+    assert {(e["summary"], e["status"]) for e in changes} == {("Session 0", "cancelled"), ("Session 5", "confirmed")}
+
+    fake.invalidate_sync_tokens()
+    with pytest.raises(HttpError) as error:
+        list(iter_calendar_events(fake.calendar, CAL, sync_token=state["nextSyncToken"]))
+    assert error.value.resp.status == 410
+
+def test_duplicate_id_conflicts_and_idempotent_insert_recovers():
+    fake = FakeGoogle()
+    body = event(0, id="abc123")
+    fake.calendar.insert(calendarId=CAL, body=body).execute()
+    with pytest.raises(HttpError) as error:
+        fake.calendar.insert(calendarId=CAL, body=body).execute()
+    assert error.value.resp.status == 409
+    assert insert_event_idempotent(fake.calendar, CAL, body)["id"] == "abc123"
+    assert len(fake.events(CAL)) == 1
+
+@pytest.mark.parametrize("status", [403, 429])
+def test_injected_quota_errors_are_rate_limit_errors(status):
+    fake = FakeGoogle()
+    fake.fail_next(1, status=status)
+    with pytest.raises(HttpError) as error:
+        fake.calendar.insert(calendarId=CAL, body=event(0)).execute()
+    assert is_rate_limit_error(error.value)
+
+def test_batch_sub_request_errors_are_retried():
+    fake = FakeGoogle()
+    fake.fail_next(2)
+    created, failed = next(iter_batched_inserts(fake.calendar, CAL, [event(i) for i in range(5)], batch_size=5))
+    assert len(created) == 5 and not failed
+    assert fake.calls["batch"] == 2
+    assert len(fake.events(CAL)) == 5
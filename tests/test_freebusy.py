@@ -0,0 +1,107 @@
+import json
+import time
+import random
+import datetime
+
+import pytest
+from src.fake_google_api import FakeGoogle
+from src.freebusy import CONFLICTS_COLUMN, BusyIndex, find_conflicts, preflight, query_busy
+from src.records import CreatedEvent
+from src.recurrence import compact_events
+from src.sync_journal import event_key, stamp_event_key
+from src.sync_scheduler import SCOPES, FREEBUSY_SCOPE
+from src.utils_calendar_general import get_credentials
+
+CAL = "fake@group.calendar.google.com"
+UTC = datetime.timezone.utc
+
+def busy(start, end, **extra):
+    return dict({"summary": "Busy", "start": {"dateTime": start}, "end": {"dateTime": end}}, **extra)
+
+def planned(date, email="ann@example.com", start="07:00", end="07:45"):
+    body = {"summary": f"Session {start}",
+            "start": {"dateTime": f"{date}T{start}:00", "timeZone": "America/New_York"},
+            "end": {"dateTime": f"{date}T{end}:00", "timeZone": "America/New_York"},
+            "attendees": [{"email": email}] if email else []}
+    return stamp_event_key(body, event_key(email or "", date, start))
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return FakeGoogle(calendars={
+        CAL: [busy("2026-01-06T07:30:00-05:00", "2026-01-06T08:30:00-05:00")],
+        "ann@example.com": [busy("2026-01-05T06:30:00-05:00", "2026-01-05T07:15:00-05:00"),
+                            busy("2026-01-05T07:10:00-05:00", "2026-01-05T07:20:00-05:00"),
+                            busy("2026-01-07T07:00:00-05:00", "2026-01-07T08:00:00-05:00", transparency="transparent"),
+                            busy("2026-01-12T07:45:00-05:00", "2026-01-12T08:00:00-05:00")],
+        "bo@example.com": []})
+
+def test_busy_index_matches_a_linear_scan():
+    rng = random.Random(7)
+    base = datetime.datetime(2026, 1, 1, tzinfo=UTC)
+    blocks = []
+    for _ in range(300):
+        start = base + datetime.timedelta(minutes=rng.randrange(0, 60 * 24 * 30, 5))
+        blocks.append((start, start + datetime.timedelta(minutes=rng.choice([15, 30, 60, 240]))))
+    index = BusyIndex()
+    index.add("cal", blocks)
+    for _ in range(200):
+        start = base + datetime.timedelta(minutes=rng.randrange(0, 60 * 24 * 30, 5))
+        end = start + datetime.timedelta(minutes=45)
+        found = index.conflicts("cal", start, end)
+        assert bool(found) == any(s < end and e > start for s, e in blocks)
+        assert all(s < end and e > start for s, e in found)
+    assert index.conflicts("other", base, base + datetime.timedelta(days=1)) == []
+
+def test_conflicts_cover_the_calendar_attendees_and_recurring_events(fake):
+    events = [planned("2026-01-05"), planned("2026-01-06", "bo@example.com"), planned("2026-01-07"),
+              planned("2026-01-08", "nobody@example.com")]
+    series, _ = compact_events([planned(f"2026-01-{day:02d}") for day in (5, 12, 19)])
+    conflicts, errors = find_conflicts(fake.calendar, events + series, CAL)
+    assert conflicts == [["ann@example.com busy 2026-01-05 06:30-07:20"],
+                         ["calendar busy 2026-01-06 07:30-08:30"],
+                         [],  # transparent events do not block time
+                         [],
+                         ["ann@example.com busy 2026-01-05 06:30-07:20"]]  # the 2026-01-12 block starts at 07:45
+    assert errors == {"nobody@example.com": "notFound"}
+    assert fake.calls["calendar.freebusy.query"] == 1
+
+    created = [CreatedEvent.from_api(events[0])]
+    assert find_conflicts(fake.calendar, events[:1], CAL, existing=created) == ([[]], {})
+    assert fake.calls["calendar.freebusy.query"] == 1  # nothing left to check, no query
+
+def test_queries_are_grouped_by_calendar_count_and_window(fake):
+    start = datetime.datetime(2026, 1, 1, tzinfo=UTC)
+    fake.fail_next(1, status=503)
+    index, errors, queries = query_busy(fake.calendar, [CAL] + [f"t{i}@example.com" for i in range(120)],
+                                        start, start + datetime.timedelta(days=90))
+    assert queries == 6  # three groups of calendars, two windows
+    assert len(errors) == 120 and index.conflicts(CAL, start, start + datetime.timedelta(days=30))
+
+def test_preflight_annotates_the_preview_and_never_blocks_the_sync(fake, capsys):
+    events = [planned("2026-01-05"), planned("2026-01-08")]
+    preview = [{"Event Name": event["summary"]} for event in events]
+    preflight(fake.calendar, CAL, events, preview)
+    assert [row[CONFLICTS_COLUMN] for row in preview] == ["ann@example.com busy 2026-01-05 06:30-07:20", ""]
+    assert "1 event(s) conflict" in capsys.readouterr().out
+
+    fake.fail_next(1, status=400)
+    assert preflight(fake.calendar, CAL, events, preview) == [[], []]
+    assert "Free/busy check skipped" in capsys.readouterr().out
+
+def test_only_the_busy_check_asks_for_the_freebusy_scope(tmp_path, monkeypatch):
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    class Consent(Exception):
+        pass
+
+    def consent(cls, path, scopes):
+        raise Consent(scopes)
+    monkeypatch.setattr(InstalledAppFlow, "from_client_secrets_file", classmethod(consent))
+    token = tmp_path / "token.json"
+    token.write_text(json.dumps({"token": "t", "refresh_token": "r", "client_id": "c", "client_secret": "s",
+                                 "expiry": "2099-01-01T00:00:00Z", "scopes": SCOPES}))
+
+    assert get_credentials(str(token), "unused.json", SCOPES).token == "t"  # existing tokens keep working
+    with pytest.raises(Consent):
+        get_credentials(str(token), "unused.json", SCOPES + [FREEBUSY_SCOPE])
@@ -0,0 +1,63 @@
+import json
+import shutil
+import time
+from pathlib import Path
+
+from src.cli import main
+from src.instrumentation import RunRecorder, InstrumentedService, percentile, prometheus_text
+from src.fake_google_api import FakeGoogle, synthetic_program
+from src.sync_scheduler import SPREADSHEET_ID
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert [percentile(values, p) for p in (50, 90, 99)] == [50, 90, 99]
+    assert percentile([7], 99) == 7 and percentile([], 50) is None
+
+def test_instrumented_service_counts_requests_and_errors():
+    fake = FakeGoogle()
+    recorder = RunRecorder()
+    calendar = InstrumentedService(fake.calendar, recorder=recorder)
+    body = {"summary": "x", "start": {"dateTime": "2026-01-01T07:00:00Z"}, "end": {"dateTime": "2026-01-01T08:00:00Z"}}
+    calendar.events().insert(calendarId="c", body=body).execute()
+    fake.fail_next(1, status=429)
+    try:
+        calendar.events().insert(calendarId="c", body=body).execute()
+    except Exception:
+        pass
+    request = calendar.events().list(calendarId="c", maxResults=1)
+    calendar.events().list_next(request, request.execute())
+
+    report = recorder.report()
+    assert report["api"]["events.insert"]["calls"] == 2
+    assert report["api"]["events.insert"]["errors"] == {"429": 1}
+    assert report["api"]["events.list"]["calls"] == 1
+    assert calendar.thread_safe  # plain attributes pass through
+
+    text = prometheus_text(report)
+    assert 'scheduler_api_errors_total{endpoint="events.insert",status="429"} 1' in text
+    assert 'scheduler_api_latency_seconds{endpoint="events.insert",quantile="0.99"}' in text
+
+def test_cli_run_writes_report(tmp_path, monkeypatch):
+    shutil.copy(REPO_ROOT / "_calendar_event_template.jsonc", tmp_path)
+    fixture = tmp_path / "fake.json"
+    fixture.write_text(json.dumps({"spreadsheets": synthetic_program(6, SPREADSHEET_ID, slots_per_day=3, teachers=2),
+                                   "error_rate": 0.3, "seed": 2}))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SCHEDULER_FAKE_GOOGLE", str(fixture))
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+    main(["--report", "report.json", "sync", "--run"])
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert {"auth", "sheet_fetch", "header_parse", "render", "insert"} <= set(report["phases"])
+    assert report["api"]["spreadsheets.values.batchGet"]["calls"] >= 1
+    inserts = report["api"]["events.insert"]
+    assert inserts["calls"] - sum(inserts["errors"].values()) == 6
+    assert inserts["errors"] and report["retries"]["insert_event_idempotent"] == sum(inserts["errors"].values())
+    assert set(inserts["latency_ms"]) == {"p50", "p90", "p99", "max"}
+
+    main(["--report", "report.prom", "--report-format", "prometheus", "sync"])
+    assert "scheduler_phase_seconds{phase=\"render\"}" in (tmp_path / "report.prom").read_text()
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.job_runner import Job, ServicePool, load_jobs, run_jobs
+
+@pytest.fixture
+def jobs(tmp_path, repo_root, calendar_id):
+    events_file = tmp_path / "course.jsonc"
+    events_file.write_text("// course calendar\n" + json.dumps([
+        {"summary": f"Class {i}", "start": {"dateTime": f"2026-03-0{i}T16:00:00", "timeZone": "America/New_York"},
+         "end": {"dateTime": f"2026-03-0{i}T17:00:00", "timeZone": "America/New_York"}} for i in range(1, 4)]))
+    return [
+        Job("signups", calendar_id, spreadsheet_id="sid", log_dir=str(tmp_path / "signups")),
+        Job("course", calendar_id, events_file=str(events_file), log_dir=str(tmp_path / "course")),
+        Job("broken", calendar_id, spreadsheet_id="missing", log_dir=str(tmp_path / "broken")),
+    ]
+
+def test_load_jobs_applies_defaults_and_validates(tmp_path):
+    config = tmp_path / "jobs.jsonc"
+    config.write_text('{"defaults": {"signup_sheet": "Grid"}, // shared\n'
+                      '"jobs": [{"name": "a", "calendar_id": "c", "spreadsheet_id": "s"}]}')
+    (job,) = load_jobs(str(config))
+    assert job.signup_sheet == "Grid" and job.created_events_csv == "logs/a/created_events.csv"
+
+    config.write_text('{"jobs": [{"name": "a", "calendar_id": "c"}]}')
+    with pytest.raises(ValueError, match="exactly one"):
+        load_jobs(str(config))
+
+def test_jobs_run_in_parallel_with_isolated_errors_and_logs(jobs, monkeypatch, capsys, program_fake, calendar_id):
+    fake = program_fake
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+
+    results = run_jobs(jobs, ServicePool(fake=fake), dry_run=False, parallel=3)
+    by_name = {r.job.name: r for r in results}
+    assert by_name["signups"].created == 6 and not by_name["signups"].error
+    assert by_name["course"].created == 3 and not by_name["course"].error
+    assert "HttpError" in by_name["broken"].error
+    assert len(fake.events(calendar_id)) == 9
+
+    console = capsys.readouterr().out
+    assert "Created event" not in console  # per-event output goes to the job logs
+    assert Path(jobs[0].log_file).read_text().count("Created event") == 6
+    assert "Traceback" in Path(jobs[2].log_file).read_text()
+    assert Path(jobs[1].created_events_csv).exists()
+
+def test_dry_run_creates_nothing(jobs, program_fake, calendar_id):
+    results = run_jobs(jobs[:2], ServicePool(fake=program_fake), dry_run=True)
+    assert [len(r.events) for r in results] == [6, 3]
+    assert program_fake.events(calendar_id) == []
@@ -0,0 +1,73 @@
+import datetime
+
+import pytest
+from src.fake_google_api import FakeGoogle
+from src.event_store import EventStore
+from src.records import Contact, CreatedEvent, PendingEvent, read_created_events
+from src.overlap_detection import check_overlaps, find_overlaps, find_interval_conflicts, update_created_events_csv
+
+def pending(teacher, begin, duration=10):
+    date, start = begin.split("T")
+    return PendingEvent(f"{duration}-Minute Guided Session: {teacher}", begin, teacher, Contact(teacher, (), ()),
+                        date, "", start[:5], "", duration)
+
+def test_find_overlaps_matches_across_timezone_formats():
+    pending_events = [
+        pending("Ann Lee", "2026-01-01T07:00:00"),
+        pending("Ann Lee", "2026-01-02T07:00:00"),
+        pending("Bo Kim", "2026-01-01T07:00:00"),
+    ]
+    created = [
+        CreatedEvent("10-Minute Guided Session: Ann Lee", "abc", "2026-01-01T07:00:00-05:00"),
+        CreatedEvent("10-Minute Guided Session: Bo Kim", "def", "2026-01-01T12:00:00Z"),
+        CreatedEvent("Other", "ghi", "2026-01-02"),
+    ]
+
+    assert find_overlaps(pending_events, created) == ["abc", None, "def"]
+
+def test_check_overlaps_with_no_created_events():
+    assert check_overlaps([pending("A", "2026-01-01T07:00:00")], []) == [False]
+
+def test_find_interval_conflicts_by_teacher_and_slot():
+    events = [
+        pending("Ann Lee", "2026-01-01T07:00:00", 45),
+        pending("Ann Lee", "2026-01-01T07:30:00", 10),
+        pending("Ann Lee", "2026-01-01T07:45:00", 10),  # touches, no overlap
+        pending("Bo Kim", "2026-01-01T07:05:00", 10),
+    ]
+
+    assert find_interval_conflicts(events, by="teacher") == [(0, 1, "Ann Lee")]
+    assert sorted(find_interval_conflicts(events)) == [(0, 1), (0, 3)]
+
+@pytest.mark.parametrize("use_store", [False, True], ids=["csv", "store"])
+def test_incremental_update_merges_changes_and_recovers_from_expired_tokens(use_store, tmp_path, calendar_id,
+                                                                           capsys):
+    fake = FakeGoogle()
+    events = fake.calendar.events()
+    today = datetime.date.today()  # inside the default listing window
+    ids = [events.insert(calendarId=calendar_id, body={
+        "summary": f"Session {n}", "start": {"dateTime": f"{today}T07:{n:02d}:00-05:00"},
+        "end": {"dateTime": f"{today}T07:{n + 1:02d}:00-05:00"}}).execute()["id"] for n in range(3)]
+    csv_path = str(tmp_path / "created.csv")
+    store = EventStore(str(tmp_path / "events.db")) if use_store else None
+
+    def update():
+        update_created_events_csv(fake.calendar, calendar_id, csv_path, incremental=True, store=store)
+        rows = {record.id: record.summary for record in read_created_events(csv_path)}
+        if store is not None:
+            assert {event.id for event in store.created_events()} == set(rows)
+        return rows
+
+    assert len(update()) == 3
+    events.patch(calendarId=calendar_id, eventId=ids[0], body={"summary": "Renamed"}).execute()
+    events.delete(calendarId=calendar_id, eventId=ids[1]).execute()
+    capsys.readouterr()
+    assert update() == {ids[0]: "Renamed", ids[2]: "Session 2"}
+    assert "Applied 2 changes" in capsys.readouterr().out
+
+    fake.invalidate_sync_tokens()
+    events.delete(calendarId=calendar_id, eventId=ids[2]).execute()
+    assert update() == {ids[0]: "Renamed"}
+    assert "running a full sync" in capsys.readouterr().out
+    assert update() == {ids[0]: "Renamed"}  # the resync saved a fresh token
+    assert "Applied 0 changes" in capsys.readouterr().out
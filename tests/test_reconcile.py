@@ -0,0 +1,46 @@
+from src.reconcile import diff_events, INSERT, PATCH, DELETE, UNCHANGED
+from src.sync_journal import stamp_content_hash, stamp_event_key, stamp_tags
+
+def body(key, summary, start, description="Bio"):
+    event = {"summary": summary, "description": description,
+             "start": {"dateTime": start, "timeZone": "America/New_York"}}
+    return stamp_content_hash(stamp_event_key(event, key))
+
+def as_calendar_event(event):
+    return {"id": event["id"], "summary": event["summary"], "status": "confirmed",
+            "start": {"dateTime": event["start"]["dateTime"] + "-05:00"},
+            "extendedProperties": event["extendedProperties"]}
+
+def test_diff_events_minimal_operations():
+    unchanged = body("k1", "Session: Ann", "2026-01-05T07:00:00")
+    edited_old = body("k2", "Session: Bo", "2026-01-05T07:10:00", description="Old bio")
+    edited_new = body("k2", "Session: Bo", "2026-01-05T07:10:00", description="New bio")
+    removed = body("k3", "Session: Cy", "2026-01-06T07:00:00")
+    new = body("k4", "Session: Di", "2026-01-07T07:00:00")
+    adopted = body("k5", "Session: Ed", "2026-01-08T07:00:00")
+    legacy = {"id": "legacy1", "summary": "Session: Ed", "status": "confirmed",
+              "start": {"dateTime": "2026-01-08T07:00:00-05:00"}}
+    manual = {"id": "manual1", "summary": "Staff meeting", "status": "confirmed",
+              "start": {"dateTime": "2026-01-08T09:00:00-05:00"}}
+
+    desired = {e["id"]: e for e in (unchanged, edited_new, new, adopted)}
+    actual = [as_calendar_event(unchanged), as_calendar_event(edited_old), as_calendar_event(removed),
+              legacy, manual]
+
+    operations = {(action, event_id) for action, event_id, _ in diff_events(desired, actual)}
+    assert operations == {
+        (UNCHANGED, "k1"),
+        (PATCH, "k2"),
+        (INSERT, "k4"),
+        (PATCH, "legacy1"),
+        (DELETE, "k3"),
+    }
+
+def test_deletes_are_scoped_to_the_program():
+    ours = as_calendar_event(stamp_tags(body("k1", "Session: Ann", "2026-01-05T07:00:00"), program="sid"))
+    imported = as_calendar_event(stamp_tags(body("k2", "Course: Week 1", "2026-01-05T18:00:00"), program="ysc_cal"))
+    untagged = as_calendar_event(body("k3", "Session: Bo", "2026-01-06T07:00:00"))
+    actual = [ours, imported, untagged]
+
+    assert {event_id for action, event_id, _ in diff_events({}, actual, program="sid") if action == DELETE} == {"k1"}
+    assert len(diff_events({}, actual)) == 3  # unscoped: every managed event
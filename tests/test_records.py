@@ -0,0 +1,41 @@
+import sys
+
+from src.records import CreatedEvent, read_created_events, write_created_events
+from src.sheets_ingest import build_teacher_map
+from src.google_sheets_data import fetch_google_sheets_data
+from src.sync_scheduler import plan_sheet_events, confirm_events, prepare_event_body, create_scheduled_events
+from src.event_template import load_template
+
+def test_contacts_share_headers_and_pad_short_rows():
+    teacher_map = build_teacher_map([["First Name", "Last Name", "Email Address"],
+                                     ["Ann", "Lee", "ann@example.com"], ["Bo", "Kim"]])
+    ann, bo = teacher_map["Ann Lee"], teacher_map["Bo Kim"]
+    assert ann.columns is bo.columns
+    assert bo.get("Email Address") == "" and bo.get("Missing", None) is None
+    assert ann.as_vars() == {"First Name": "Ann", "Last Name": "Lee", "Email Address": "ann@example.com"}
+
+def test_created_events_csv_round_trip(tmp_path):
+    path = str(tmp_path / "created_events.csv")
+    records = [CreatedEvent("A: Ann", "a1", "2026-01-01T07:00:00-05:00"), CreatedEvent("B, Bo", "b1", None)]
+    write_created_events(path, records)
+    assert read_created_events(path) == records
+    assert read_created_events(str(tmp_path / "missing.csv")) == []
+
+def test_pipeline_runs_without_pandas(tmp_path, monkeypatch, capsys, repo_root, program_fake, calendar_id):
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    fake = program_fake
+    template_file = str(repo_root / "_calendar_event_template.jsonc")
+
+    pending, _ = fetch_google_sheets_data(fake.sheets, "sid", "Signup", "Teacher Contact", template_file)
+    template = load_template(template_file)
+    bodies = [prepare_event_body(event, template) for event in pending]
+    events, preview = plan_sheet_events(fake.sheets, "sid", "Signup", "Teacher Contact", template_file)
+    assert [body["id"] for body in bodies] == [body["id"] for body in events]
+
+    assert confirm_events(events, preview, dry_run=True) == []
+    assert "Event Start Time" in capsys.readouterr().out
+
+    records = create_scheduled_events(fake.calendar, calendar_id, events, str(tmp_path / "created.csv"))
+    logged = read_created_events(str(tmp_path / "created.csv"))
+    assert [record.as_tuple() for record in logged] == [record.as_tuple() for record in records]
+    assert len(records) == 6
@@ -0,0 +1,81 @@
+import time
+
+from src.fake_google_api import FakeGoogle
+from src.records import CreatedEvent
+from src.overlap_detection import find_overlaps
+from src.recurrence import compact_events, expand_recurring, master_event_id
+from src.sync_journal import event_key, stamp_event_key, stamp_tags, stamp_content_hash
+from src.sync_scheduler import create_scheduled_events
+from src.utils_calendar_general import iter_calendar_events
+from src.reconcile import RECONCILE_FIELDS, DELETE, UNCHANGED, diff_events
+from src.bulk_delete import bulk_delete, selection_properties
+
+CAL = "fake@group.calendar.google.com"
+TZ = "America/New_York"
+
+def signup(date, teacher="Ann Lee", start="07:00"):
+    body = {"summary": f"45-Minute Guided Session: {teacher}",
+            "start": {"dateTime": f"{date}T{start}:00", "timeZone": TZ},
+            "end": {"dateTime": f"{date}T{start[:3]}45:00", "timeZone": TZ},
+            "attendees": [{"email": f"{teacher.split()[0].lower()}@example.com"}]}
+    stamp_tags(body, program="sid", teacher=teacher)
+    return stamp_content_hash(stamp_event_key(body, event_key(teacher, date, start)))
+
+# Ann: Mondays and Wednesdays for three weeks, missing one Wednesday, then once a month later.
+ANN = [signup(d) for d in ("2026-01-05", "2026-01-07", "2026-01-12", "2026-01-19", "2026-01-21")]
+OTHERS = [signup("2026-02-09"), signup("2026-01-06", "Bo Kim"), signup("2026-01-08", "Bo Kim"),
+          signup("2026-01-05", start="09:00")]
+# Bo, daily across the start of daylight saving time (2026-03-08).
+BO = [signup(f"2026-03-{day:02d}", "Bo Kim") for day in range(4, 11)]
+
+def records(bodies):
+    return [CreatedEvent.from_api(body) for body in bodies]
+
+def test_repeating_signups_collapse_into_one_recurring_event():
+    compacted, runs = compact_events(ANN + OTHERS)
+    assert runs == 1 and len(compacted) == 1 + len(OTHERS)
+    master = compacted[0]
+    assert master["recurrence"] == ["RRULE:FREQ=WEEKLY;BYDAY=MO,WE;COUNT=6",
+                                    "EXDATE;TZID=America/New_York:20260114T070000"]
+    assert master["start"] == ANN[0]["start"] and master["id"] not in {body["id"] for body in ANN}
+    assert master["extendedProperties"]["private"]["syncKey"] == master["id"]
+    assert compacted[1:] == OTHERS  # short runs, other slots and distant dates stay single
+    assert compact_events(ANN + OTHERS)[0][0]["id"] == master["id"]
+
+    daily, _ = compact_events(BO)
+    assert daily[0]["recurrence"] == ["RRULE:FREQ=DAILY;COUNT=7"]
+
+def test_expanded_occurrences_match_the_original_signups():
+    for run in (ANN, BO):
+        master = compact_events(run)[0][0]
+        instances = expand_recurring(master)
+        assert find_overlaps(records(run), instances) == [instance.id for instance in instances]
+        assert {master_event_id(instance.id) for instance in instances} == {master["id"]}
+    assert [i.begin[-6:] for i in expand_recurring(compact_events(BO)[0][0])] == ["-05:00"] * 4 + ["-04:00"] * 3
+    assert [record.as_tuple() for record in expand_recurring(OTHERS[0])] == [records(OTHERS)[0].as_tuple()]
+
+def test_recurring_events_reconcile_and_delete_as_a_series(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    fake = FakeGoogle()
+    compacted, _ = compact_events(ANN + OTHERS + BO)
+    created = create_scheduled_events(fake.calendar, CAL, compacted, str(tmp_path / "created.csv"))
+    assert fake.calls["calendar.events.insert"] == 6 and len(created) == len(ANN + OTHERS + BO)
+
+    listing = list(iter_calendar_events(fake.calendar, CAL, "2026-01-01T00:00:00Z", "2026-04-01T00:00:00Z",
+                                        fields=RECONCILE_FIELDS))
+    assert sorted(event["id"] for event in listing) == sorted(record.id for record in created)
+
+    desired = {body["id"]: body for body in ANN + OTHERS + BO}
+    assert {action for action, _, _ in diff_events(desired, listing)} == {UNCHANGED}
+    del desired[ANN[2]["id"]]
+    operations = diff_events(desired, listing)
+    assert [(action, master_event_id(event_id)) for action, event_id, _ in operations if action != UNCHANGED] \
+        == [(DELETE, compacted[0]["id"])]
+
+    deleted = bulk_delete(fake.calendar, CAL, selection_properties(teacher="Ann Lee"), dry_run=False,
+                          assume_yes=True)
+    assert len(deleted) == len(ANN) + 2
+    assert fake.calls["calendar.events.delete"] == 3  # the series, the February signup and the 09:00 one
+    remaining = list(iter_calendar_events(fake.calendar, CAL, "2026-01-01T00:00:00Z", "2026-04-01T00:00:00Z"))
+    assert {event["summary"] for event in remaining} == {"45-Minute Guided Session: Bo Kim"}
+    assert len(remaining) == 2 + len(BO)
@@ -0,0 +1,58 @@
+from src.fake_google_api import FakeGoogle
+from src.response_cache import ResponseCache, request_key
+from src.utils_calendar_general import get_google_services, iter_calendar_events, create_calendar_event
+from src.sheets_ingest import fetch_signup_data, fetch_sheet_values
+
+def event(i):
+    return {"summary": f"Session {i}", "start": {"dateTime": f"2026-01-05T07:{i:02d}:00-05:00"},
+            "end": {"dateTime": f"2026-01-05T07:{i:02d}:30-05:00"}}
+
+def services(fake, tmp_path, **ttls):
+    return get_google_services("unused", "unused", [], fake=fake,
+                               cache=ResponseCache(str(tmp_path / "cache.db"), ttls=ttls))
+
+def list_events(calendar, calendar_id):
+    return [e["summary"] for e in iter_calendar_events(calendar, calendar_id, "2026-01-01T00:00:00Z",
+                                                       "2026-02-01T00:00:00Z")]
+
+def test_sheet_reads_are_served_from_the_cache_within_the_ttl(tmp_path, program_fake):
+    fake = program_fake
+    sheets, _ = services(fake, tmp_path)
+    first = fetch_signup_data(sheets, "sid", "Signup", "Teacher Contact")
+    assert fetch_signup_data(sheets, "sid", "Signup", "Teacher Contact")[1] == first[1]
+    assert fake.calls["sheets.values.batchGet"] == 1
+
+    fetch_sheet_values(sheets, "sid", ["Signup"], use_cache=False)
+    assert fake.calls["sheets.values.batchGet"] == 2
+
+    sheets, _ = services(fake, tmp_path, sheets=0)
+    fetch_signup_data(sheets, "sid", "Signup", "Teacher Contact")
+    assert fake.calls["sheets.values.batchGet"] == 3
+
+def test_calendar_listings_revalidate_with_etags_and_writes_invalidate(tmp_path, calendar_id):
+    fake = FakeGoogle(calendars={calendar_id: [event(i) for i in range(20)]}, max_page_size=7)
+    _, calendar = services(fake, tmp_path)
+    assert len(list_events(calendar, calendar_id)) == 20
+    assert len(list_events(calendar, calendar_id)) == 20
+    assert fake.calls["calendar.events.list"] == 3  # the second listing's three pages came from the cache
+
+    # Expired: the first page is revalidated. Emptying the fake without a new
+    # version keeps its etag, so the 304 proves the cached pages are reused.
+    _, calendar = services(fake, tmp_path, calendar=0)
+    fake.calendars[calendar_id].clear()
+    assert len(list_events(calendar, calendar_id)) == 20
+
+    create_calendar_event(calendar, calendar_id, event(30))
+    assert list_events(calendar, calendar_id) == ["Session 30"]
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=300)
+    body = {"values": ["x" * 80]}
+    for i in range(3):
+        cache.put(request_key("values.get", {"range": i}), "sheets", body)
+    cache.get(request_key("values.get", {"range": 0}))
+    cache.put(request_key("values.get", {"range": 3}), "sheets", body)
+    assert cache.get(request_key("values.get", {"range": 1})) is None
+    assert cache.get(request_key("values.get", {"range": 0})) is not None
+    assert cache.stats()[0] == 3
+    assert cache.invalidate("calendar") == 0 and cache.invalidate() == 3
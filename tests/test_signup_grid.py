@@ -0,0 +1,44 @@
+from src.records import Contact
+from src.signup_grid import melt_grid, parse_slot_headers, signup_events, unmatched_report
+
+HEADERS = ("First Name", "Last Name", "Email Address")
+TEACHERS = {"Ann Lee": Contact("Ann Lee", HEADERS, ("Ann", "Lee", "ann@example.com")),
+            "Bo Chen": Contact("Bo Chen", HEADERS, ("Bo", "Chen", "bo@example.com"))}
+GRID = [["Sign up below"], [],
+        ["", "Date", "7 am EST | 6 am CST", "notes", "8 am - 8:45 am EST"],
+        ["", "Monday, 2026-01-05", " Ann Lee ", "call first", "Bo Chen"],
+        ["", "Tuesday, 2026-01-06", "", "", "Dee Rao"],       # unknown teacher
+        ["", "Wednesday, 2026-02-30", "Ann Lee"],            # not a date
+        ["", "Thursday, 2026-01-08", "Dee Rao"],              # ragged row
+        [""]]
+
+def test_melt_visits_only_filled_slot_cells():
+    slots = parse_slot_headers(GRID[2])
+    assert sorted(slots) == [2, 4]
+    cells = [(r, c, date, name) for r, c, date, _, _, name in melt_grid(GRID, slots)]
+    assert cells == [(3, 2, "2026-01-05", "Ann Lee"), (3, 4, "2026-01-05", "Bo Chen"),
+                     (4, 4, "2026-01-06", "Dee Rao"), (6, 2, "2026-01-08", "Dee Rao")]
+    assert [(r, c) for r, c, *_ in melt_grid(GRID, slots, cells={(3, 4), (6, 2), (40, 2)})] == [(3, 4), (6, 2)]
+
+def test_signup_events_join_contacts_and_report_unmatched_cells():
+    pending, unmatched = signup_events(TEACHERS, GRID)
+    assert [(e.teacher, e.begin, e.end, e.duration, e.day) for e in pending] == [
+        ("Ann Lee", "2026-01-05T07:00:00", "07:10", 10, "Monday"),
+        ("Bo Chen", "2026-01-05T08:00:00", "08:45", 45, "Monday")]
+    assert pending[0].contact is TEACHERS["Ann Lee"]
+    assert pending[1].summary == "45-Minute Guided Session: Bo Chen"
+    assert unmatched == {"Dee Rao": ["R5C5", "R7C3"]}
+    assert unmatched_report(unmatched) == ["Error: No email found for 'Dee Rao' at R5C5, R7C3"]
+
+def test_test_mode_filters_and_namespaces_keys():
+    pending, _ = signup_events(TEACHERS, GRID, test_teacher="Bo Chen", namespace="test")
+    assert [e.teacher for e in pending] == ["Bo Chen"]
+    assert pending[0].key != signup_events(TEACHERS, GRID)[0][1].key
+    assert signup_events(TEACHERS, GRID[:2]) == ([], {})
+
+def test_converted_slots_follow_each_rows_dst_offset():
+    grid = GRID[:2] + [["", "Date", "1 pm GMT | 2 pm CET"],
+                       ["", "Monday, 2026-03-02", "Ann Lee"],     # EST: 13:00 UTC is 08:00
+                       ["", "Monday, 2026-03-09", "Ann Lee"]]     # EDT since March 8: 09:00
+    pending, _ = signup_events(TEACHERS, grid)
+    assert [e.begin for e in pending] == ["2026-03-02T08:00:00", "2026-03-09T09:00:00"]
@@ -0,0 +1,76 @@
+from src.event_store import EventStore
+from src.fake_google_api import FakeGoogle
+from src.sync_journal import SyncJournal, RUN_ID, content_hash, event_key, stamp_event_key, stamp_tags, CONFIRMED, SENT
+from src.sync_scheduler import create_scheduled_events
+from src.utils_calendar_general import delete_events_from_store
+
+def make_body(teacher, date):
+    body = {"summary": f"Session: {teacher}", "start": {"dateTime": f"{date}T07:00:00"},
+            "end": {"dateTime": f"{date}T07:45:00"}}
+    return stamp_event_key(body, event_key(teacher, date, "07:00"))
+
+def test_event_key_is_deterministic_and_a_valid_event_id():
+    key = event_key("Ann Lee ", "2026-01-05", "07:00")
+    assert key == event_key("Ann Lee", "2026-01-05", "07:00")
+    assert key != event_key("Ann Lee", "2026-01-05", "07:00", namespace="test")
+    assert 5 <= len(key) <= 1024 and set(key) <= set("0123456789abcdefghijklmnopqrstuv")
+
+def test_journal_replays_to_unconfirmed_work(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    bodies = [make_body("Ann Lee", "2026-01-05"), make_body("Bo Kim", "2026-01-05"), make_body("Cy Doe", "2026-01-06")]
+
+    journal = SyncJournal(path)
+    assert journal.plan(bodies) == bodies
+    journal.record(bodies[0]["id"], SENT)
+    journal.record(bodies[0]["id"], CONFIRMED, event_id=bodies[0]["id"])
+    journal.record(bodies[1]["id"], SENT)
+    with open(path, "a") as f:
+        f.write('{"key": "torn')  # crash mid-write
+
+    resumed = SyncJournal(path)
+    assert resumed.is_confirmed(bodies[0]["id"])
+    assert resumed.pending() == bodies[1:]
+    assert resumed.plan(bodies) == bodies[1:]
+
+    resumed.record(bodies[1]["id"], CONFIRMED)
+    assert SyncJournal(path).pending() == bodies[2:]
+
+def test_pending_drops_signups_no_longer_planned(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    bodies = [make_body("Ann Lee", "2026-01-05"), make_body("Bo Kim", "2026-01-05")]
+    SyncJournal(path).plan(bodies)
+
+    assert SyncJournal(path).pending({bodies[0]["id"]}) == bodies[:1]
+    assert SyncJournal(path).pending() == bodies[:1]  # the drop is journaled
+    assert SyncJournal(path).plan(bodies) == bodies  # and planned again if the signup comes back
+
+def test_deleted_events_are_created_again(tmp_path, monkeypatch, calendar_id):
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+    fake = FakeGoogle()
+    cal = calendar_id
+    store = EventStore(str(tmp_path / "events.db"))
+    bodies = [make_body(teacher, "2026-01-05") for teacher in ("Ann Lee", "Bo Kim", "Cy Doe", "Di Ng")]
+
+    def sync():
+        return create_scheduled_events(fake.calendar, cal, [dict(body) for body in bodies],
+                                       str(tmp_path / "created.csv"), store=store,
+                                       journal=SyncJournal(str(tmp_path / "journal.jsonl")))
+
+    assert len(sync()) == 4
+    assert sync() == []
+    delete_events_from_store(store, fake.calendar, cal, journal=SyncJournal(str(tmp_path / "journal.jsonl")))
+    assert fake.events(cal) == []
+    assert len(sync()) == 4
+
+    # Deleted outside the journal: the store still tells the next sync.
+    store.mark_deleted([bodies[0]["id"]])
+    fake.calendar.events().delete(calendarId=cal, eventId=bodies[0]["id"]).execute()
+    assert [record.id for record in sync()] == [bodies[0]["id"]]
+
+def test_tags_do_not_change_the_content_hash():
+    body = {"summary": "Yoga", "start": {"dateTime": "2026-01-05T07:00:00-05:00"}}
+    tagged = stamp_tags(dict(body), program="sid", teacher="Ann Lee", test=True, run_id="run-1")
+    assert tagged["extendedProperties"]["private"] == {"runId": "run-1", "program": "sid", "teacher": "Ann Lee",
+                                                       "test": "1"}
+    assert content_hash(tagged) == content_hash(body)
+    assert stamp_tags({})["extendedProperties"]["private"] == {"runId": RUN_ID}
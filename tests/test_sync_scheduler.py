@@ -0,0 +1,28 @@
+import pytest
+from src.fake_google_api import FakeGoogle
+from src.sync_journal import stamp_event_key
+from src.sync_scheduler import create_scheduled_events_batched, create_scheduled_events_concurrently
+
+def keyed_bodies(count):
+    return [stamp_event_key({"summary": f"Session {n}", "start": {"dateTime": f"2026-01-05T07:{n:02d}:00-05:00"},
+                             "end": {"dateTime": f"2026-01-05T07:{n + 1:02d}:00-05:00"}}, f"key{n}")
+            for n in range(count)]
+
+@pytest.mark.parametrize("create", [
+    lambda fake, cal, bodies, csv_path: create_scheduled_events_batched(fake.calendar, cal, bodies, csv_path,
+                                                                        batch_size=2),
+    lambda fake, cal, bodies, csv_path: create_scheduled_events_concurrently(fake.calendar, cal, bodies, csv_path,
+                                                                             workers=2),
+], ids=["batched", "concurrent"])
+def test_rerun_after_a_partial_run_adopts_existing_ids(create, tmp_path, calendar_id, capsys):
+    fake = FakeGoogle()
+    bodies = keyed_bodies(5)
+    # A partial earlier run: two events made it, one of them was deleted since.
+    for body in bodies[:2]:
+        fake.calendar.events().insert(calendarId=calendar_id, body=body).execute()
+    fake.calendar.events().delete(calendarId=calendar_id, eventId=bodies[1]["id"]).execute()
+
+    records = create(fake, calendar_id, bodies, str(tmp_path / "created.csv"))
+    assert len(records) == 5
+    assert "error" not in capsys.readouterr().out.lower()
+    assert sorted(e["id"] for e in fake.events(calendar_id)) == sorted(b["id"] for b in bodies)
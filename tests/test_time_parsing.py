@@ -1,6 +1,13 @@
 import datetime
 import re
+import pytest
 from src.sync_scheduler import parse_time_est
+from src.time_headers import TimeSlot, parse_time_header
+
+try:
+    from hypothesis import given, strategies as st
+except ImportError:  # property-based tests are optional
+    given = st = None
 
 def test_parse_time_est():
     test_cases = [
@@ -17,6 +24,60 @@ def test_parse_time_est():
         assert result == expected, f"Failed for '{header}': expected {expected}, got {result}"
         print(f"PASSED: '{header}' -> {result}")
 
+@pytest.mark.parametrize("header, on_date, expected", [
+    # No EST entry: the labelled time is converted to Eastern.
+    ("7 am CST | 1 pm GMT", datetime.date(2026, 1, 15), ("08:00", "08:10", 10)),
+    ("1 pm GMT", datetime.date(2026, 1, 15), ("08:00", "08:10", 10)),
+    ("1 pm GMT", datetime.date(2026, 7, 15), ("09:00", "09:10", 10)),
+    ("5 am - 5:30 am PST", datetime.date(2026, 1, 15), ("08:00", "08:30", 30)),
+    # Unlabelled times are taken as Eastern; variants of am/pm spelling.
+    ("Morning slot: 7:05 a.m.", datetime.date(2026, 1, 15), ("07:05", "07:15", 10)),
+    ("12 pm EST", datetime.date(2026, 1, 15), ("12:00", "12:10", 10)),
+    ("12:30 am EST", datetime.date(2026, 1, 15), ("00:30", "00:40", 10)),
+])
+def test_parse_time_header_timezones(header, on_date, expected):
+    slot = parse_time_header(header, on_date=on_date)
+    assert isinstance(slot, TimeSlot)
+    assert slot.as_tuple() == expected
+    assert slot.timezone == "America/New_York"
+
+def test_parse_time_header_without_time():
+    assert parse_time_header("Date") is None
+    assert parse_time_header("") is None
+    assert parse_time_est("Instructions") == (None, None, None)
+
+def test_parse_time_header_is_cached():
+    header = "9:15 am - 10 am EST | 8:15 am CST"
+    assert parse_time_header(header) is parse_time_header(header)
+
+if given is not None:
+    def format_time(minutes, style):
+        hour, minute = divmod(minutes, 60)
+        hour12 = hour % 12 or 12
+        meridiem = "am" if hour < 12 else "pm"
+        text = f"{hour12}:{minute:02d}" if minute or style else f"{hour12}"
+        return f"{text} {meridiem.upper() if style == 2 else meridiem}"
+
+    @given(start=st.integers(0, 24 * 60 - 1), length=st.integers(1, 24 * 60 - 1), style=st.integers(0, 2))
+    def test_range_round_trips(start, length, style):
+        end = (start + length) % (24 * 60)
+        header = f"{format_time(start, style)} - {format_time(end, style)} EST"
+        slot = parse_time_header(header)
+        assert slot.start == f"{start // 60:02d}:{start % 60:02d}"
+        assert slot.end == f"{end // 60:02d}:{end % 60:02d}"
+        assert slot.duration == length
+
+    @given(start=st.integers(0, 24 * 60 - 1), offset_hours=st.integers(-3, 3))
+    def test_est_entry_wins_over_other_zones(start, offset_hours):
+        other = (start + offset_hours * 60) % (24 * 60)
+        header = f"{format_time(other, 0)} CST | {format_time(start, 1)} EST | {format_time(other, 0)} GMT"
+        assert parse_time_est(header) == parse_time_header(f"{format_time(start, 1)} EST").as_tuple()
+
+    @given(header=st.text(max_size=60))
+    def test_arbitrary_text_never_raises(header):
+        slot = parse_time_header(header)
+        assert slot is None or 1 <= slot.duration <= 24 * 60
+
 if __name__ == "__main__":
     try:
         test_parse_time_est()
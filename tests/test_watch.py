@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.event_store import EventStore
+from src.watch import SheetWatcher, changed_cells
+
+@pytest.fixture
+def setup(tmp_path, repo_root, program_fake, calendar_id):
+    store = EventStore(str(tmp_path / "events.db"))
+
+    def watcher(**kwargs):
+        return SheetWatcher(program_fake.sheets, program_fake.calendar, store=store, calendar_id=calendar_id,
+                            spreadsheet_id="sid", snapshot_path=str(tmp_path / "snapshot.json"), dry_run=False,
+                            **kwargs)
+    return program_fake, store, watcher
+
+def test_changed_cells():
+    header = [["x"], [""], ["", "Date", "7 am EST", "8 am EST"]]
+    old = header + [["", "Mon, 2026-01-05", "Ann", ""], ["", "Tue, 2026-01-06", "Bo", "Bo"]]
+    new = header + [["", "Mon, 2026-01-05", "Ann ", "Bo"], ["", "Wed, 2026-01-07", "Bo", "Bo"]]
+    assert changed_cells(old, new) == {(3, 3), (4, 0), (4, 1), (4, 2), (4, 3)}
+    assert changed_cells(old, old[:2] + [["", "Date", "9 am EST"]] + old[3:]) is None
+
+def test_only_sheet_deltas_reach_the_calendar(setup, tmp_path, calendar_id):
+    fake, store, watcher = setup
+    assert len(watcher().poll()) == 6
+    assert len(fake.events(calendar_id)) == 6
+    inserts = fake.calls["calendar.events.insert"]
+
+    # Unchanged sheet: one batchGet, no calendar calls.
+    running = watcher()
+    assert running.poll() is None
+    assert fake.calls["calendar.events.insert"] == inserts
+
+    # One slot changes hands and another is cleared: two deletes and one insert.
+    signup = fake.spreadsheets["sid"]["Signup"]
+    signup[3][3] = "Teacher0 Lastname0"
+    signup[4][4] = ""
+    assert sorted(action for action, _, _ in running.poll()) == ["delete", "delete", "insert"]
+    assert len(fake.events(calendar_id)) == 5
+
+    # A contact edit patches that teacher's events only.
+    contacts = fake.spreadsheets["sid"]["Teacher Contact"]
+    contacts[1][4] = "New bio."
+    operations = running.poll()
+    assert [action for action, _, _ in operations] == ["patch"] * 4
+    assert json.loads((tmp_path / "snapshot.json").read_text())["contacts"][1][4] == "New bio."
+
+def test_contact_edits_reach_signups_spelled_differently(setup, calendar_id):
+    fake, store, watcher = setup
+    fake.spreadsheets["sid"]["Signup"][3][2] = "teacher0  LASTNAME0"
+    running = watcher()
+    assert len(running.poll()) == 6
+
+    fake.spreadsheets["sid"]["Teacher Contact"][1][3] = "new0@example.com"
+    assert [action for action, _, _ in running.poll()] == ["patch"] * 3  # the variant cell included
+    emails = [[a["email"] for a in event["attendees"]] for event in fake.events(calendar_id)
+              if "Teacher0" in event["summary"]]
+    assert emails == [["new0@example.com"]] * 3
+
+def test_first_poll_skips_events_already_on_the_calendar(setup):
+    fake, store, watcher = setup
+    watcher().poll()
+    # A fresh snapshot still finds every signup in the event store.
+    Path(watcher().snapshot_path).unlink()
+    assert watcher().poll() == []
+
+def test_failed_polls_back_off_with_jitter(setup, calendar_id):
+    fake, _, watcher = setup
+    delays = []
+    fake.fail_next(2, status=503)
+    watcher(sleep=delays.append).run(interval=10, max_interval=30, max_polls=4)
+    assert len(delays) == 3
+    assert 0 <= delays[0] <= 20 and 0 <= delays[1] <= 30  # full jitter, capped
+    assert 9 <= delays[2] <= 11
+    assert len(fake.events(calendar_id)) == 6